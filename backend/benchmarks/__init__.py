@@ -0,0 +1,17 @@
+"""
+Performance Benchmarks for the Public API.
+
+Generates a synthetic catalog at a chosen scale (products/generator.py),
+sends every endpoint in config/urls.py through the Django test client
+and records p50/p95 latency, query counts and peak allocated memory per
+endpoint:
+
+    benchmarks/endpoints.py  - The benchmarked requests and their query budgets
+    benchmarks/runner.py     - Measurement loop
+    benchmarks/compare.py    - Budget and baseline checks
+    benchmarks/__main__.py   - python -m benchmarks run / compare
+
+Run from backend/ (see benchmarks/__main__.py for the options):
+
+    python -m benchmarks run --output baseline.json
+"""
@@ -0,0 +1,208 @@
+"""
+Command Line Entry Point: python -m benchmarks
+
+Usage (from backend/):
+    python -m benchmarks run --output baseline.json
+    python -m benchmarks run --products 1000000 --keepdb --only product-list
+    python -m benchmarks run --baseline baseline.json --output results.json
+    python -m benchmarks compare results.json --baseline baseline.json
+
+"run" creates a separate test database (test_<NAME>, like pytest does),
+fills it (products/generator.py), measures every endpoint and destroys the
+database again. With --keepdb the database and its data are kept, and
+later runs with the same or a smaller --products skip generating.
+
+Both commands exit with status 1 when an endpoint fails its query budget
+or, given --baseline, regresses past --tolerance (benchmarks/compare.py).
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from .compare import compare_results
+
+
+def get_parser():
+    """Build the argument parser for the run and compare commands."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark every API endpoint against query and latency budgets.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Fill a test database and benchmark it")
+    run.add_argument("--products", type=int, default=10_000)
+    run.add_argument("--users", type=int, default=2_000)
+    run.add_argument("--carts", type=int, default=1_000)
+    run.add_argument("--orders", type=int, default=5_000)
+    run.add_argument("--seed", type=int, default=0, help="Random seed (default 0)")
+    run.add_argument(
+        "--iterations",
+        type=int,
+        default=20,
+        help="Timed requests per endpoint (default 20)",
+    )
+    run.add_argument(
+        "--warmup",
+        type=int,
+        default=3,
+        help="Untimed requests per endpoint first (default 3)",
+    )
+    run.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="Keep the cache between requests (default: clear it before each)",
+    )
+    run.add_argument(
+        "--only", nargs="+", metavar="NAME", help="Benchmark only these endpoints"
+    )
+    run.add_argument("--output", help="Write the results to this JSON file")
+    add_comparison_arguments(run)
+    run.add_argument(
+        "--keepdb",
+        action="store_true",
+        help="Keep the test database (and its generated data) for the next run",
+    )
+
+    compare = commands.add_parser(
+        "compare", help="Check a results file against budgets and a baseline"
+    )
+    compare.add_argument("results", help="Results JSON from a run")
+    add_comparison_arguments(compare)
+    return parser
+
+
+def add_comparison_arguments(parser):
+    """Add --baseline and --tolerance."""
+    parser.add_argument("--baseline", help="Results JSON of an earlier run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed p95 latency / memory growth over the baseline (default 0.2)",
+    )
+
+
+def load_results(path):
+    """Read the per-endpoint results from a results file."""
+    with open(path) as results_file:
+        return json.load(results_file)["results"]
+
+
+def report(results, baseline_path, tolerance):
+    """
+    Print failures against budgets and the baseline.
+
+    Returns:
+        int: Exit status (1 if anything failed)
+    """
+    baseline = load_results(baseline_path) if baseline_path else None
+    failures = compare_results(results, baseline, tolerance)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        print(f"{len(failures)} budget failure(s).")
+        return 1
+    print(f"All {len(results)} endpoints within budget.")
+    return 0
+
+
+def run(args):
+    """Fill a test database, benchmark the endpoints and report."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    from products.generator import generate_catalog
+    from products.models import Product
+
+    from .endpoints import ENDPOINTS
+    from .runner import create_context, run_benchmarks
+
+    endpoints = ENDPOINTS
+    if args.only:
+        unknown = set(args.only) - {endpoint.name for endpoint in ENDPOINTS}
+        if unknown:
+            sys.exit(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+        endpoints = [endpoint for endpoint in ENDPOINTS if endpoint.name in args.only]
+
+    # Every query goes to the test database, so each one is counted
+    settings.DATABASE_REPLICAS = []
+    setup_test_environment()
+    database_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    results = {}
+    try:
+        if args.keepdb and Product.objects.count() >= args.products:
+            print("Reusing the kept test database.")
+        else:
+            counts = generate_catalog(
+                products=args.products,
+                users=args.users,
+                carts=args.carts,
+                orders=args.orders,
+                seed=args.seed,
+            )
+            print(", ".join(f"{n} {name}" for name, n in counts.items()))
+
+        context = create_context()
+        print(
+            f"{'endpoint':<28}{'p50 ms':>9}{'p95 ms':>9}{'queries':>10}"
+            f"{'mem KiB':>10}{'errors':>8}"
+        )
+        for name, result in run_benchmarks(
+            endpoints, context, args.iterations, args.warmup, args.warm_cache
+        ):
+            results[name] = result
+            print(
+                f"{name:<28}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+                f"{result['queries']:>6}/{result['max_queries']:<3}"
+                f"{result['peak_memory_kb']:>10.0f}{result['errors']:>8}"
+            )
+    finally:
+        connection.creation.destroy_test_db(
+            database_name, verbosity=0, keepdb=args.keepdb
+        )
+        teardown_test_environment()
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(
+                {
+                    "meta": {
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "products": args.products,
+                        "users": args.users,
+                        "carts": args.carts,
+                        "orders": args.orders,
+                        "seed": args.seed,
+                        "iterations": args.iterations,
+                        "warm_cache": args.warm_cache,
+                    },
+                    "results": results,
+                },
+                output,
+                indent=2,
+            )
+        print(f"Results written to {args.output}")
+    return report(results, args.baseline, args.tolerance)
+
+
+def main(argv=None):
+    """Parse the arguments and run the chosen command."""
+    args = get_parser().parse_args(argv)
+    if args.command == "run":
+        return run(args)
+    return report(load_results(args.results), args.baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Budget and Baseline Checks for Benchmark Results.
+
+Kept free of Django imports, so comparing two result files doesn't need
+a database or settings:
+
+    python -m benchmarks compare results.json --baseline baseline.json
+
+Query counts have absolute budgets (max_queries in benchmarks/endpoints.py,
+recorded in every result). Latency and memory depend on the machine, so
+they are only compared against a baseline run from the same machine,
+with a relative tolerance plus a minimum absolute change that counts.
+"""
+
+# p95 regressions smaller than this (in ms) are noise, whatever the ratio
+MIN_LATENCY_DELTA_MS = 2.0
+
+# Likewise for peak memory (in KiB)
+MIN_MEMORY_DELTA_KB = 64
+
+
+def compare_results(results, baseline=None, tolerance=0.2):
+    """
+    Check results against their query budgets and a baseline run.
+
+    An endpoint fails when any request got an unexpected status, when it
+    issued more than max_queries queries, or, compared with the baseline:
+        - more queries than the baseline did
+        - p95 latency over baseline * (1 + tolerance), and slower by at
+          least MIN_LATENCY_DELTA_MS
+        - peak memory over baseline * (1 + tolerance), and larger by at
+          least MIN_MEMORY_DELTA_KB
+    Endpoints missing from the baseline are only checked against budgets.
+
+    Args:
+        results: {name: result} from run_benchmarks()
+        baseline: Results of an earlier run, or None
+        tolerance: Allowed relative slowdown / growth (0.2 = 20%)
+
+    Returns:
+        list: One message per failure (empty if everything passed)
+    """
+    baseline = baseline or {}
+    failures = []
+    for name, result in results.items():
+        if result["errors"]:
+            failures.append(
+                f"{name}: {result['errors']} unexpected responses "
+                f"{result['status_codes']}"
+            )
+        if result["queries"] > result["max_queries"]:
+            failures.append(
+                f"{name}: {result['queries']} queries, "
+                f"budget {result['max_queries']}"
+            )
+
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result["queries"] > before["queries"]:
+            failures.append(
+                f"{name}: {result['queries']} queries, "
+                f"baseline {before['queries']}"
+            )
+        if (
+            result["p95_ms"] > before["p95_ms"] * (1 + tolerance)
+            and result["p95_ms"] - before["p95_ms"] >= MIN_LATENCY_DELTA_MS
+        ):
+            failures.append(
+                f"{name}: p95 {result['p95_ms']:.1f} ms, "
+                f"baseline {before['p95_ms']:.1f} ms"
+            )
+        if (
+            result["peak_memory_kb"] > before["peak_memory_kb"] * (1 + tolerance)
+            and result["peak_memory_kb"] - before["peak_memory_kb"]
+            >= MIN_MEMORY_DELTA_KB
+        ):
+            failures.append(
+                f"{name}: peak memory {result['peak_memory_kb']:.0f} KiB, "
+                f"baseline {before['peak_memory_kb']:.0f} KiB"
+            )
+    return failures
@@ -0,0 +1,426 @@
+"""
+Benchmarked Endpoints and Their Query Budgets.
+
+One Endpoint per route in config/urls.py (and per interesting variant of
+it, such as a filtered or deep page of the product list). The runner
+(benchmarks/runner.py) sends each one through the Django test client and
+fails it when it issues more than max_queries queries.
+
+Placeholders:
+    path and data can use {placeholders} filled from the benchmark context
+    built by the runner:
+        product, product_id   - a stocked, active product (slug, id)
+        product_ids           - ids of a few stocked products
+        category              - slug of the largest category
+        order                 - id of one of the shopper's orders
+        deep_page             - a page number halfway through the catalog
+    plus whatever the endpoint's prepare() step returns.
+
+prepare(context) runs before every timed request and is not measured. It
+puts the database in the state the request needs: an item in the cart, a
+pending order to cancel, a fresh refresh token, and so on.
+
+Query budgets:
+    max_queries is the most queries the endpoint may issue, whatever the
+    catalog size. They carry a little headroom over today's counts, so
+    an N+1 (queries growing with rows) fails the run while an extra
+    lookup doesn't. Latency has no absolute budget: it depends on the
+    machine, so it is compared against a baseline run instead.
+"""
+
+import uuid
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from cart.models import Cart, CartItem
+from orders.models import Order, OrderItem
+from products.generator import GENERATED_PASSWORD
+from products.models import Product
+
+User = get_user_model()
+
+Endpoint = namedtuple(
+    "Endpoint",
+    [
+        "name",
+        "method",
+        "path",
+        "auth",
+        "data",
+        "format",
+        "prepare",
+        "expected_status",
+        "max_queries",
+    ],
+    # auth: None, "user" (the shopper) or "admin"
+    # data: dict, or callable(values) -> dict, for the request body
+    # format: "json" or "multipart"
+    defaults=[None, None, "json", None, 200, 10],
+)
+
+
+# =============================================================================
+# Prepare Steps (not timed)
+# =============================================================================
+
+
+def fill_cart(context):
+    """Put each of the context's products in the shopper's cart, once."""
+    cart, _ = Cart.objects.get_or_create(user=context["shopper"])
+    for product_id in context["product_ids"]:
+        CartItem.objects.update_or_create(
+            cart=cart, product_id=product_id, defaults={"quantity": 1}
+        )
+    return {}
+
+
+def cart_item(context):
+    """Fill the cart and return the first item's id as {item}."""
+    fill_cart(context)
+    item = CartItem.objects.get(
+        cart__user=context["shopper"], product_id=context["product_id"]
+    )
+    return {"item": item.pk}
+
+
+def disposable_product(context):
+    """Create a product to delete and return its slug as {slug}."""
+    product = Product.objects.create(
+        name="Benchmark disposable product",
+        slug=f"bench-delete-{uuid.uuid4().hex}",
+        price="9.99",
+        category_id=context["category_id"],
+        inventory_count=1,
+    )
+    return {"slug": product.slug}
+
+
+def pending_order(context):
+    """Create a pending order to cancel and return its id as {order_id}."""
+    order = Order.objects.create(
+        user=context["shopper"],
+        status=Order.Status.PENDING,
+        total_amount="9.99",
+        shipping_address="1 Benchmark Street",
+    )
+    OrderItem.objects.create(
+        order=order,
+        product_id=context["product_id"],
+        quantity=1,
+        price_at_purchase="9.99",
+    )
+    return {"order_id": order.pk}
+
+
+def refresh_token(context):
+    """Issue a refresh token for the shopper as {refresh}."""
+    return {"refresh": str(RefreshToken.for_user(context["shopper"]))}
+
+
+def reset_password(context):
+    """Restore the shopper's password (the change endpoint moves it)."""
+    shopper = context["shopper"]
+    shopper.set_password(GENERATED_PASSWORD)
+    shopper.save(update_fields=["password"])
+    return {}
+
+
+# =============================================================================
+# Request Bodies
+# =============================================================================
+
+
+def new_product(values):
+    """A product with a slug no earlier iteration used."""
+    return {
+        "name": "Benchmark product",
+        "slug": f"bench-create-{uuid.uuid4().hex}",
+        "price": "19.99",
+        "category_id": values["category_id"],
+        "inventory_count": 10,
+    }
+
+
+def import_feed(values):
+    """A 100-row CSV feed upserting the same slugs every time."""
+    rows = ["slug,name,price,category,inventory_count"]
+    rows += [
+        f"bench-import-{n},Imported product {n},{n + 1}.99,{values['category']},5"
+        for n in range(100)
+    ]
+    content = "\n".join(rows).encode()
+    return {"file": SimpleUploadedFile("feed.csv", content, "text/csv")}
+
+
+def new_user(values):
+    """Registration for an email no earlier iteration used."""
+    return {
+        "email": f"bench-{uuid.uuid4().hex}@example.com",
+        "password": GENERATED_PASSWORD,
+        "password_confirm": GENERATED_PASSWORD,
+        "first_name": "Bench",
+        "last_name": "Registrant",
+    }
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
+
+ENDPOINTS = [
+    # Site, health and docs
+    Endpoint("root-redirect", "get", "/", expected_status=302, max_queries=0),
+    Endpoint("health", "get", "/api/health/", max_queries=0),
+    # The checks run on pool threads with their own connections, which
+    # the query count of the request's thread doesn't see
+    Endpoint("health-ready", "get", "/api/health/ready/", max_queries=0),
+    Endpoint("metrics", "get", "/api/metrics/", max_queries=0),
+    Endpoint("schema", "get", "/api/schema/", max_queries=2),
+    Endpoint("docs", "get", "/api/docs/", max_queries=0),
+    Endpoint("redoc", "get", "/api/redoc/", max_queries=0),
+    Endpoint("admin-login", "get", "/admin/login/", max_queries=2),
+    # Catalog reads
+    Endpoint("product-list", "get", "/api/products/", max_queries=5),
+    Endpoint(
+        "product-list-filtered",
+        "get",
+        "/api/products/?category={category}&min_price=10&max_price=500"
+        "&in_stock=true&ordering=-price",
+        max_queries=5,
+    ),
+    Endpoint(
+        "product-list-deep-page",
+        "get",
+        "/api/products/?page={deep_page}",
+        max_queries=5,
+    ),
+    Endpoint("product-list-cursor", "get", "/api/products/?cursor=", max_queries=5),
+    Endpoint("product-detail", "get", "/api/products/{product}/", max_queries=4),
+    Endpoint("product-featured", "get", "/api/products/featured/", max_queries=4),
+    Endpoint(
+        "product-search", "get", "/api/products/search/?q=laptop", max_queries=5
+    ),
+    Endpoint(
+        "product-autocomplete",
+        "get",
+        "/api/products/autocomplete/?q=lap",
+        max_queries=4,
+    ),
+    Endpoint("product-facets", "get", "/api/products/facets/", max_queries=8),
+    Endpoint("category-list", "get", "/api/categories/", max_queries=4),
+    Endpoint(
+        "category-detail", "get", "/api/categories/{category}/", max_queries=5
+    ),
+    # Async catalog reads
+    Endpoint("async-product-list", "get", "/api/async/products/", max_queries=5),
+    Endpoint(
+        "async-product-featured",
+        "get",
+        "/api/async/products/featured/",
+        max_queries=4,
+    ),
+    Endpoint(
+        "async-product-detail",
+        "get",
+        "/api/async/products/{product}/",
+        max_queries=4,
+    ),
+    Endpoint("async-category-list", "get", "/api/async/categories/", max_queries=4),
+    Endpoint(
+        "async-cart-summary",
+        "get",
+        "/api/async/cart/summary/",
+        auth="user",
+        prepare=fill_cart,
+        max_queries=4,
+    ),
+    # Catalog writes (admin)
+    Endpoint(
+        "product-create",
+        "post",
+        "/api/products/",
+        auth="admin",
+        data=new_product,
+        expected_status=201,
+        max_queries=10,
+    ),
+    Endpoint(
+        "product-update",
+        "patch",
+        "/api/products/{product}/",
+        auth="admin",
+        data={"price": "19.99"},
+        max_queries=10,
+    ),
+    Endpoint(
+        "product-delete",
+        "delete",
+        "/api/products/{slug}/",
+        auth="admin",
+        prepare=disposable_product,
+        expected_status=204,
+        max_queries=15,
+    ),
+    Endpoint(
+        "product-import",
+        "post",
+        "/api/products/import/",
+        auth="admin",
+        data=import_feed,
+        format="multipart",
+        max_queries=15,
+    ),
+    # Cart
+    Endpoint(
+        "cart", "get", "/api/cart/", auth="user", prepare=fill_cart, max_queries=5
+    ),
+    Endpoint(
+        "cart-summary",
+        "get",
+        "/api/cart/summary/",
+        auth="user",
+        prepare=fill_cart,
+        max_queries=4,
+    ),
+    # Cart lines saved one at a time also create or extend their hold
+    # with update_or_create(): 4 queries, or 6 when the hold is new (the
+    # first run on a fresh database), on top of the line's own 12
+    Endpoint(
+        "cart-add",
+        "post",
+        "/api/cart/items/",
+        auth="user",
+        data={"product_id": "{product_id}", "quantity": 1},
+        prepare=fill_cart,
+        max_queries=20,
+    ),
+    Endpoint(
+        "cart-add-batch",
+        "post",
+        "/api/cart/items/batch/",
+        auth="user",
+        data=lambda values: {
+            "items": [
+                {"product_id": product_id, "quantity": 1}
+                for product_id in values["product_ids"]
+            ]
+        },
+        prepare=fill_cart,
+        max_queries=15,
+    ),
+    Endpoint(
+        "cart-item-update",
+        "patch",
+        "/api/cart/items/{item}/",
+        auth="user",
+        data={"quantity": 2},
+        prepare=cart_item,
+        max_queries=18,
+    ),
+    Endpoint(
+        "cart-item-delete",
+        "delete",
+        "/api/cart/items/{item}/",
+        auth="user",
+        prepare=cart_item,
+        expected_status=204,
+        max_queries=8,
+    ),
+    Endpoint(
+        "cart-clear",
+        "delete",
+        "/api/cart/",
+        auth="user",
+        prepare=fill_cart,
+        expected_status=204,
+        max_queries=8,
+    ),
+    # Orders
+    Endpoint("order-list", "get", "/api/orders/", auth="user", max_queries=4),
+    Endpoint(
+        "order-list-cursor",
+        "get",
+        "/api/orders/?cursor=",
+        auth="user",
+        max_queries=4,
+    ),
+    Endpoint(
+        "order-detail", "get", "/api/orders/{order}/", auth="user", max_queries=4
+    ),
+    Endpoint(
+        "order-checkout",
+        "post",
+        "/api/orders/",
+        auth="user",
+        data={"shipping_address": "1 Benchmark Street"},
+        prepare=fill_cart,
+        expected_status=201,
+        max_queries=25,
+    ),
+    Endpoint(
+        "order-cancel",
+        "post",
+        "/api/orders/{order_id}/cancel/",
+        auth="user",
+        prepare=pending_order,
+        max_queries=12,
+    ),
+    # Authentication
+    Endpoint(
+        "auth-register",
+        "post",
+        "/api/auth/register/",
+        data=new_user,
+        expected_status=201,
+        max_queries=6,
+    ),
+    Endpoint(
+        "auth-login",
+        "post",
+        "/api/auth/login/",
+        data={"email": "{shopper_email}", "password": GENERATED_PASSWORD},
+        max_queries=6,
+    ),
+    Endpoint(
+        "auth-refresh",
+        "post",
+        "/api/auth/refresh/",
+        data={"refresh": "{refresh}"},
+        prepare=refresh_token,
+        max_queries=10,
+    ),
+    Endpoint(
+        "auth-logout",
+        "post",
+        "/api/auth/logout/",
+        auth="user",
+        data={"refresh": "{refresh}"},
+        prepare=refresh_token,
+        max_queries=10,
+    ),
+    Endpoint("auth-profile", "get", "/api/auth/profile/", auth="user", max_queries=2),
+    Endpoint(
+        "auth-profile-update",
+        "patch",
+        "/api/auth/profile/",
+        auth="user",
+        data={"first_name": "Bench"},
+        max_queries=4,
+    ),
+    Endpoint(
+        "auth-password-change",
+        "post",
+        "/api/auth/password/change/",
+        auth="user",
+        data={
+            "current_password": GENERATED_PASSWORD,
+            "new_password": "benchmark-password-2",
+            "new_password_confirm": "benchmark-password-2",
+        },
+        prepare=reset_password,
+        max_queries=4,
+    ),
+]
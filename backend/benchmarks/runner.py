@@ -0,0 +1,224 @@
+"""
+Benchmark Runner: Measure Every Endpoint and Compare Against a Baseline.
+
+How it works:
+    - create_context() adds the benchmark actors on top of the generated
+      catalog: an admin, a shopper with a cart and 25 orders, and a few
+      products with stock that checkouts can't run out of
+    - measure() sends each endpoint through the Django test client
+      (rest_framework.test.APIClient, with real Bearer tokens), after a
+      few warmup requests. Each timed request runs inside
+      CaptureQueriesContext, so its query count is exact
+    - Unless warm_cache is set, the cache is cleared before every request,
+      so catalog reads measure the database path, not a cache hit
+    - One extra request per endpoint runs under tracemalloc to record the
+      peak memory it allocates (tracing slows requests, so it isn't timed)
+
+Results are plain dicts; benchmarks/__main__.py writes them to JSON and
+benchmarks/compare.py checks them against budgets and a baseline.
+"""
+
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from orders.models import Order, OrderItem
+from products.generator import GENERATED_PASSWORD
+from products.models import Category, Product
+
+from .endpoints import fill_cart
+
+User = get_user_model()
+
+# Stock given to the context's products, so checkouts never run out
+BENCH_INVENTORY = 10**6
+
+
+def create_context(product_count=5, order_count=25):
+    """
+    Create the benchmark actors and return the placeholder values.
+
+    Users and products left by an earlier run on a kept database (all
+    named "bench-...") are deleted first.
+
+    Returns:
+        dict: Values for Endpoint paths and bodies (see benchmarks/endpoints.py)
+    """
+    User.objects.filter(email__startswith="bench-").delete()
+    Product.objects.filter(slug__startswith="bench-").delete()
+
+    admin = User.objects.create_superuser(
+        email="bench-admin@example.com", password=GENERATED_PASSWORD
+    )
+    shopper = User.objects.create_user(
+        email="bench-shopper@example.com",
+        password=GENERATED_PASSWORD,
+        first_name="Bench",
+        last_name="Shopper",
+    )
+
+    product_ids = list(
+        Product.objects.filter(is_active=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:product_count]
+    )
+    Product.objects.filter(pk__in=product_ids).update(
+        inventory_count=BENCH_INVENTORY
+    )
+    products = Product.objects.in_bulk(product_ids)
+
+    for n in range(order_count):
+        product = products[product_ids[n % len(product_ids)]]
+        order = Order.objects.create(
+            user=shopper,
+            status=Order.Status.DELIVERED,
+            total_amount=product.price,
+            shipping_address="1 Benchmark Street",
+        )
+        OrderItem.objects.create(
+            order=order,
+            product=product,
+            quantity=1,
+            price_at_purchase=product.price,
+        )
+
+    category = Category.objects.filter(is_active=True).order_by(
+        "-active_product_count", "pk"
+    )[0]
+    active_count = Product.objects.filter(is_active=True).count()
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+    context = {
+        "admin": admin,
+        "shopper": shopper,
+        "shopper_email": shopper.email,
+        "product": products[product_ids[0]].slug,
+        "product_id": product_ids[0],
+        "product_ids": product_ids,
+        "category": category.slug,
+        "category_id": category.pk,
+        "order": order.pk,
+        "deep_page": max(active_count // page_size // 2, 1),
+    }
+    fill_cart(context)
+    return context
+
+
+def get_clients(context):
+    """One APIClient per auth mode, holding a Bearer token for its user."""
+    clients = {None: APIClient()}
+    for auth, user in (("user", context["shopper"]), ("admin", context["admin"])):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        clients[auth] = client
+    return clients
+
+
+def get_body(endpoint, values):
+    """The request body, with {placeholders} in string values filled in."""
+    data = endpoint.data
+    if callable(data):
+        return data(values)
+    if data is None:
+        return None
+    return {
+        key: value.format(**values) if isinstance(value, str) else value
+        for key, value in data.items()
+    }
+
+
+def prepare_request(endpoint, context, clients, warm_cache):
+    """
+    Run the endpoint's prepare step and build its request.
+
+    Returns:
+        callable: Sends the request and returns the response
+    """
+    values = dict(context)
+    if endpoint.prepare is not None:
+        values.update(endpoint.prepare(context))
+    path = endpoint.path.format(**values)
+    data = get_body(endpoint, values)
+    send = getattr(clients[endpoint.auth], endpoint.method)
+    if not warm_cache:
+        cache.clear()
+
+    if endpoint.method == "get":
+        return lambda: send(path)
+    return lambda: send(path, data, format=endpoint.format)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def measure(endpoint, context, clients, iterations=20, warmup=3, warm_cache=False):
+    """
+    Benchmark one endpoint.
+
+    Returns:
+        dict: Latency (ms), queries, peak memory (KiB), errors and the
+            status codes seen
+    """
+    for _ in range(warmup):
+        prepare_request(endpoint, context, clients, warm_cache)()
+
+    timings = []
+    query_counts = []
+    status_codes = {}
+    for _ in range(iterations):
+        send = prepare_request(endpoint, context, clients, warm_cache)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = send()
+            timings.append((time.perf_counter() - started) * 1000)
+        query_counts.append(len(queries))
+        code = str(response.status_code)
+        status_codes[code] = status_codes.get(code, 0) + 1
+
+    send = prepare_request(endpoint, context, clients, warm_cache)
+    tracemalloc.start()
+    try:
+        send()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "method": endpoint.method.upper(),
+        "path": endpoint.path,
+        "iterations": iterations,
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "queries": max(query_counts),
+        "max_queries": endpoint.max_queries,
+        "peak_memory_kb": round(peak / 1024, 1),
+        "errors": iterations - status_codes.get(str(endpoint.expected_status), 0),
+        "status_codes": status_codes,
+    }
+
+
+def run_benchmarks(endpoints, context, iterations=20, warmup=3, warm_cache=False):
+    """
+    Benchmark each endpoint in turn.
+
+    Yields:
+        tuple: (endpoint name, result dict), as each one finishes
+    """
+    clients = get_clients(context)
+    for endpoint in endpoints:
+        yield endpoint.name, measure(
+            endpoint, context, clients, iterations, warmup, warm_cache
+        )
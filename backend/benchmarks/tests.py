@@ -0,0 +1,111 @@
+"""
+Tests for the Benchmark Suite.
+
+Tests for:
+    - Budget and baseline checks (compare_results)
+    - A one-iteration run over every endpoint on a tiny catalog (slow)
+
+pytest-django docs: https://pytest-django.readthedocs.io/
+"""
+
+import pytest
+
+from benchmarks.compare import compare_results
+from benchmarks.endpoints import ENDPOINTS
+from benchmarks.runner import create_context, run_benchmarks
+from products.generator import generate_catalog
+
+
+def make_result(p95_ms=10.0, queries=3, max_queries=5, peak_memory_kb=100.0):
+    """A result dict with only the fields compare_results reads."""
+    return {
+        "p95_ms": p95_ms,
+        "queries": queries,
+        "max_queries": max_queries,
+        "peak_memory_kb": peak_memory_kb,
+        "errors": 0,
+        "status_codes": {"200": 1},
+    }
+
+
+# =============================================================================
+# Budget and Baseline Checks
+# =============================================================================
+
+
+class TestCompareResults:
+    """Tests for compare_results()."""
+
+    def test_within_budget_passes(self):
+        """Results within budget and like the baseline pass."""
+        results = {"product-list": make_result()}
+        assert compare_results(results, {"product-list": make_result()}) == []
+
+    def test_query_budget_exceeded(self):
+        """More queries than max_queries fails without a baseline."""
+        failures = compare_results({"product-list": make_result(queries=6)})
+        assert failures == ["product-list: 6 queries, budget 5"]
+
+    def test_unexpected_status_fails(self):
+        """Responses with an unexpected status code fail."""
+        result = make_result()
+        result.update(errors=1, status_codes={"500": 1})
+        assert len(compare_results({"product-list": result})) == 1
+
+    def test_more_queries_than_baseline(self):
+        """An extra query fails even within the budget."""
+        failures = compare_results(
+            {"product-list": make_result(queries=4)},
+            {"product-list": make_result(queries=3)},
+        )
+        assert failures == ["product-list: 4 queries, baseline 3"]
+
+    def test_latency_regression(self):
+        """p95 over baseline * (1 + tolerance) fails."""
+        failures = compare_results(
+            {"product-list": make_result(p95_ms=20.0)},
+            {"product-list": make_result(p95_ms=10.0)},
+            tolerance=0.2,
+        )
+        assert failures == ["product-list: p95 20.0 ms, baseline 10.0 ms"]
+
+    def test_small_latency_change_is_noise(self):
+        """A large ratio on a tiny absolute change isn't a regression."""
+        results = {"health": make_result(p95_ms=1.5)}
+        assert compare_results(results, {"health": make_result(p95_ms=0.5)}) == []
+
+    def test_memory_regression(self):
+        """Peak memory growing past the tolerance fails."""
+        failures = compare_results(
+            {"product-list": make_result(peak_memory_kb=500.0)},
+            {"product-list": make_result(peak_memory_kb=100.0)},
+        )
+        assert len(failures) == 1
+        assert "peak memory" in failures[0]
+
+    def test_new_endpoint_only_checks_budget(self):
+        """Endpoints missing from the baseline aren't compared to it."""
+        results = {"product-facets": make_result(p95_ms=500.0)}
+        assert compare_results(results, {}) == []
+
+
+# =============================================================================
+# Smoke Run
+# =============================================================================
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestBenchmarkRun:
+    """Run every endpoint once on a tiny synthetic catalog."""
+
+    def test_every_endpoint_within_budget(self, settings):
+        """Every endpoint answers as expected and within its query budget."""
+        settings.DATABASE_REPLICAS = []
+        generate_catalog(products=200, users=20, carts=10, orders=40)
+        context = create_context()
+
+        results = dict(run_benchmarks(ENDPOINTS, context, iterations=1, warmup=0))
+
+        assert set(results) == {endpoint.name for endpoint in ENDPOINTS}
+        assert compare_results(results) == []
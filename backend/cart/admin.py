@@ -122,11 +122,20 @@ class CartAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """
+        Annotate cart totals for the changelist.
+
+        Without this, each row's totals would load every item and product.
+        """
+        return super().get_queryset(request).with_totals()
+
     def total_items_display(self, obj):
         """
         Display total items count.
 
-        Uses the model's total_items property which sums all quantities.
+        Uses the model's total_items property, which reads the annotation
+        from get_queryset().
         """
         return obj.total_items
 
@@ -136,7 +145,8 @@ class CartAdmin(admin.ModelAdmin):
         """
         Display total cart value formatted as currency.
 
-        Uses the model's total_amount property which sums all subtotals.
+        Uses the model's total_amount property, which reads the annotation
+        from get_queryset().
         """
         return f"${obj.total_amount:.2f}"
 
@@ -22,3 +22,7 @@ class CartConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "cart"
     verbose_name = "Shopping Cart"
+
+    def ready(self):
+        """Connect signal handlers and register the summary cache check."""
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,42 @@
+"""
+Async Cart Summary for the Header Badge.
+
+GET /api/async/cart/summary/ returns the same payload as
+GET /api/cart/summary/, but runs on the event loop under ASGI: the JWT
+is checked without DRF (users/authentication.py) and the summary comes
+from aget_cart_summary() (cart/summary.py). See products/async_views.py
+for the other async read endpoints.
+"""
+
+from django.views.decorators.http import require_safe
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from products.async_views import json_response
+from users.authentication import aauthenticate
+
+from .summary import aget_cart_summary
+
+NOT_AUTHENTICATED = {"detail": "Authentication credentials were not provided."}
+
+
+def unauthorized(request, data):
+    """401 response with the same body and header DRF would send."""
+    response = json_response(data, status=401)
+    response["WWW-Authenticate"] = JWTAuthentication().authenticate_header(request)
+    return response
+
+
+@require_safe
+async def cart_summary(request):
+    """GET /api/async/cart/summary/ (requires a Bearer token)."""
+    try:
+        user = await aauthenticate(request)
+    except AuthenticationFailed as exc:
+        detail = exc.detail
+        return unauthorized(
+            request, detail if isinstance(detail, dict) else {"detail": detail}
+        )
+    if user is None:
+        return unauthorized(request, NOT_AUTHENTICATED)
+    return json_response(await aget_cart_summary(user.pk))
@@ -0,0 +1,41 @@
+"""
+Deployment Check for the Cart Summary Cache.
+
+Cart changes invalidate a user's cached summary by deleting its cache
+entry (cart/summary.py). With a process-local backend such as
+LocMemCache that delete only reaches the worker that handled the change;
+the header badge polled through any other worker keeps the old count
+until CART_SUMMARY_CACHE_TIMEOUT runs out.
+
+Like the catalog cache check (products/checks.py) this runs with
+"manage.py check --deploy", which Dockerfile.prod runs before starting
+the server.
+
+Configuration (config/settings.py):
+    CACHES["default"]            - Set CACHE_BACKEND/CACHE_LOCATION to Redis
+    CART_SUMMARY_CACHE_TIMEOUT   - Or set to 0 to turn the summary cache off
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from products.checks import is_cache_shared
+
+
+@register(Tags.caches, deploy=True)
+def check_cart_summary_cache_backend(app_configs, **kwargs):
+    """Refuse a process-local cache backend while summaries are cached."""
+    if not getattr(settings, "CART_SUMMARY_CACHE_TIMEOUT", 0) or is_cache_shared():
+        return []
+    return [
+        Error(
+            "The cart summary cache is enabled but the default cache backend "
+            "is process-local, so cart changes only invalidate the worker "
+            "that handled them.",
+            hint=(
+                "Set CACHE_BACKEND and CACHE_LOCATION to a shared backend "
+                "(e.g. Redis), or set CART_SUMMARY_CACHE_TIMEOUT=0."
+            ),
+            id="cart.E001",
+        )
+    ]
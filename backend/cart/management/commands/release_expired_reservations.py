@@ -0,0 +1,39 @@
+"""
+Management command: release expired cart inventory reservations.
+
+Expired holds already stop counting against available stock; this command
+deletes the rows so the reservation table stays small. Run it from cron or
+a scheduler, e.g. every minute:
+
+    python manage.py release_expired_reservations
+    python manage.py release_expired_reservations --batch-size 5000
+
+Django management command docs:
+    https://docs.djangoproject.com/en/5.0/howto/custom-management-commands/
+"""
+
+from django.core.management.base import BaseCommand
+
+from cart.reservations import release_expired
+
+
+class Command(BaseCommand):
+    """Delete expired InventoryReservation rows in batches."""
+
+    help = "Delete expired cart inventory reservations in batches."
+
+    def add_arguments(self, parser):
+        """Add the --batch-size option."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Maximum reservations deleted per transaction (default 1000)",
+        )
+
+    def handle(self, *args, **options):
+        """Release expired holds and report how many were deleted."""
+        released = release_expired(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Released {released} expired reservation(s).")
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-16 09:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0001_initial'),
+        ('products', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(help_text='Number of units held')),
+                ('expires_at', models.DateTimeField(help_text='When the hold lapses')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('cart_item', models.OneToOneField(help_text='Cart line holding the stock', on_delete=django.db.models.deletion.CASCADE, related_name='reservation', to='cart.cartitem')),
+                ('product', models.ForeignKey(help_text='Reserved product (copied from the cart item)', on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='products.product')),
+            ],
+            options={
+                'verbose_name': 'Inventory Reservation',
+                'verbose_name_plural': 'Inventory Reservations',
+                'indexes': [models.Index(fields=['product', 'expires_at'], name='cart_invent_product_625dd3_idx'), models.Index(fields=['expires_at'], name='cart_invent_expires_511517_idx')],
+            },
+        ),
+    ]
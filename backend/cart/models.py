@@ -4,6 +4,7 @@ Shopping Cart Models.
 This module defines the data models for the shopping cart:
 - Cart: Container for cart items, linked to a user
 - CartItem: Individual item in the cart with quantity
+- InventoryReservation: Time-limited stock hold for a cart item
 
 Design Decisions:
 - One cart per user (OneToOneField)
@@ -15,6 +16,7 @@ Relationships:
 - Cart -> User: OneToOne (each user has one cart)
 - CartItem -> Cart: ForeignKey (cart has many items)
 - CartItem -> Product: ForeignKey (item references a product)
+- InventoryReservation -> CartItem: OneToOne (one hold per cart line)
 
 Why not store price in CartItem?
 - Prices can change, and we want to show current price in cart
@@ -28,6 +30,32 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.db import models
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+class CartQuerySet(models.QuerySet):
+    """Custom queryset for Cart (available as Cart.objects.<method>)."""
+
+    def with_totals(self):
+        """
+        Annotate each cart with its item count and value.
+
+        Both sums are computed in the same query as the cart itself, so
+        the total_items/total_amount properties don't have to load every
+        item and product. Empty carts get 0, not NULL.
+        """
+        return self.annotate(
+            annotated_total_items=Coalesce(Sum("items__quantity"), 0),
+            annotated_total_amount=Coalesce(
+                Sum(
+                    F("items__quantity") * F("items__product__price"),
+                    output_field=DecimalField(max_digits=10, decimal_places=2),
+                ),
+                Value(Decimal("0.00")),
+                output_field=DecimalField(max_digits=10, decimal_places=2),
+            ),
+        )
 
 
 class Cart(models.Model):
@@ -46,6 +74,8 @@ class Cart(models.Model):
     Properties:
         total_items: Sum of all item quantities in the cart
         total_amount: Sum of all item subtotals (quantity × current price)
+        (both read the annotations from Cart.objects.with_totals() when
+        present instead of iterating the items)
 
     Design Notes:
         - Using OneToOneField ensures one cart per user (enforced at DB level)
@@ -63,6 +93,8 @@ class Cart(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CartQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Cart'
         verbose_name_plural = 'Carts'
@@ -82,6 +114,9 @@ class Cart(models.Model):
         Returns:
             int: Total quantity of all items in cart
         """
+        annotated = getattr(self, 'annotated_total_items', None)
+        if annotated is not None:
+            return annotated
         return sum(item.quantity for item in self.items.all())
 
     @property
@@ -96,6 +131,9 @@ class Cart(models.Model):
         Returns:
             Decimal: Total value of all items in cart
         """
+        annotated = getattr(self, 'annotated_total_amount', None)
+        if annotated is not None:
+            return annotated
         return sum(item.subtotal for item in self.items.all())
 
 
@@ -173,3 +211,64 @@ class CartItem(models.Model):
             Decimal: Total value for this cart item
         """
         return self.product.price * self.quantity
+
+
+class InventoryReservation(models.Model):
+    """
+    Stock held for a cart item until it expires.
+
+    While a reservation is active, its quantity is subtracted from the
+    product's available stock for every other shopper (see
+    cart/reservations.py), so a flash sale can't put more units in carts
+    than exist and then fail most checkouts.
+
+    Fields:
+        cart_item: The cart line holding the stock
+        product: Copy of cart_item.product, so active holds per product can
+            be summed from the (product, expires_at) index without a join
+        quantity: Units held (always equal to the cart item's quantity)
+        expires_at: When the hold lapses; refreshed whenever the line changes
+        created_at: When the hold was first placed
+
+    Design Notes:
+        - Expired rows are simply ignored by the available-stock aggregate;
+          the release_expired_reservations command deletes them in batches
+        - Deleting the cart item (remove, clear cart, checkout) cascades
+    """
+
+    cart_item = models.OneToOneField(
+        CartItem,
+        on_delete=models.CASCADE,
+        related_name='reservation',
+        help_text="Cart line holding the stock"
+    )
+    product = models.ForeignKey(
+        'products.Product',
+        on_delete=models.CASCADE,
+        related_name='reservations',
+        help_text="Reserved product (copied from the cart item)"
+    )
+    quantity = models.PositiveIntegerField(
+        help_text="Number of units held"
+    )
+    expires_at = models.DateTimeField(
+        help_text="When the hold lapses"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Inventory Reservation'
+        verbose_name_plural = 'Inventory Reservations'
+        indexes = [
+            # SUM(quantity) of active holds per product
+            models.Index(fields=['product', 'expires_at']),
+            # Sweeper: find expired holds
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self) -> str:
+        """Return string showing quantity, product id and expiry."""
+        return (
+            f"{self.quantity}x product {self.product_id} "
+            f"until {self.expires_at:%Y-%m-%d %H:%M}"
+        )
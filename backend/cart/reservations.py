@@ -0,0 +1,147 @@
+"""
+Inventory Reservations for Cart Items.
+
+Adding a product to the cart places a time-limited hold on that many
+units. Other shoppers see only the stock nobody is holding:
+
+    available = inventory_count - SUM(quantity of active holds)
+
+so during a flash sale the cart, not checkout, is where "sold out" shows up.
+Holds are refreshed whenever the cart line changes, and dropped when the
+line is removed or checked out (cascade delete).
+
+How it works:
+    - get_reserved_quantities() sums active holds with one GROUP BY query
+      served by the (product_id, expires_at) index
+    - lock_available_stock() locks the product row (SELECT ... FOR UPDATE)
+      before checking availability, so two shoppers can't reserve the same
+      units
+    - refresh_holds() upserts the holds for many lines in one statement
+      (batch add, POST /api/cart/items/batch/)
+    - Expired holds are ignored immediately and deleted later in batches by
+      release_expired() (python manage.py release_expired_reservations)
+
+Configuration (config/settings.py):
+    CART_RESERVATION_TTL - Seconds a hold lasts after the last cart change
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from products.models import Product
+
+from .models import InventoryReservation
+
+
+def get_reserved_quantities(product_ids, exclude_cart=None):
+    """
+    Sum the active holds for several products in one query.
+
+    Args:
+        product_ids: Iterable of product primary keys
+        exclude_cart: Cart whose own holds should not count (a shopper's
+            own reservation never blocks them)
+
+    Returns:
+        dict: {product_id: units held}; products without holds are omitted
+    """
+    holds = InventoryReservation.objects.filter(
+        product_id__in=list(product_ids), expires_at__gt=timezone.now()
+    )
+    if exclude_cart is not None:
+        holds = holds.exclude(cart_item__cart=exclude_cart)
+    return dict(
+        holds.values("product_id")
+        .annotate(held=Sum("quantity"))
+        .values_list("product_id", "held")
+    )
+
+
+def get_available_stock(product, exclude_cart=None):
+    """Return inventory_count minus units held by other carts."""
+    held = get_reserved_quantities([product.pk], exclude_cart).get(product.pk, 0)
+    return max(product.inventory_count - held, 0)
+
+
+def lock_available_stock(cart, product):
+    """
+    Lock the product row and return the units this cart may hold.
+
+    Call inside transaction.atomic() before saving a cart line, then call
+    refresh_hold() once it is saved. The lock lasts until commit, so
+    concurrent shoppers reserving the same product queue up instead of
+    both seeing the same free units.
+
+    Args:
+        cart: Cart the units are for (its own holds don't count)
+        product: Product being reserved
+
+    Returns:
+        int: Units available to this cart
+    """
+    locked = Product.objects.select_for_update().get(pk=product.pk)
+    return get_available_stock(locked, exclude_cart=cart)
+
+
+def refresh_hold(cart_item):
+    """Create or extend the hold for a saved cart item."""
+    InventoryReservation.objects.update_or_create(
+        cart_item=cart_item,
+        defaults={
+            "product_id": cart_item.product_id,
+            "quantity": cart_item.quantity,
+            "expires_at": timezone.now()
+            + timedelta(seconds=settings.CART_RESERVATION_TTL),
+        },
+    )
+
+
+def refresh_holds(cart_items):
+    """Create or extend the holds for several saved cart items in one query."""
+    expires_at = timezone.now() + timedelta(seconds=settings.CART_RESERVATION_TTL)
+    InventoryReservation.objects.bulk_create(
+        [
+            InventoryReservation(
+                cart_item=cart_item,
+                product_id=cart_item.product_id,
+                quantity=cart_item.quantity,
+                expires_at=expires_at,
+            )
+            for cart_item in cart_items
+        ],
+        update_conflicts=True,
+        unique_fields=["cart_item"],
+        update_fields=["product", "quantity", "expires_at"],
+    )
+
+
+def release_expired(batch_size=1000):
+    """
+    Delete expired holds in batches.
+
+    Each batch is its own short transaction, so a large backlog never
+    locks the reservation table for long.
+
+    Args:
+        batch_size: Maximum rows deleted per batch
+
+    Returns:
+        int: Number of holds released
+    """
+    released = 0
+    now = timezone.now()
+    while True:
+        with transaction.atomic():
+            batch = list(
+                InventoryReservation.objects.filter(expires_at__lte=now)
+                .order_by("expires_at")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                return released
+            InventoryReservation.objects.filter(pk__in=batch).delete()
+        released += len(batch)
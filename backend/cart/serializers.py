@@ -3,6 +3,7 @@ Cart Serializers for Django REST Framework.
 
 Handles serialization for:
     - Cart items (view, add, update, remove)
+    - Batch adds (many lines in one request)
     - Cart summary (with totals)
 
 Design Notes:
@@ -21,6 +22,9 @@ from products.serializers import ProductListSerializer
 
 from .models import Cart, CartItem
 
+# Most lines accepted by POST /api/cart/items/batch/
+MAX_BATCH_LINES = 100
+
 
 class CartItemSerializer(serializers.ModelSerializer):
     """
@@ -54,19 +58,16 @@ class CartItemCreateSerializer(serializers.Serializer):
     product_id = serializers.IntegerField()
     quantity = serializers.IntegerField(min_value=1, default=1)
 
-    def validate_product_id(self, value):
-        """Validate product exists and is active."""
-        try:
-            Product.objects.get(id=value, is_active=True)
-        except Product.DoesNotExist:
+    def validate(self, attrs):
+        """Validate the product and its stock with a single lookup."""
+        product = Product.objects.filter(
+            id=attrs["product_id"], is_active=True
+        ).first()
+
+        if product is None:
             raise serializers.ValidationError(
-                "Product not found or unavailable."
+                {"product_id": "Product not found or unavailable."}
             )
-        return value
-
-    def validate(self, attrs):
-        """Validate stock availability for the requested quantity."""
-        product = Product.objects.get(id=attrs["product_id"])
 
         if not product.is_in_stock:
             raise serializers.ValidationError(
@@ -87,6 +88,41 @@ class CartItemCreateSerializer(serializers.Serializer):
         return attrs
 
 
+class CartItemBatchLineSerializer(serializers.Serializer):
+    """One line of a batch add: a product and the quantity to add."""
+
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class CartItemBatchSerializer(serializers.Serializer):
+    """
+    Serializer for adding many items to the cart at once.
+
+    Only checks the shape of the request here; products and stock are
+    checked by CartItemBatchView with one locked query for all lines.
+    Errors are keyed by line index: {"items": {"2": {"quantity": [...]}}}
+    """
+
+    items = serializers.ListField(
+        child=CartItemBatchLineSerializer(),
+        allow_empty=False,
+        max_length=MAX_BATCH_LINES,
+    )
+
+    def validate_items(self, value):
+        """Reject a product listed on more than one line."""
+        errors = {}
+        seen = set()
+        for index, line in enumerate(value):
+            if line["product_id"] in seen:
+                errors[index] = {"product_id": ["Product is listed twice."]}
+            seen.add(line["product_id"])
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
+
 class CartItemUpdateSerializer(serializers.Serializer):
     """
     Serializer for updating cart item quantity.
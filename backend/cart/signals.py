@@ -0,0 +1,27 @@
+"""
+Signal Handlers for the Cart App.
+
+Keeps the cached cart summaries (cart/summary.py) in sync with the cart:
+any CartItem save or delete invalidates the owner's summary.
+
+Signals are connected in CartConfig.ready().
+
+Django signals docs: https://docs.djangoproject.com/en/5.0/topics/signals/
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Cart, CartItem
+from .summary import invalidate_cart_summary
+
+
+@receiver(post_save, sender=CartItem)
+@receiver(post_delete, sender=CartItem)
+def invalidate_summary_cache(sender, instance, **kwargs):
+    """Invalidate the cart owner's cached summary after an item change."""
+    try:
+        user_id = instance.cart.user_id
+    except Cart.DoesNotExist:
+        return
+    invalidate_cart_summary(user_id)
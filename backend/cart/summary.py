@@ -0,0 +1,126 @@
+"""
+Aggregate-Only Cart Summary for the Header Badge.
+
+GET /api/cart/summary/ is polled constantly by the frontend, so it never
+loads CartItem or Product rows. The count and value come from one query:
+
+    SELECT SUM(quantity), SUM(quantity * product.price)
+    FROM cart_cartitem JOIN cart_cart ... JOIN products_product ...
+    WHERE cart_cart.user_id = <user>
+
+and the result is cached per user, so repeated polls cost no query at all.
+
+Invalidation:
+    - Cart item saves/deletes delete the user's entry (cart/signals.py)
+    - The key embeds the catalog version (products/cache.py), so product
+      price changes invalidate every cached summary at once
+
+aget_cart_summary() does the same with the async ORM and cache API for
+GET /api/async/cart/summary/ (cart/async_views.py).
+
+The deletes must reach every server worker, so production needs a
+shared cache backend (Redis); "manage.py check --deploy" rejects a
+process-local one while the cache is on (cart/checks.py).
+
+Configuration (config/settings.py):
+    CART_SUMMARY_CACHE_TIMEOUT - Seconds to cache a summary (0 disables)
+"""
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from config.metrics import record_cache_lookup
+from products.cache import aget_catalog_version, get_catalog_version
+
+from .models import CartItem
+from .serializers import CartSummarySerializer
+
+
+def get_summary_cache_key(user_id, version=None):
+    """Return the cache key for a user's cart summary."""
+    if version is None:
+        version = get_catalog_version()
+    return f"cart:summary:v{version}:{user_id}"
+
+
+def get_summary_aggregates():
+    """Return the aggregate expressions for a cart summary."""
+    return {
+        "total_items": Coalesce(Sum("quantity"), 0),
+        "total_amount": Coalesce(
+            Sum(
+                F("quantity") * F("product__price"),
+                output_field=DecimalField(max_digits=10, decimal_places=2),
+            ),
+            Value(Decimal("0.00")),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        ),
+    }
+
+
+def compute_cart_summary(user):
+    """
+    Sum a user's cart in one aggregate query.
+
+    Returns:
+        dict: {"total_items": int, "total_amount": Decimal}; zeros when the
+            user has no cart or an empty one
+    """
+    return CartItem.objects.filter(cart__user=user).aggregate(
+        **get_summary_aggregates()
+    )
+
+
+def get_cart_summary(user):
+    """
+    Return a user's serialized cart summary, from the cache when possible.
+
+    Returns:
+        dict: CartSummarySerializer data
+    """
+    timeout = getattr(settings, "CART_SUMMARY_CACHE_TIMEOUT", 0)
+    if not timeout:
+        return CartSummarySerializer(compute_cart_summary(user)).data
+
+    key = get_summary_cache_key(user.pk)
+    data = cache.get(key)
+    record_cache_lookup("cart_summary", hit=data is not None)
+    if data is None:
+        data = dict(CartSummarySerializer(compute_cart_summary(user)).data)
+        cache.set(key, data, timeout)
+    return data
+
+
+async def aget_cart_summary(user_id):
+    """Async version of get_cart_summary(), taking the user's id."""
+    timeout = getattr(settings, "CART_SUMMARY_CACHE_TIMEOUT", 0)
+    key = get_summary_cache_key(user_id, await aget_catalog_version())
+    data = None
+    if timeout:
+        data = await cache.aget(key)
+        record_cache_lookup("cart_summary", hit=data is not None)
+    if data is None:
+        summary = await CartItem.objects.filter(cart__user_id=user_id).aaggregate(
+            **get_summary_aggregates()
+        )
+        data = dict(CartSummarySerializer(summary).data)
+        if timeout:
+            await cache.aset(key, data, timeout)
+    return data
+
+
+def invalidate_cart_summary(user_id):
+    """
+    Drop a user's cached summary now and again after commit.
+
+    The second delete removes anything a concurrent poll cached from rows
+    read before this transaction's changes became visible.
+    """
+    key = get_summary_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(get_summary_cache_key(user_id)))
@@ -4,10 +4,12 @@ Tests for Cart API.
 Comprehensive tests for:
     - View cart (GET /api/cart/)
     - Clear cart (DELETE /api/cart/)
-    - Cart summary (GET /api/cart/summary/)
+    - Cart summary (GET /api/cart/summary/, GET /api/async/cart/summary/)
     - Add item to cart (POST /api/cart/items/)
+    - Batch add to cart (POST /api/cart/items/batch/)
     - Update item quantity (PATCH /api/cart/items/{id}/)
     - Remove item from cart (DELETE /api/cart/items/{id}/)
+    - Inventory reservations (holds, expiry, batch release)
 
 Testing Strategy:
     - All cart endpoints require authentication (test 401 for anonymous)
@@ -20,13 +22,23 @@ Testing Strategy:
 pytest-django docs: https://pytest-django.readthedocs.io/
 """
 
+from datetime import timedelta
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-from cart.models import Cart, CartItem
+from cart.checks import check_cart_summary_cache_backend
+from cart.models import Cart, CartItem, InventoryReservation
+from cart.reservations import get_available_stock
 from products.models import Category, Product
 
 User = get_user_model()
@@ -37,6 +49,12 @@ User = get_user_model()
 # =============================================================================
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache (no cart summaries left over)."""
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Return an unauthenticated API client."""
@@ -159,6 +177,38 @@ class TestCartView:
         # Total: 999.99 * 2 + 599.99 * 1 = 2599.97
         assert response.data["total_amount"] == "2599.97"
 
+    def test_get_cart_query_count_is_fixed(
+        self, authenticated_client, cart_with_items, category,
+        django_assert_num_queries,
+    ):
+        """Cart, then items with products and categories: 2 queries for any size."""
+        cart, item1, item2 = cart_with_items
+        url = reverse("cart:cart")
+
+        with django_assert_num_queries(2):
+            authenticated_client.get(url)
+
+        for i in range(5):
+            CartItem.objects.create(
+                cart=cart,
+                product=Product.objects.create(
+                    name=f"Accessory {i}",
+                    slug=f"accessory-{i}",
+                    price="9.99",
+                    category=category,
+                    inventory_count=10,
+                ),
+            )
+
+        with django_assert_num_queries(2):
+            response = authenticated_client.get(url)
+
+        assert len(response.data["items"]) == 7
+        assert response.data["total_items"] == 8
+        assert response.data["items"][0]["product"]["category"][
+            "product_count"
+        ] == 7
+
     def test_clear_cart(self, authenticated_client, cart_with_items):
         """DELETE /api/cart/ removes all items from cart."""
         url = reverse("cart:cart")
@@ -212,6 +262,117 @@ class TestCartSummary:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_summary_is_one_aggregate_query(
+        self, authenticated_client, cart_with_items, django_assert_num_queries
+    ):
+        """A cold summary costs one query; a cached one costs none."""
+        url = reverse("cart:cart-summary")
+
+        with django_assert_num_queries(1):
+            first = authenticated_client.get(url)
+        with django_assert_num_queries(0):
+            second = authenticated_client.get(url)
+
+        assert first.data == second.data
+        assert second.data["total_items"] == 3
+
+    def test_summary_invalidated_by_cart_changes(
+        self, authenticated_client, cart_with_items
+    ):
+        """Adding, updating and removing items refresh the cached summary."""
+        cart, item1, item2 = cart_with_items
+        url = reverse("cart:cart-summary")
+        assert authenticated_client.get(url).data["total_items"] == 3
+
+        item1.quantity = 5
+        item1.save()
+        assert authenticated_client.get(url).data["total_items"] == 6
+
+        item2.delete()
+        response = authenticated_client.get(url)
+        assert response.data["total_items"] == 5
+        assert response.data["total_amount"] == "4999.95"
+
+        authenticated_client.delete(reverse("cart:cart"))
+        assert authenticated_client.get(url).data["total_items"] == 0
+
+    def test_summary_invalidated_by_price_change(
+        self, authenticated_client, cart_with_items, product
+    ):
+        """Product price changes show up in cached summaries."""
+        url = reverse("cart:cart-summary")
+        authenticated_client.get(url)
+
+        product.price = "1000.00"
+        product.save()
+        response = authenticated_client.get(url)
+
+        assert response.data["total_amount"] == "2599.99"
+
+    def test_deploy_check_rejects_process_local_cache(self, settings):
+        """check --deploy fails while summaries are cached in locmem."""
+        settings.CART_SUMMARY_CACHE_TIMEOUT = 300
+        errors = check_cart_summary_cache_backend(None)
+
+        assert [error.id for error in errors] == ["cart.E001"]
+
+        settings.CART_SUMMARY_CACHE_TIMEOUT = 0
+        assert check_cart_summary_cache_backend(None) == []
+
+
+@pytest.mark.django_db
+class TestAsyncCartSummary:
+    """The async summary (GET /api/async/cart/summary/) matches the DRF one."""
+
+    def bearer(self, user):
+        """Authorization header with a real access token for user."""
+        return {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"}
+
+    def test_matches_sync_summary(
+        self, api_client, authenticated_client, test_user, cart_with_items
+    ):
+        """Same totals as the DRF endpoint, in one query then none."""
+        expected = authenticated_client.get(reverse("cart:cart-summary")).json()
+        cache.clear()
+        url = reverse("async-cart-summary")
+
+        with CaptureQueriesContext(connection) as cold:
+            first = api_client.get(url, **self.bearer(test_user))
+        with CaptureQueriesContext(connection) as warm:
+            second = api_client.get(url, **self.bearer(test_user))
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.json() == second.json() == expected
+        # User lookup + aggregate; the cached poll only looks up the user
+        assert len(cold) == 2
+        assert len(warm) == 1
+
+    def test_missing_token(self, api_client):
+        """Anonymous requests get 401 with a Bearer challenge."""
+        response = api_client.get(reverse("async-cart-summary"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response["WWW-Authenticate"].startswith("Bearer")
+
+    def test_invalid_token(self, api_client):
+        """Malformed or forged tokens are rejected."""
+        response = api_client.get(
+            reverse("async-cart-summary"), HTTP_AUTHORIZATION="Bearer not-a-token"
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["code"] == "token_not_valid"
+
+    def test_inactive_user(self, api_client, test_user):
+        """Tokens of deactivated users stop working."""
+        headers = self.bearer(test_user)
+        test_user.is_active = False
+        test_user.save()
+
+        response = api_client.get(reverse("async-cart-summary"), **headers)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
 
 # =============================================================================
 # Add to Cart Tests (POST /api/cart/items/)
@@ -298,6 +459,122 @@ class TestAddToCart:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+# =============================================================================
+# Batch Add to Cart Tests (POST /api/cart/items/batch/)
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestBatchAddToCart:
+    """Test adding many lines in one request."""
+
+    def test_batch_adds_and_increases(
+        self, authenticated_client, test_user, product, second_product
+    ):
+        """New lines are created and existing lines increased."""
+        cart = Cart.objects.create(user=test_user)
+        CartItem.objects.create(cart=cart, product=product, quantity=2)
+        url = reverse("cart:cart-items-batch")
+        data = {
+            "items": [
+                {"product_id": product.id, "quantity": 3},
+                {"product_id": second_product.id, "quantity": 2},
+            ]
+        }
+
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 2
+        quantities = dict(cart.items.values_list("product_id", "quantity"))
+        assert quantities == {product.id: 5, second_product.id: 2}
+        assert InventoryReservation.objects.get(
+            cart_item__product=product
+        ).quantity == 5
+
+    def test_batch_reports_errors_per_line(
+        self,
+        authenticated_client,
+        test_user,
+        product,
+        second_product,
+        product_out_of_stock,
+    ):
+        """Invalid lines are reported by index and nothing is saved."""
+        url = reverse("cart:cart-items-batch")
+        data = {
+            "items": [
+                {"product_id": product.id, "quantity": 1},
+                {"product_id": second_product.id, "quantity": 6},
+                {"product_id": product_out_of_stock.id, "quantity": 1},
+                {"product_id": 99999, "quantity": 1},
+            ]
+        }
+
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.data["items"]
+        assert set(errors) == {1, 2, 3}
+        assert errors[1]["quantity"] == ["Only 5 items available."]
+        assert "out of stock" in errors[2]["product_id"][0]
+        assert not CartItem.objects.filter(cart__user=test_user).exists()
+
+    def test_batch_rejects_duplicate_products(self, authenticated_client, product):
+        """A product may appear on only one line."""
+        url = reverse("cart:cart-items-batch")
+        data = {
+            "items": [
+                {"product_id": product.id, "quantity": 1},
+                {"product_id": product.id, "quantity": 2},
+            ]
+        }
+
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["items"] == {
+            1: {"product_id": ["Product is listed twice."]}
+        }
+
+    def test_batch_query_count_is_fixed(
+        self, authenticated_client, test_user, category, product, second_product
+    ):
+        """The number of queries doesn't grow with the number of lines."""
+        Cart.objects.create(user=test_user)
+        url = reverse("cart:cart-items-batch")
+        extra = [
+            Product.objects.create(
+                name=f"Cable {i}",
+                slug=f"cable-{i}",
+                price="9.99",
+                category=category,
+                inventory_count=10,
+            )
+            for i in range(5)
+        ]
+
+        def post(products):
+            items = [{"product_id": p.id, "quantity": 1} for p in products]
+            with CaptureQueriesContext(connection) as queries:
+                response = authenticated_client.post(
+                    url, {"items": items}, format="json"
+                )
+            assert response.status_code == status.HTTP_200_OK
+            return len(queries)
+
+        assert post([product, second_product]) == post(extra)
+
+    def test_batch_unauthenticated(self, api_client, product):
+        """Unauthenticated users cannot add to cart."""
+        url = reverse("cart:cart-items-batch")
+        data = {"items": [{"product_id": product.id, "quantity": 1}]}
+
+        response = api_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 # =============================================================================
 # Update Cart Item Tests (PATCH /api/cart/items/{id}/)
 # =============================================================================
@@ -398,3 +675,122 @@ class TestRemoveCartItem:
         response = api_client.delete(url)
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# =============================================================================
+# Inventory Reservation Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestInventoryReservation:
+    """Test stock holds placed by cart items."""
+
+    @pytest.fixture
+    def other_client(self):
+        """Return a client authenticated as a second shopper."""
+        client = APIClient()
+        client.force_authenticate(
+            user=User.objects.create_user(
+                email="rival@example.com", password="TestPassword123!"
+            )
+        )
+        return client
+
+    def test_add_item_places_hold(self, authenticated_client, product):
+        """Adding an item reserves its quantity until the TTL."""
+        url = reverse("cart:cart-items")
+        authenticated_client.post(
+            url, {"product_id": product.id, "quantity": 3}, format="json"
+        )
+
+        reservation = InventoryReservation.objects.get(product=product)
+        assert reservation.quantity == 3
+        assert reservation.expires_at > timezone.now()
+        assert get_available_stock(product) == 7
+
+    def test_held_units_unavailable_to_others(
+        self, authenticated_client, other_client, second_product
+    ):
+        """A second shopper can only reserve the units nobody holds."""
+        url = reverse("cart:cart-items")
+        authenticated_client.post(
+            url, {"product_id": second_product.id, "quantity": 4}, format="json"
+        )
+
+        response = other_client.post(
+            url, {"product_id": second_product.id, "quantity": 2}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Only 1" in response.data["detail"]
+
+    def test_own_hold_does_not_block_update(
+        self, authenticated_client, second_product
+    ):
+        """Raising your own line's quantity ignores your existing hold."""
+        url = reverse("cart:cart-items")
+        response = authenticated_client.post(
+            url, {"product_id": second_product.id, "quantity": 4}, format="json"
+        )
+        detail_url = reverse(
+            "cart:cart-item-detail", kwargs={"pk": response.data["id"]}
+        )
+
+        response = authenticated_client.patch(
+            detail_url, {"quantity": 5}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert InventoryReservation.objects.get().quantity == 5
+
+    def test_expired_holds_do_not_count(self, cart_with_items, second_product):
+        """Expired holds no longer reduce available stock."""
+        cart, item1, item2 = cart_with_items
+        InventoryReservation.objects.create(
+            cart_item=item2,
+            product=second_product,
+            quantity=1,
+            expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        assert get_available_stock(second_product) == 5
+
+    def test_removing_item_releases_hold(
+        self, authenticated_client, product
+    ):
+        """Deleting the cart line deletes its reservation."""
+        url = reverse("cart:cart-items")
+        response = authenticated_client.post(
+            url, {"product_id": product.id, "quantity": 2}, format="json"
+        )
+        authenticated_client.delete(
+            reverse("cart:cart-item-detail", kwargs={"pk": response.data["id"]})
+        )
+
+        assert not InventoryReservation.objects.exists()
+
+    def test_release_command_deletes_only_expired(
+        self, cart_with_items, product, second_product
+    ):
+        """The sweeper deletes expired holds in batches and keeps live ones."""
+        cart, item1, item2 = cart_with_items
+        now = timezone.now()
+        InventoryReservation.objects.create(
+            cart_item=item1,
+            product=product,
+            quantity=2,
+            expires_at=now - timedelta(minutes=1),
+        )
+        InventoryReservation.objects.create(
+            cart_item=item2,
+            product=second_product,
+            quantity=1,
+            expires_at=now + timedelta(minutes=10),
+        )
+
+        call_command("release_expired_reservations", batch_size=1)
+
+        assert list(
+            InventoryReservation.objects.values_list("cart_item", flat=True)
+        ) == [item2.pk]
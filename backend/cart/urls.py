@@ -9,6 +9,7 @@ URL Patterns:
     DELETE /api/cart/              - Clear entire cart
     GET    /api/cart/summary/      - Lightweight cart summary (count + total)
     POST   /api/cart/items/        - Add item to cart
+    POST   /api/cart/items/batch/  - Add many items in one transaction
     PATCH  /api/cart/items/{id}/   - Update item quantity
     DELETE /api/cart/items/{id}/   - Remove item from cart
 
@@ -25,7 +26,13 @@ Django URL docs: https://docs.djangoproject.com/en/5.0/topics/http/urls/
 
 from django.urls import path
 
-from .views import CartItemDetailView, CartItemListView, CartSummaryView, CartView
+from .views import (
+    CartItemBatchView,
+    CartItemDetailView,
+    CartItemListView,
+    CartSummaryView,
+    CartView,
+)
 
 # App namespace for URL reversing: reverse('cart:cart')
 app_name = "cart"
@@ -37,6 +44,8 @@ urlpatterns = [
     path("summary/", CartSummaryView.as_view(), name="cart-summary"),
     # Add items to cart (POST)
     path("items/", CartItemListView.as_view(), name="cart-items"),
+    # Add many items at once (POST)
+    path("items/batch/", CartItemBatchView.as_view(), name="cart-items-batch"),
     # Update (PATCH) or remove (DELETE) a specific cart item
     path(
         "items/<int:pk>/",
@@ -6,16 +6,26 @@ Provides endpoints for shopping cart management:
     DELETE /api/cart/              - Clear entire cart
     GET    /api/cart/summary/      - Lightweight cart summary (count + total)
     POST   /api/cart/items/        - Add item to cart
+    POST   /api/cart/items/batch/  - Add many items in one transaction
     PATCH  /api/cart/items/{id}/   - Update item quantity
     DELETE /api/cart/items/{id}/   - Remove item from cart
 
 All cart endpoints require authentication.
 Cart is created automatically when the first item is added.
 
+Adding or updating an item reserves its quantity for
+CART_RESERVATION_TTL seconds (see cart/reservations.py), so other
+shoppers can't take the same units before checkout.
+
+POST /api/cart/items/ and /api/cart/items/batch/ accept an
+Idempotency-Key header so a retried request doesn't add the quantity
+twice (see orders/idempotency.py).
+
 DRF Views docs: https://www.django-rest-framework.org/api-guide/views/
 """
 
 from django.db import transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import status
@@ -23,14 +33,25 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from orders.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from products.inventory import lock_products
+
 from .models import Cart, CartItem
+from .reservations import (
+    get_reserved_quantities,
+    lock_available_stock,
+    refresh_hold,
+    refresh_holds,
+)
 from .serializers import (
+    CartItemBatchSerializer,
     CartItemCreateSerializer,
     CartItemSerializer,
     CartItemUpdateSerializer,
     CartSerializer,
     CartSummarySerializer,
 )
+from .summary import get_cart_summary, invalidate_cart_summary
 
 
 class CartView(APIView):
@@ -48,6 +69,29 @@ class CartView(APIView):
         cart, created = Cart.objects.get_or_create(user=user)
         return cart
 
+    def get_cart_for_display(self, user):
+        """
+        Load the cart with everything CartSerializer reads, in 2 queries.
+
+        1. The cart, with total_items/total_amount summed by the database
+        2. Its items joined with their products and categories
+           (select_related); category product counts are a stored column
+
+        The query count stays the same however many items the cart holds.
+        """
+        items = CartItem.objects.select_related("product__category").defer(
+            "product__search_vector"
+        )
+        try:
+            return (
+                Cart.objects.with_totals()
+                .prefetch_related(Prefetch("items", queryset=items))
+                .get(user=user)
+            )
+        except Cart.DoesNotExist:
+            # A brand-new cart is empty, so there's nothing to prefetch
+            return self.get_or_create_cart(user)
+
     @extend_schema(
         summary="Get cart",
         description="Retrieve the authenticated user's shopping cart with all items.",
@@ -55,7 +99,7 @@ class CartView(APIView):
     )
     def get(self, request):
         """Return the user's cart with items and totals."""
-        cart = self.get_or_create_cart(request.user)
+        cart = self.get_cart_for_display(request.user)
         serializer = CartSerializer(cart)
         return Response(serializer.data)
 
@@ -89,21 +133,13 @@ class CartSummaryView(APIView):
         responses={200: CartSummarySerializer},
     )
     def get(self, request):
-        """Return cart summary with count and total."""
-        try:
-            cart = Cart.objects.get(user=request.user)
-            data = {
-                "total_items": cart.total_items,
-                "total_amount": cart.total_amount,
-            }
-        except Cart.DoesNotExist:
-            data = {
-                "total_items": 0,
-                "total_amount": "0.00",
-            }
+        """
+        Return cart summary with count and total.
 
-        serializer = CartSummarySerializer(data)
-        return Response(serializer.data)
+        One aggregate query (or none when cached) - items and products are
+        never loaded. See cart/summary.py.
+        """
+        return Response(get_cart_summary(request.user))
 
 
 class CartItemListView(APIView):
@@ -125,12 +161,14 @@ class CartItemListView(APIView):
             "If already in cart, increases quantity."
         ),
         request=CartItemCreateSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={
             201: CartItemSerializer,
             200: CartItemSerializer,
             400: OpenApiResponse(description="Validation error"),
         },
     )
+    @idempotent
     @transaction.atomic
     def post(self, request):
         """Add item to cart or increase quantity if already present."""
@@ -142,31 +180,37 @@ class CartItemListView(APIView):
         product = serializer.validated_data["product"]
         quantity = serializer.validated_data["quantity"]
 
+        # Lock the product and count only stock not held by other carts
+        available = lock_available_stock(cart, product)
+
         # Check if product already in cart
         try:
             cart_item = CartItem.objects.get(cart=cart, product=product)
             # Product already in cart - increase quantity
             new_quantity = cart_item.quantity + quantity
-            if new_quantity > product.inventory_count:
-                return Response(
-                    {
-                        "detail": (
-                            f"Only {product.inventory_count} items available."
-                        )
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-            cart_item.quantity = new_quantity
-            cart_item.save()
             response_status = status.HTTP_200_OK
         except CartItem.DoesNotExist:
+            cart_item = None
+            new_quantity = quantity
+            response_status = status.HTTP_201_CREATED
+
+        if new_quantity > available:
+            return Response(
+                {"detail": f"Only {available} items available."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if cart_item is not None:
+            cart_item.quantity = new_quantity
+            cart_item.save()
+        else:
             # New product - create cart item
             cart_item = CartItem.objects.create(
                 cart=cart,
                 product=product,
                 quantity=quantity,
             )
-            response_status = status.HTTP_201_CREATED
+        refresh_hold(cart_item)
 
         return Response(
             CartItemSerializer(cart_item).data,
@@ -174,6 +218,103 @@ class CartItemListView(APIView):
         )
 
 
+class CartItemBatchView(APIView):
+    """
+    Add many items to the cart in one transaction.
+
+    POST /api/cart/items/batch/
+
+    Each line behaves like POST /api/cart/items/ (quantities add to what is
+    already in the cart), but the whole batch costs a fixed number of
+    queries: one locked product lookup, one reservation sum, one upsert of
+    the cart lines and one of their holds. Either every line is applied or,
+    if any line fails, none is.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Add items to cart in bulk",
+        description=(
+            "Add or increase several products at once (re-order, "
+            "wishlist-to-cart). Errors are reported per line index and "
+            "nothing is saved unless every line is valid."
+        ),
+        request=CartItemBatchSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        responses={
+            200: CartItemSerializer(many=True),
+            400: OpenApiResponse(description="Per-line validation errors"),
+        },
+    )
+    @idempotent
+    @transaction.atomic
+    def post(self, request):
+        """Validate all lines together, then upsert them."""
+        serializer = CartItemBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        lines = serializer.validated_data["items"]
+        product_ids = [line["product_id"] for line in lines]
+
+        cart, _ = Cart.objects.get_or_create(user=request.user)
+
+        # Lock every product in pk order, then count stock held elsewhere
+        products = lock_products(product_ids)
+        held = get_reserved_quantities(product_ids, exclude_cart=cart)
+        in_cart = dict(
+            cart.items.filter(product_id__in=product_ids).values_list(
+                "product_id", "quantity"
+            )
+        )
+
+        errors = {}
+        cart_items = []
+        for index, line in enumerate(lines):
+            product = products.get(line["product_id"])
+            if product is None or not product.is_active:
+                errors[index] = {
+                    "product_id": ["Product not found or unavailable."]
+                }
+                continue
+            if not product.is_in_stock:
+                errors[index] = {"product_id": ["Product is out of stock."]}
+                continue
+
+            available = max(product.inventory_count - held.get(product.pk, 0), 0)
+            quantity = in_cart.get(product.pk, 0) + line["quantity"]
+            if quantity > available:
+                errors[index] = {
+                    "quantity": [f"Only {available} items available."]
+                }
+                continue
+            cart_items.append(
+                CartItem(cart=cart, product=product, quantity=quantity)
+            )
+
+        if errors:
+            return Response(
+                {"items": errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # INSERT ... ON CONFLICT (cart_id, product_id) DO UPDATE
+        CartItem.objects.bulk_create(
+            cart_items,
+            update_conflicts=True,
+            unique_fields=["cart", "product"],
+            update_fields=["quantity", "updated_at"],
+        )
+        saved = list(
+            cart.items.filter(product_id__in=product_ids)
+            .select_related("product__category")
+            .defer("product__search_vector")
+        )
+        refresh_holds(saved)
+        # bulk_create() skips the post_save signal that normally does this
+        invalidate_cart_summary(request.user.pk)
+
+        return Response(CartItemSerializer(saved, many=True).data)
+
+
 class CartItemDetailView(APIView):
     """
     Update or remove a cart item.
@@ -212,8 +353,17 @@ class CartItemDetailView(APIView):
         )
         serializer.is_valid(raise_exception=True)
 
-        cart_item.quantity = serializer.validated_data["quantity"]
+        quantity = serializer.validated_data["quantity"]
+        available = lock_available_stock(cart_item.cart, cart_item.product)
+        if quantity > available:
+            return Response(
+                {"quantity": [f"Only {available} items available."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cart_item.quantity = quantity
         cart_item.save()
+        refresh_hold(cart_item)
 
         return Response(CartItemSerializer(cart_item).data)
 
@@ -3,6 +3,14 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Production serves this with Gunicorn's Uvicorn workers (see Dockerfile.prod):
+
+    gunicorn --worker-class uvicorn.workers.UvicornWorker config.asgi:application
+
+The async views (products/async_views.py, cart/async_views.py) run on the
+event loop; sync DRF views run in a thread. Keep DB_CONN_MAX_AGE=0 under
+ASGI unless a connection pool is configured.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
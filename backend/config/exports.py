@@ -0,0 +1,201 @@
+"""
+Streaming CSV / JSON Lines Exports shared across apps.
+
+Nightly BI dumps of products and orders can be far larger than memory, so
+exports never build the file first. Rows are read with a server-side
+cursor (queryset.iterator(chunk_size=...)) as plain values_list() tuples -
+no model instances - and encoded a block at a time:
+
+    rows (tuples) -> CSV / JSONL text -> bytes -> optional gzip -> output
+
+The same generator feeds a file in the management commands and a
+StreamingHttpResponse in the admin actions.
+
+Used by:
+    - python manage.py export_catalog   (products/exports.py)
+    - python manage.py export_orders    (orders/exports.py)
+    - "Export selected ..." admin actions on products and orders
+
+Note: with a transaction-pooling PgBouncer in front of PostgreSQL, set
+DISABLE_SERVER_SIDE_CURSORS in the database settings; iterator() then
+fetches in chunks from a client-side cursor instead.
+
+Server-side cursors: https://docs.djangoproject.com/en/5.0/ref/databases/#server-side-cursors
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import zlib
+from datetime import date, datetime, time
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+# Rows encoded before a block of bytes is handed on
+ROWS_PER_BLOCK = 500
+
+
+def _plain(value):
+    """Turn dates into ISO 8601 and Decimals into strings."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _encode_csv(fields, rows):
+    """Yield a header line, then the rows as CSV bytes in blocks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for number, row in enumerate(rows, start=1):
+        writer.writerow([_plain(value) for value in row])
+        if number % ROWS_PER_BLOCK == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _encode_jsonl(fields, rows):
+    """Yield the rows as one JSON object per line, in blocks."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(fields, map(_plain, row)))))
+        if len(lines) == ROWS_PER_BLOCK:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def _gzip(blocks):
+    """Compress a stream of byte blocks into one gzip stream."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_queryset(
+    queryset, fields, file_format="csv", compress=False, chunk_size=2000
+):
+    """
+    Stream a queryset as CSV or JSON Lines bytes.
+
+    Args:
+        queryset: Rows to export (give it a stable order_by())
+        fields: values_list() field names; also the CSV header / JSON keys
+        file_format: "csv" or "jsonl"
+        compress: Gzip the output
+        chunk_size: Rows fetched from the database cursor at a time
+
+    Returns:
+        generator: Blocks of bytes
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format {file_format!r}, use csv or jsonl.")
+
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    encode = _encode_csv if file_format == "csv" else _encode_jsonl
+    blocks = encode(fields, rows)
+    return _gzip(blocks) if compress else blocks
+
+
+def get_export_filename(name, file_format="csv", compress=False):
+    """Return e.g. products.csv or orders.jsonl.gz."""
+    return f"{name}.{file_format}" + (".gz" if compress else "")
+
+
+def streaming_export_response(
+    queryset, fields, name, file_format="csv", compress=False
+):
+    """Return a StreamingHttpResponse that downloads the export as a file."""
+    response = StreamingHttpResponse(
+        export_queryset(queryset, fields, file_format, compress),
+        content_type="application/gzip" if compress else CONTENT_TYPES[file_format],
+    )
+    filename = get_export_filename(name, file_format, compress)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def parse_since(value):
+    """
+    Parse a --since value (ISO 8601 date or datetime) for argparse.
+
+    Dates mean midnight; naive values use the project time zone.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise argparse.ArgumentTypeError(
+                f"{value!r} is not an ISO 8601 date or datetime."
+            )
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def add_export_arguments(parser):
+    """Add the options shared by the export management commands."""
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="csv",
+        help="Output format (default csv)",
+    )
+    parser.add_argument(
+        "--gzip", action="store_true", help="Gzip the output"
+    )
+    parser.add_argument(
+        "--since",
+        type=parse_since,
+        help="Only rows updated at or after this ISO 8601 date/datetime",
+    )
+    parser.add_argument(
+        "--output", "-o", help="File to write (default: standard output)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=2000,
+        help="Rows fetched from the database cursor at a time (default 2000)",
+    )
+
+
+def write_export(blocks, path=None):
+    """
+    Write an export to a file, or to standard output when path is None.
+
+    Returns:
+        int: Bytes written
+    """
+    written = 0
+    if path is None:
+        output = sys.stdout.buffer
+        for block in blocks:
+            written += output.write(block)
+        output.flush()
+        return written
+
+    with open(path, "wb") as output:
+        for block in blocks:
+            written += output.write(block)
+    return written
@@ -0,0 +1,236 @@
+"""
+Readiness Probe: GET /api/health/ready/
+
+/api/health/ only proves the process answers HTTP (liveness). This probe
+checks the services a request actually needs, so load balancers and
+Kubernetes readiness probes stop routing traffic to an instance that
+can't serve it:
+
+    database    - SELECT 1 on the default database
+    cache       - Set, read back and delete a key in the default cache
+    migrations  - No unapplied migrations (e.g. a deploy half done)
+    storage     - Media storage accepts a write (uploads and imports)
+
+Response (200 when every check passes, otherwise 503):
+    {
+        "status": "ready",            # or "unavailable"
+        "checks": {
+            "database": {"ok": true, "ms": 1.3},
+            "cache": {"ok": false, "ms": 2000.0, "error": "timeout"},
+            ...
+        }
+    }
+
+How it works:
+    - The checks run in parallel, so the probe takes as long as the
+      slowest check rather than their sum, and never longer than
+      HEALTH_CHECK_TIMEOUT_MS: a check still running then is reported as
+      "timeout" and left to finish in the background
+    - Each check has one long-lived worker thread. While a timed-out
+      check is still stuck (e.g. connecting to an unreachable database),
+      later probes report it as "timeout" again instead of starting
+      another thread and connection attempt, so an outage can't pile
+      them up
+    - On PostgreSQL the database checks also set statement_timeout to
+      HEALTH_CHECK_TIMEOUT_MS; add ?connect_timeout= to DATABASE_URL to
+      bound connection attempts as well
+    - Each worker uses (and closes) its own database connection
+    - Errors are reported by exception class only; the details are
+      logged on the "config.health" logger, not returned to the caller
+    - The result is kept in process memory for HEALTH_CHECK_CACHE_SECONDS,
+      so frequent probes from several load balancers can't become load
+      themselves. It isn't kept in the Django cache, which is one of the
+      things being checked
+
+Configuration (config/settings.py):
+    HEALTH_CHECK_TIMEOUT_MS      - Upper bound for the whole probe
+    HEALTH_CHECK_CACHE_SECONDS   - Reuse a result for this long (0 = never)
+
+Kubernetes probes: https://kubernetes.io/docs/tasks/configure-pod-container/configure-liveness-readiness-startup-probes/
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+
+logger = logging.getLogger(__name__)
+
+# Prefix of the cache keys and media files the checks write
+PROBE_PREFIX = "health-ready"
+
+
+def limit_statement_time(connection):
+    """Cancel this connection's queries after HEALTH_CHECK_TIMEOUT_MS."""
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SET statement_timeout = %s", [settings.HEALTH_CHECK_TIMEOUT_MS]
+            )
+
+
+def check_database():
+    """Run SELECT 1 on the default database."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    limit_statement_time(connection)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+def check_cache():
+    """Write a key to the default cache and read it back."""
+    key = f"{PROBE_PREFIX}:{uuid.uuid4().hex}"
+    token = uuid.uuid4().hex
+    cache.set(key, token, timeout=30)
+    try:
+        if cache.get(key) != token:
+            raise RuntimeError("Cache did not return the value just written.")
+    finally:
+        cache.delete(key)
+
+
+def check_migrations():
+    """Fail if the default database has unapplied migrations."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    limit_statement_time(connection)
+    executor = MigrationExecutor(connection)
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        raise RuntimeError(f"{len(plan)} unapplied migrations.")
+
+
+def check_storage():
+    """Save and delete a small file in the media storage."""
+    name = default_storage.save(
+        f"{PROBE_PREFIX}/{uuid.uuid4().hex}.txt", ContentFile(b"ok")
+    )
+    default_storage.delete(name)
+
+
+CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "migrations": check_migrations,
+    "storage": check_storage,
+}
+
+
+def run_check(name, check):
+    """
+    Run one check on the current (pool) thread.
+
+    Returns:
+        dict: {"ok": bool, "ms": float} plus "error" on failure
+    """
+    started = time.perf_counter()
+    try:
+        check()
+        result = {"ok": True}
+    except Exception as exc:
+        logger.warning("Readiness check %s failed", name, exc_info=True)
+        result = {"ok": False, "error": type(exc).__name__}
+    finally:
+        # Connections are per thread; don't leave this one open
+        connections.close_all()
+    result["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+# One single-worker pool per check, reused by every probe, and the
+# check's latest run
+_workers = {}
+_running = {}
+_workers_lock = threading.Lock()
+
+
+def submit_check(name, check):
+    """
+    Start a check on its worker, unless its previous run is still going.
+
+    Returns:
+        Future: The new run, or the unfinished earlier one
+    """
+    with _workers_lock:
+        future = _running.get(name)
+        if future is not None and not future.done():
+            return future
+        if name not in _workers:
+            _workers[name] = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"{PROBE_PREFIX}-{name}"
+            )
+        future = _running[name] = _workers[name].submit(run_check, name, check)
+        return future
+
+
+def run_checks(checks=None, timeout_ms=None):
+    """
+    Run the checks in parallel, waiting at most timeout_ms for all of them.
+
+    Returns:
+        dict: Check name -> run_check() result; checks still running at
+            the deadline are reported with the error "timeout"
+    """
+    checks = CHECKS if checks is None else checks
+    if timeout_ms is None:
+        timeout_ms = settings.HEALTH_CHECK_TIMEOUT_MS
+
+    futures = {name: submit_check(name, check) for name, check in checks.items()}
+    wait(futures.values(), timeout=timeout_ms / 1000)
+
+    results = {}
+    for name, future in futures.items():
+        if future.done():
+            results[name] = future.result()
+        else:
+            logger.warning("Readiness check %s timed out", name)
+            results[name] = {"ok": False, "ms": float(timeout_ms), "error": "timeout"}
+    return results
+
+
+_cached = {"expires": 0.0, "results": None}
+_cached_lock = threading.Lock()
+
+
+def get_readiness():
+    """
+    Check results, reused for HEALTH_CHECK_CACHE_SECONDS.
+
+    The lock also means concurrent probes share one run instead of each
+    starting their own.
+    """
+    with _cached_lock:
+        now = time.monotonic()
+        if _cached["results"] is None or now >= _cached["expires"]:
+            _cached["results"] = run_checks()
+            _cached["expires"] = now + settings.HEALTH_CHECK_CACHE_SECONDS
+        return _cached["results"]
+
+
+def clear_readiness_cache():
+    """Forget the cached result (the next probe runs the checks)."""
+    with _cached_lock:
+        _cached["results"] = None
+
+
+@never_cache
+@require_safe
+def readiness_check(request):
+    """GET /api/health/ready/ (200 ready, 503 unavailable)."""
+    checks = get_readiness()
+    ready = all(result["ok"] for result in checks.values())
+    return JsonResponse(
+        {"status": "ready" if ready else "unavailable", "checks": checks},
+        status=200 if ready else 503,
+    )
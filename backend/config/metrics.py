@@ -0,0 +1,200 @@
+"""
+Prometheus Metrics: GET /api/metrics/
+
+Exposes the application's own metrics in the Prometheus text format, for
+a Prometheus server (or any compatible agent) to scrape:
+
+    http_request_duration_seconds{view, action, method, status}
+        Histogram of request latency per view class (or function) and
+        DRF action ("list", "retrieve", "featured", ...; the HTTP method
+        for plain views)
+    db_queries_per_request{view, action}
+        Histogram of SQL queries per request
+    cache_lookups_total{cache, result}
+        Catalog response cache and cart summary cache hits and misses;
+        hit ratio = rate(hit) / rate(hit + miss)
+    checkouts_total{outcome}
+        Checkout attempts: created, invalid, empty_cart, unavailable,
+        out_of_stock
+
+How it works:
+    - MetricsMiddleware times every request and counts its queries with
+      config.timing.record_queries(); the view and action labels come
+      from the resolved view, so cardinality stays bounded (unmatched
+      URLs are labelled "none")
+    - Cache and checkout code record their outcomes with
+      record_cache_lookup() and record_checkout()
+    - Metrics live in process memory (prometheus_client). Gunicorn runs
+      several workers, so with PROMETHEUS_MULTIPROC_DIR set each worker
+      writes its values to mmap-backed files in that directory, and
+      /api/metrics/ merges the files of every worker. The directory must
+      be emptied before the server starts (see Dockerfile.prod). Only
+      counters and histograms are used, so files of exited workers stay
+      valid and need no cleanup hook
+
+Like config/timing.py the middleware works under WSGI and ASGI, so it
+doesn't force async views through a thread. The ORM calls of async views
+run in sync_to_async threads, on those threads' connections;
+record_queries() follows the request's context into them, so their
+queries are counted too.
+
+Configuration (config/settings.py):
+    METRICS_TOKEN              - If set, scrapes must send
+                                 "Authorization: Bearer <token>"
+    PROMETHEUS_MULTIPROC_DIR   - Environment variable; shared directory
+                                 for multi-worker servers (unset = one
+                                 process, metrics kept in memory)
+
+prometheus_client docs: https://prometheus.github.io/client_python/
+"""
+
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_safe
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from config.timing import record_queries
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by view and action",
+    ["view", "action", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request",
+    "SQL queries per request by view and action",
+    ["view", "action"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups",
+    "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"],
+)
+CHECKOUTS = Counter(
+    "checkouts",
+    "Checkout attempts by outcome",
+    ["outcome"],
+)
+
+
+def record_cache_lookup(cache_name, hit):
+    """Count one lookup in a named cache ("catalog", "cart_summary")."""
+    CACHE_LOOKUPS.labels(cache=cache_name, result="hit" if hit else "miss").inc()
+
+
+def record_checkout(outcome):
+    """Count one checkout attempt by its outcome."""
+    CHECKOUTS.labels(outcome=outcome).inc()
+
+
+def get_view_labels(view_func, method):
+    """
+    Label values identifying a resolved view.
+
+    Returns:
+        tuple: (view, action), e.g. ("ProductViewSet", "featured"),
+            ("OrderListCreateView", "post") or ("health_check", "get")
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    name = view_class.__name__ if view_class else view_func.__name__
+    actions = getattr(view_func, "actions", None) or {}
+    return name, actions.get(method.lower(), method.lower())
+
+
+class QueryCounter:
+    """execute_wrapper that only counts queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """
+    Record each request's latency and query count by view and action.
+
+    Works under WSGI and ASGI. The labels come from request.resolver_match
+    once the response is ready, so no process_view() hook is needed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with record_queries(QueryCounter()) as queries:
+            response = self.get_response(request)
+        return self.observe(request, response, started, queries)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with record_queries(QueryCounter()) as queries:
+            response = await self.get_response(request)
+        return self.observe(request, response, started, queries)
+
+    def observe(self, request, response, started, queries):
+        """Record the finished request in the histograms."""
+        elapsed = time.perf_counter() - started
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            view, action = "none", request.method.lower()
+        else:
+            view, action = get_view_labels(match.func, request.method)
+
+        REQUEST_LATENCY.labels(
+            view=view,
+            action=action,
+            method=request.method,
+            status=response.status_code,
+        ).observe(elapsed)
+        DB_QUERIES.labels(view=view, action=action).observe(queries.count)
+        return response
+
+
+def get_registry():
+    """The registry to expose: merged across workers in multiprocess mode."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+@require_safe
+def metrics_view(request):
+    """GET /api/metrics/ (Prometheus text format)."""
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
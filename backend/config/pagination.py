@@ -0,0 +1,380 @@
+"""
+Pagination Classes shared across apps.
+
+PageNumberPagination (the project default) issues OFFSET n plus a COUNT(*)
+over the filtered set on every request, so deep pages get slower the further
+a client scrolls. Keyset pagination instead remembers the last row seen and
+asks for "rows after this one", which is an index range scan no matter how
+deep the page is.
+
+Classes:
+    - KeysetPagination: Opaque-cursor keyset pagination for any queryset
+      ordered by a single model field, with 'id' as the tie-breaker
+    - PageNumberOrKeysetPagination: Page numbers by default, keyset when the
+      client sends ?cursor= (used by ProductViewSet)
+
+Functions:
+    - apaginate_queryset: Page-number pagination with the async ORM, for
+      the async views in products/async_views.py
+
+Usage:
+    GET /api/products/?cursor=               -> First keyset page
+    GET /api/products/?cursor=<token>        -> Following page (from "next")
+    GET /api/products/?cursor=&count=true    -> Also include the total count
+    GET /api/products/?cursor=&ordering=price -> Works with every ordering field
+    GET /api/products/?search=lamp&cursor=   -> Relevance isn't a column, so
+                                                search pages follow the
+                                                default ordering instead
+
+Response shape (keyset):
+    {
+        "next": "http://.../api/products/?cursor=eyJv...",
+        "previous": null,
+        "results": [...]
+    }
+
+DRF Pagination docs: https://www.django-rest-framework.org/api-guide/pagination/
+"""
+
+import base64
+import binascii
+import json
+import math
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Decoded cursor contents:
+#   ordering: ordering term the cursor was issued for (e.g. "-price")
+#   value: string form of the ordering field on the boundary row
+#   pk: primary key of the boundary row (tie-breaker)
+#   reverse: True for "previous page" cursors
+Cursor = namedtuple("Cursor", ["ordering", "value", "pk", "reverse"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination with opaque cursors.
+
+    The queryset's first ordering term decides the sort (e.g. "-price" from
+    ?ordering=-price, or the model's default). The primary key is appended
+    as a tie-breaker in the same direction, so rows with equal prices are
+    never skipped or repeated between pages.
+
+    Each page is fetched with:
+        WHERE price > :last_price OR (price = :last_price AND id > :last_id)
+        ORDER BY price, id
+        LIMIT page_size + 1
+
+    The extra row tells us whether a next page exists without a COUNT(*).
+    Clients that need a total can opt in with ?count=true.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    tie_breaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of results and remember the boundary rows."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering, self.field = self.get_ordering(queryset)
+        self.descending = self.ordering.startswith("-")
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor.reverse if cursor else False
+
+        self.count = None
+        if self.wants_count(request):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        if cursor is not None:
+            queryset = queryset.filter(self.get_position_filter(cursor))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        """Wrap results with next/previous links (and count if requested)."""
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        """OpenAPI schema for the keyset response envelope."""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {
+                    "type": "integer",
+                    "description": "Only present with ?count=true",
+                },
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        """Document ?cursor=, ?page_size= and ?count= for the schema."""
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Keyset pagination cursor. Send an empty value for the "
+                    "first page, then follow the next/previous links."
+                ),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Results per page (max {self.max_page_size})",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include the total count (costs a COUNT query)",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+    # -------------------------------------------------------------------------
+    # Ordering
+    # -------------------------------------------------------------------------
+
+    def get_ordering(self, queryset):
+        """
+        Return the (ordering term, model field) pair to paginate on.
+
+        Uses the first explicit order_by() term (set by OrderingFilter) or
+        the model's Meta.ordering. Only concrete model fields can be keyset
+        columns, so leading annotation terms are skipped: a search ordered
+        by ["-search_rank", "-created_at"] pages on created_at and id.
+        Anything else (e.g. an expression or unknown name) is rejected.
+        """
+        ordering = list(queryset.query.order_by) or list(
+            queryset.model._meta.ordering
+        )
+        for term in ordering:
+            if not isinstance(term, str):
+                raise NotFound("Keyset pagination requires a field ordering.")
+            if term.lstrip("-") not in queryset.query.annotations:
+                break
+        else:
+            term = f"-{self.tie_breaker}"
+
+        try:
+            field = queryset.model._meta.get_field(term.lstrip("-"))
+        except FieldDoesNotExist:
+            raise NotFound(f"Keyset pagination cannot order by '{term}'.")
+        return term, field
+
+    def get_order_by(self, reverse):
+        """Return order_by() terms, flipped when paging backwards."""
+        descending = self.descending != reverse
+        prefix = "-" if descending else ""
+        return [f"{prefix}{self.field.name}", f"{prefix}{self.tie_breaker}"]
+
+    def get_position_filter(self, cursor):
+        """Build the "rows after the boundary row" WHERE clause."""
+        descending = self.descending != cursor.reverse
+        op = "lt" if descending else "gt"
+        try:
+            value = self.field.to_python(cursor.value)
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+        return Q(**{f"{self.field.name}__{op}": value}) | Q(
+            **{self.field.name: value, f"{self.tie_breaker}__{op}": cursor.pk}
+        )
+
+    # -------------------------------------------------------------------------
+    # Cursors and links
+    # -------------------------------------------------------------------------
+
+    def decode_cursor(self, request):
+        """Decode ?cursor=; an empty value means "first page"."""
+        encoded = request.query_params.get(self.cursor_query_param, "")
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode("ascii"))
+            data = json.loads(raw)
+            cursor = Cursor(
+                ordering=str(data["o"]),
+                value=data["v"],
+                pk=int(data["p"]),
+                reverse=bool(data.get("r", False)),
+            )
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        # A cursor only makes sense for the ordering it was issued for
+        if cursor.ordering != self.ordering:
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, obj, reverse):
+        """Return a page link whose cursor points at obj."""
+        data = {
+            "o": self.ordering,
+            "v": self.field.value_to_string(obj),
+            "p": getattr(obj, self.tie_breaker),
+        }
+        if reverse:
+            data["r"] = True
+        token = base64.urlsafe_b64encode(
+            json.dumps(data, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def get_next_link(self):
+        """Link to the page after the last row of this page."""
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        """Link to the page before the first row of this page."""
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Paged past the end; the first page is the best we can offer
+            url = self.request.build_absolute_uri()
+            return replace_query_param(url, self.cursor_query_param, "")
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    # -------------------------------------------------------------------------
+    # Query parameters
+    # -------------------------------------------------------------------------
+
+    def get_page_size(self, request):
+        """Read ?page_size=, clamped to [1, max_page_size]."""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def wants_count(self, request):
+        """True when the client asked for the total with ?count=true."""
+        value = request.query_params.get(self.count_query_param, "")
+        return value.lower() in ("true", "1", "yes")
+
+
+class PageNumberOrKeysetPagination(BasePagination):
+    """
+    Page numbers by default, keyset pagination on request.
+
+    Existing clients (the storefront uses ?page=N) keep the familiar
+    {"count", "next", "previous", "results"} response. Clients that send
+    ?cursor= (empty for the first page) switch to KeysetPagination and never
+    pay for OFFSET scans or COUNT(*) on deep pages.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Pick the pagination strategy for this request and delegate."""
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.delegate = KeysetPagination()
+        else:
+            self.delegate = PageNumberPagination()
+        return self.delegate.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        """Delegate to the strategy chosen in paginate_queryset()."""
+        return self.delegate.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        """Document the default (page number) response envelope."""
+        return PageNumberPagination().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        """Document both ?page= and the keyset parameters."""
+        return [
+            *PageNumberPagination().get_schema_operation_parameters(view),
+            *KeysetPagination().get_schema_operation_parameters(view),
+        ]
+
+
+async def apaginate_queryset(queryset, request, page_size=None):
+    """
+    Page-number pagination for async views.
+
+    Same ?page=N parameter and {"count", "next", "previous"} envelope as
+    PageNumberPagination, using acount() and aiterator() for the page.
+
+    Args:
+        queryset: Ordered rows to paginate
+        request: Django HttpRequest (for ?page= and the next/previous links)
+        page_size: Rows per page (default REST_FRAMEWORK["PAGE_SIZE"])
+
+    Returns:
+        tuple: (list of rows, envelope dict without "results"), or None if
+            the requested page doesn't exist
+    """
+    page_size = page_size or api_settings.PAGE_SIZE
+    try:
+        number = int(request.GET.get("page", 1))
+    except ValueError:
+        return None
+
+    count = await queryset.acount()
+    last_page = max(math.ceil(count / page_size), 1)
+    if not 1 <= number <= last_page:
+        return None
+
+    start = (number - 1) * page_size
+    rows = [row async for row in queryset[start : start + page_size].aiterator()]
+
+    url = request.build_absolute_uri()
+    previous = None
+    if number == 2:
+        previous = remove_query_param(url, "page")
+    elif number > 2:
+        previous = replace_query_param(url, "page", number - 1)
+    envelope = {
+        "count": count,
+        "next": (
+            replace_query_param(url, "page", number + 1)
+            if number < last_page
+            else None
+        ),
+        "previous": previous,
+    }
+    return rows, envelope
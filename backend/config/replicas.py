@@ -0,0 +1,147 @@
+"""
+Read Replicas: Route Catalog and Order-History Reads off the Primary.
+
+Browsing the catalog and order history is almost all reads, and it
+shouldn't compete with checkout for the primary. When read replicas are
+configured, ReplicaRouter sends reads of the routed apps (products,
+orders) to a replica and every write to the primary ("default").
+
+Replicas lag the primary slightly, so reads only go to a replica when
+that's safe:
+
+    - Only during GET/HEAD/OPTIONS requests (ReplicaMiddleware turns
+      replica reads on); management commands, shells and signal handlers
+      read the primary unless they opt in with read_from_replicas()
+    - Never inside transaction.atomic() (checkout, SELECT ... FOR UPDATE)
+    - Read-your-writes: after a successful POST/PUT/PATCH/DELETE the
+      response sets a short-lived cookie, and for REPLICA_PIN_SECONDS that
+      client's reads stay on the primary. Clients that don't keep cookies
+      can send "X-Read-Primary: 1" instead
+
+Note: the catalog cache (products/cache.py) may store a response read
+from a replica just after an admin edit; it is then refreshed when the
+cache entry expires (CATALOG_CACHE_TIMEOUT).
+
+Configuration (config/settings.py):
+    DATABASE_REPLICA_URL   - Comma-separated replica URLs (empty = no replicas)
+    DATABASE_REPLICAS      - Replica aliases in DATABASES, built from the URLs
+    REPLICA_ROUTED_APPS    - App labels whose reads may use a replica
+    REPLICA_PIN_SECONDS    - Read-your-writes window after a write
+
+Local testing: point DATABASE_REPLICA_URL at a second database, e.g. a
+copy of the dev database, or at the primary itself to exercise routing.
+
+Multiple databases: https://docs.djangoproject.com/en/5.0/topics/db/multi-db/
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Cookie and request header that keep a client's reads on the primary
+PIN_COOKIE = "read_primary"
+PIN_HEADER = "HTTP_X_READ_PRIMARY"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Whether reads in the current request / task may use a replica
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def read_from_replicas(enabled=True):
+    """Allow (or forbid) replica reads inside the block."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads_enabled():
+    """Return True if reads may currently go to a replica."""
+    return _replica_reads.get()
+
+
+class ReplicaRouter:
+    """Send routed apps' reads to a replica when safe; writes to default."""
+
+    def db_for_read(self, model, **hints):
+        """Pick a random replica, or None to use the default database."""
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or not _replica_reads.get()
+            or model._meta.app_label not in settings.REPLICA_ROUTED_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        """All writes go to the primary."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Replicas hold the same rows as the primary."""
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    Turn replica reads on for safe requests, off after the client writes.
+
+    Works under WSGI and ASGI; the flag lives in a context variable, so
+    concurrent requests never see each other's setting.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with read_from_replicas(self.allows_replica_reads(request)):
+            response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        with read_from_replicas(self.allows_replica_reads(request)):
+            response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def allows_replica_reads(self, request):
+        """Safe methods read replicas unless the client wrote recently."""
+        return (
+            request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+            and request.META.get(PIN_HEADER) != "1"
+        )
+
+    def process_response(self, request, response):
+        """Start the read-your-writes window after a successful write."""
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,53 @@
+"""
+Async-capable WhiteNoise Middleware.
+
+WhiteNoise 6.6 ships a sync-only Django middleware. Under ASGI a single
+sync-only middleware makes Django adapt the chain around it: every
+request then runs in a thread (sync_to_async) and hops back to the event
+loop (async_to_sync) for the middleware and view below it, so the async
+views (products/async_views.py) would hold a thread for their whole run.
+
+AsyncWhiteNoiseMiddleware keeps WhiteNoise's behaviour and settings but
+works in both modes, like the project's own middleware (config/replicas.py,
+config/timing.py, config/metrics.py):
+    - Static file lookups are an in-memory dict lookup (the file index is
+      built at startup), so they run directly on the event loop
+    - With WHITENOISE_AUTOREFRESH (DEBUG) the lookup touches the
+      filesystem, so it runs in a thread instead
+    - Non-static requests are awaited straight through
+
+It relies on WhiteNoiseMiddleware's files/find_file()/serve(), which is
+why whitenoise is pinned in requirements.txt; re-check this class when
+upgrading it.
+
+WhiteNoise docs: https://whitenoise.readthedocs.io/en/latest/django.html
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoiseMiddleware that doesn't force ASGI requests into a thread."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,664 @@
+"""
+Tests for project configuration.
+
+Tests for:
+    - parse_database_url (DATABASE_URL query-string options)
+    - Connection reuse benchmark (persistent vs per-request connections)
+    - Read replica routing and read-your-writes pinning
+    - Request timing middleware (Server-Timing, query budgets)
+    - Async-capable middleware chain (no thread hop under ASGI)
+    - Prometheus metrics (/api/metrics/, view and action labels)
+    - Readiness probe (/api/health/ready/, timeouts, result caching)
+
+Run the connection reuse benchmark (its failure message has the timings):
+    pytest config/tests.py -m slow
+
+pytest-django docs: https://pytest-django.readthedocs.io/
+"""
+
+import statistics
+import threading
+import time
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import close_old_connections, connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils.module_loading import import_string
+from prometheus_client import REGISTRY
+
+from cart.models import Cart
+from config import settings as project_settings
+from config import health, timing
+from config.metrics import MetricsMiddleware, get_view_labels
+from config.replicas import (
+    PIN_COOKIE,
+    ReplicaMiddleware,
+    ReplicaRouter,
+    read_from_replicas,
+    replica_reads_enabled,
+)
+from config.settings import parse_database_url
+from config.static import AsyncWhiteNoiseMiddleware
+from config.timing import SERVER_TIMING_HEADER, QueryRecorder, RequestTimingMiddleware
+from config.urls import health_check
+from orders.models import Order
+from orders.views import OrderListCreateView
+from products.models import Product
+from products.views import ProductViewSet
+
+# =============================================================================
+# parse_database_url
+# =============================================================================
+
+
+class TestParseDatabaseUrl:
+    """DATABASE_URL parsing, including connection reuse options."""
+
+    def test_basic_url(self):
+        """Credentials, host, port and database name are parsed."""
+        config = parse_database_url("postgresql://shop:secret@db:5433/catalog")
+
+        assert config["ENGINE"] == "django.db.backends.postgresql"
+        assert config["USER"] == "shop"
+        assert config["PASSWORD"] == "secret"
+        assert config["HOST"] == "db"
+        assert config["PORT"] == "5433"
+        assert config["NAME"] == "catalog"
+        assert "OPTIONS" not in config
+
+    def test_default_port_and_postgres_scheme(self):
+        """postgres:// works and the port defaults to 5432."""
+        config = parse_database_url("postgres://shop:secret@db/catalog")
+
+        assert config["PORT"] == "5432"
+        assert config["NAME"] == "catalog"
+
+    def test_escaped_password(self):
+        """Percent-encoded characters in the password are decoded."""
+        config = parse_database_url("postgresql://shop:p%40ss%3Aword@db/catalog")
+
+        assert config["PASSWORD"] == "p@ss:word"
+
+    def test_persistent_connections_by_default(self):
+        """Connections are reused for DB_CONN_MAX_AGE seconds, health-checked."""
+        config = parse_database_url("postgresql://shop:secret@db/catalog")
+
+        assert config["CONN_MAX_AGE"] == project_settings.DB_CONN_MAX_AGE
+        assert config["CONN_HEALTH_CHECKS"] is True
+
+    def test_conn_max_age_option(self):
+        """?conn_max_age= and ?conn_health_checks= override the defaults."""
+        config = parse_database_url(
+            "postgresql://shop:secret@db/catalog"
+            "?conn_max_age=0&conn_health_checks=false"
+        )
+
+        assert config["CONN_MAX_AGE"] == 0
+        assert config["CONN_HEALTH_CHECKS"] is False
+
+    def test_driver_options_passed_through(self):
+        """Other options such as sslmode end up in OPTIONS."""
+        config = parse_database_url(
+            "postgresql://shop:secret@db/catalog?sslmode=require&connect_timeout=5"
+        )
+
+        assert config["OPTIONS"] == {"sslmode": "require", "connect_timeout": "5"}
+
+    def test_pool_options_when_pooling_available(self):
+        """Pool options configure the pool and turn off persistent connections."""
+        with mock.patch.object(
+            project_settings, "connection_pooling_available", return_value=True
+        ):
+            config = parse_database_url(
+                "postgresql://shop:secret@db/catalog"
+                "?pool_min=2&pool_max=10&pool_timeout=5&sslmode=require"
+            )
+
+        assert config["OPTIONS"] == {
+            "sslmode": "require",
+            "pool": {"min_size": 2, "max_size": 10, "timeout": 5.0},
+        }
+        assert config["CONN_MAX_AGE"] == 0
+
+    def test_pool_options_fall_back_to_persistent_connections(self):
+        """Without pool support the pool options are dropped."""
+        with mock.patch.object(
+            project_settings, "connection_pooling_available", return_value=False
+        ):
+            config = parse_database_url(
+                "postgresql://shop:secret@db/catalog?pool_min=2&pool_max=10"
+            )
+
+        assert "OPTIONS" not in config
+        assert config["CONN_MAX_AGE"] == project_settings.DB_CONN_MAX_AGE
+
+    def test_sqlite_url(self):
+        """sqlite:/// URLs configure the SQLite backend."""
+        config = parse_database_url("sqlite:////tmp/replica.sqlite3")
+
+        assert config == {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": "/tmp/replica.sqlite3",
+        }
+
+
+# =============================================================================
+# Connection Reuse Benchmark
+# =============================================================================
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestConnectionReuseBenchmark:
+    """Per-request latency with and without persistent connections."""
+
+    REQUESTS = 50
+
+    def time_requests(self, conn_max_age):
+        """
+        Time REQUESTS simulated requests that each run one query.
+
+        close_old_connections() is what Django runs at the start and end of
+        every request; it closes connections older than CONN_MAX_AGE.
+
+        Returns:
+            list: Seconds per request
+        """
+        connection.close()
+        connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+        timings = []
+        for _ in range(self.REQUESTS):
+            started = time.perf_counter()
+            close_old_connections()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            close_old_connections()
+            timings.append(time.perf_counter() - started)
+        connection.close()
+        return timings
+
+    def test_persistent_connections_save_connect_time(self):
+        """Reusing the connection is faster than connecting per request."""
+        if connection.vendor != "postgresql":
+            pytest.skip("Connection setup cost is measured against PostgreSQL")
+
+        original = connection.settings_dict["CONN_MAX_AGE"]
+        try:
+            per_request = statistics.median(self.time_requests(0))
+            persistent = statistics.median(self.time_requests(60))
+        finally:
+            connection.settings_dict["CONN_MAX_AGE"] = original
+
+        assert persistent < per_request, (
+            f"median per request: new connection {per_request * 1000:.2f} ms, "
+            f"persistent {persistent * 1000:.2f} ms"
+        )
+
+
+# =============================================================================
+# Read Replica Routing
+# =============================================================================
+
+
+@pytest.fixture
+def replica(settings):
+    """Configure one replica alias (the router never connects to it here)."""
+    settings.DATABASE_REPLICAS = ["replica"]
+    return "replica"
+
+
+@pytest.mark.usefixtures("replica")
+class TestReplicaRouter:
+    """Reads of catalog and order history go to a replica only when safe."""
+
+    router = ReplicaRouter()
+
+    def test_catalog_and_order_reads_use_replica(self):
+        """Routed apps read from the replica when replica reads are on."""
+        with read_from_replicas():
+            assert self.router.db_for_read(Product) == "replica"
+            assert self.router.db_for_read(Order) == "replica"
+
+    def test_other_apps_read_primary(self):
+        """Apps outside REPLICA_ROUTED_APPS always read the primary."""
+        with read_from_replicas():
+            assert self.router.db_for_read(Cart) is None
+
+    def test_primary_unless_enabled(self):
+        """Commands, shells and writes read the primary by default."""
+        assert replica_reads_enabled() is False
+        assert self.router.db_for_read(Product) is None
+
+    def test_no_replicas_configured(self, settings):
+        """Without replicas everything uses the default database."""
+        settings.DATABASE_REPLICAS = []
+        with read_from_replicas():
+            assert self.router.db_for_read(Product) is None
+
+    @pytest.mark.django_db
+    def test_transactions_read_primary(self):
+        """Reads inside transaction.atomic() stay on the primary."""
+        with read_from_replicas(), transaction.atomic():
+            assert self.router.db_for_read(Product) is None
+
+    def test_writes_use_primary(self):
+        """Writes always go to the default database."""
+        with read_from_replicas():
+            assert self.router.db_for_write(Product) == "default"
+
+
+@pytest.mark.usefixtures("replica")
+class TestReplicaMiddleware:
+    """Safe requests may read replicas; writes pin the client to the primary."""
+
+    factory = RequestFactory()
+
+    def call(self, request, status_code=200):
+        """Run the middleware; return (replica reads enabled, response)."""
+        seen = {}
+
+        def view(request):
+            seen["enabled"] = replica_reads_enabled()
+            return HttpResponse(status=status_code)
+
+        response = ReplicaMiddleware(view)(request)
+        assert replica_reads_enabled() is False
+        return seen["enabled"], response
+
+    def test_get_reads_replica(self):
+        """GET requests read from replicas and set no cookie."""
+        enabled, response = self.call(self.factory.get("/api/products/"))
+
+        assert enabled is True
+        assert PIN_COOKIE not in response.cookies
+
+    def test_write_reads_primary_and_pins(self):
+        """A successful write reads the primary and starts the pin window."""
+        enabled, response = self.call(self.factory.post("/api/orders/"), 201)
+
+        assert enabled is False
+        cookie = response.cookies[PIN_COOKIE]
+        assert cookie["max-age"] == project_settings.REPLICA_PIN_SECONDS
+        assert cookie["httponly"]
+
+    def test_failed_write_does_not_pin(self):
+        """Rejected writes changed nothing, so no pin is needed."""
+        _, response = self.call(self.factory.post("/api/orders/"), 400)
+
+        assert PIN_COOKIE not in response.cookies
+
+    def test_pinned_client_reads_primary(self):
+        """Within the pin window the client's GETs read the primary."""
+        request = self.factory.get("/api/orders/")
+        request.COOKIES[PIN_COOKIE] = "1"
+
+        enabled, _ = self.call(request)
+
+        assert enabled is False
+
+    def test_read_primary_header(self):
+        """X-Read-Primary: 1 also keeps reads on the primary."""
+        request = self.factory.get("/api/orders/", HTTP_X_READ_PRIMARY="1")
+
+        enabled, _ = self.call(request)
+
+        assert enabled is False
+
+
+# =============================================================================
+# Request Timing
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestRequestTimingMiddleware:
+    """SQL counting, Server-Timing header and budget logging."""
+
+    factory = RequestFactory()
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, settings):
+        """Turn the middleware on with generous budgets."""
+        settings.REQUEST_TIMING_ENABLED = True
+        settings.REQUEST_TIME_BUDGET_MS = 10_000
+        settings.REQUEST_QUERY_BUDGET = 10
+        settings.REQUEST_DUPLICATE_QUERY_BUDGET = 1
+        return settings
+
+    def call(self, queries=1):
+        """Run a request whose view repeats SELECT 1 queries times."""
+
+        def view(request):
+            with connection.cursor() as cursor:
+                for _ in range(queries):
+                    cursor.execute("SELECT 1")
+            return HttpResponse("ok")
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = RequestTimingMiddleware(get_response)
+        return middleware(self.factory.get("/api/products/"))
+
+    def test_disabled_by_default(self, settings):
+        """Without REQUEST_TIMING_ENABLED Django skips the middleware."""
+        settings.REQUEST_TIMING_ENABLED = False
+
+        with pytest.raises(MiddlewareNotUsed):
+            RequestTimingMiddleware(lambda request: HttpResponse())
+
+    def test_server_timing_header(self):
+        """db, serialize and total are reported with the query count."""
+        response = self.call(queries=2)
+
+        header = response[SERVER_TIMING_HEADER]
+        assert header.startswith("db;dur=")
+        assert 'desc="2 queries, 1 duplicates"' in header
+        assert "serialize;dur=" in header
+        assert "total;dur=" in header
+
+    def test_query_recorder_counts_duplicates(self):
+        """Only identical SQL with identical parameters is a duplicate."""
+        recorder = QueryRecorder()
+
+        def execute(sql, params, many, context):
+            return None
+
+        for params in [(1,), (1,), (2,)]:
+            recorder(execute, "SELECT %s", params, False, {})
+
+        assert recorder.count == 3
+        assert recorder.duplicates == 1
+        assert recorder.most_repeated() == "SELECT %s"
+
+    def test_within_budget_not_logged(self):
+        """Requests within every budget aren't logged."""
+        with mock.patch.object(timing.logger, "warning") as warning:
+            self.call(queries=1)
+
+        warning.assert_not_called()
+
+    def test_over_budget_logged_with_fields(self):
+        """Over-budget requests are logged with structured fields."""
+        with mock.patch.object(timing.logger, "warning") as warning:
+            self.call(queries=3)
+
+        extra = warning.call_args.kwargs["extra"]
+        assert extra["exceeded"] == "duplicates"
+        assert extra["queries"] == 3
+        assert extra["duplicate_queries"] == 2
+        assert extra["top_duplicate"] == "SELECT 1"
+        assert extra["path"] == "/api/products/"
+        assert extra["status"] == 200
+
+    def test_async_request(self):
+        """Under ASGI the middleware stays async and still counts queries."""
+
+        @sync_to_async
+        def query():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        async def get_response(request):
+            await middleware.process_view(request, None, (), {})
+            await query()
+            return HttpResponse("ok")
+
+        middleware = RequestTimingMiddleware(get_response)
+        response = async_to_sync(middleware)(self.factory.get("/api/products/"))
+
+        assert iscoroutinefunction(middleware)
+        assert 'desc="1 queries, 0 duplicates"' in response[SERVER_TIMING_HEADER]
+        assert "serialize;dur=" in response[SERVER_TIMING_HEADER]
+
+    def test_api_response_has_header(self, client):
+        """The middleware is installed in MIDDLEWARE."""
+        response = client.get("/api/products/")
+
+        assert SERVER_TIMING_HEADER in response
+
+
+# =============================================================================
+# ASGI Middleware Chain
+# =============================================================================
+
+
+class TestAsyncMiddlewareChain:
+    """Async views only stay on the event loop if no middleware is sync-only."""
+
+    def test_every_middleware_is_async_capable(self, settings):
+        """One sync-only middleware would push every ASGI request into a thread."""
+        sync_only = [
+            path
+            for path in settings.MIDDLEWARE
+            if not getattr(import_string(path), "async_capable", False)
+        ]
+
+        assert sync_only == []
+
+    def test_whitenoise_passes_requests_through_async(self):
+        """Non-static requests are awaited without leaving the event loop."""
+
+        async def get_response(request):
+            return HttpResponse("ok")
+
+        middleware = AsyncWhiteNoiseMiddleware(get_response)
+        response = async_to_sync(middleware)(RequestFactory().get("/api/health/"))
+
+        assert iscoroutinefunction(middleware)
+        assert response.content == b"ok"
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+
+def get_request_count(view, action):
+    """Requests recorded so far for a view and action (0 if none)."""
+    value = REGISTRY.get_sample_value(
+        "http_request_duration_seconds_count",
+        {"view": view, "action": action, "method": "GET", "status": "200"},
+    )
+    return value or 0
+
+
+def get_query_sum(view, action):
+    """Queries recorded so far for a view and action (0 if none)."""
+    value = REGISTRY.get_sample_value(
+        "db_queries_per_request_sum", {"view": view, "action": action}
+    )
+    return value or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    """MetricsMiddleware labels and the /api/metrics/ endpoint."""
+
+    def test_request_recorded_by_view_and_action(self, client):
+        """DRF requests are labelled with the ViewSet and its action."""
+        before = get_request_count("ProductViewSet", "featured")
+
+        client.get("/api/products/featured/")
+
+        assert get_request_count("ProductViewSet", "featured") == before + 1
+
+    def test_view_labels(self):
+        """Function views use their name and the method as the action."""
+        viewset = ProductViewSet.as_view({"get": "list"})
+
+        assert get_view_labels(viewset, "GET") == ("ProductViewSet", "list")
+        assert get_view_labels(OrderListCreateView.as_view(), "POST") == (
+            "OrderListCreateView",
+            "post",
+        )
+        assert get_view_labels(health_check, "GET") == ("health_check", "get")
+
+    def test_async_request_recorded(self):
+        """Under ASGI the middleware stays async and labels the view."""
+
+        async def get_response(request):
+            request.resolver_match = resolve("/api/health/")
+            return HttpResponse("ok")
+
+        middleware = MetricsMiddleware(get_response)
+        before = get_request_count("health_check", "get")
+
+        async_to_sync(middleware)(RequestFactory().get("/api/health/"))
+
+        assert iscoroutinefunction(middleware)
+        assert get_request_count("health_check", "get") == before + 1
+
+    def test_async_request_queries_counted(self):
+        """ORM calls run in sync_to_async threads count for the request."""
+
+        @sync_to_async
+        def query():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        async def get_response(request):
+            request.resolver_match = resolve("/api/health/")
+            await query()
+            return HttpResponse("ok")
+
+        middleware = MetricsMiddleware(get_response)
+        before = get_query_sum("health_check", "get")
+
+        async_to_sync(middleware)(RequestFactory().get("/api/health/"))
+
+        assert get_query_sum("health_check", "get") == before + 1
+
+    def test_endpoint_serves_text_format(self, client):
+        """The scrape output includes the request metrics."""
+        client.get("/api/health/")
+
+        response = client.get("/api/metrics/")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+        body = response.content.decode()
+        assert 'http_request_duration_seconds_count{action="get"' in body
+        assert "db_queries_per_request_bucket" in body
+
+    def test_token_required_when_set(self, client, settings):
+        """With METRICS_TOKEN set, scrapes need the Bearer token."""
+        settings.METRICS_TOKEN = "scrape-secret"
+
+        denied = client.get("/api/metrics/")
+        allowed = client.get(
+            "/api/metrics/", HTTP_AUTHORIZATION="Bearer scrape-secret"
+        )
+
+        assert denied.status_code == 401
+        assert allowed.status_code == 200
+
+
+# =============================================================================
+# Readiness Probe
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestReadinessCheck:
+    """Parallel dependency checks behind /api/health/ready/."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_result(self, settings, tmp_path):
+        """Start every test without a cached result, with scratch media."""
+        settings.MEDIA_ROOT = tmp_path
+        health.clear_readiness_cache()
+        yield
+        health.clear_readiness_cache()
+
+    def test_ready(self, client):
+        """Every check passes against the test database and cache."""
+        response = client.get("/api/health/ready/")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert set(data["checks"]) == {"database", "cache", "migrations", "storage"}
+        assert all(check["ok"] for check in data["checks"].values())
+
+    def test_failing_check_returns_503(self, client):
+        """A failed check makes the instance unavailable, without details."""
+
+        def check_database():
+            raise ConnectionError("could not connect to db.internal:5432")
+
+        with mock.patch.dict(health.CHECKS, {"database": check_database}):
+            response = client.get("/api/health/ready/")
+
+        assert response.status_code == 503
+        data = response.json()
+        assert data["status"] == "unavailable"
+        assert data["checks"]["database"] == {
+            "ok": False,
+            "error": "ConnectionError",
+            "ms": data["checks"]["database"]["ms"],
+        }
+        assert data["checks"]["cache"]["ok"] is True
+
+    def test_slow_check_times_out(self):
+        """The probe returns at the deadline, reporting the slow check."""
+        released = threading.Event()
+
+        def check_slow():
+            released.wait(5)
+
+        started = time.perf_counter()
+        try:
+            results = health.run_checks({"slow": check_slow}, timeout_ms=100)
+        finally:
+            released.set()
+
+        assert time.perf_counter() - started < 1
+        assert results["slow"]["error"] == "timeout"
+
+    def test_stuck_check_not_restarted(self):
+        """While a check is stuck, later probes don't start another run."""
+        released = threading.Event()
+        calls = []
+
+        def check_stuck():
+            calls.append(1)
+            released.wait(5)
+
+        try:
+            first = health.run_checks({"stuck": check_stuck}, timeout_ms=50)
+            second = health.run_checks({"stuck": check_stuck}, timeout_ms=50)
+        finally:
+            released.set()
+
+        assert first["stuck"]["error"] == second["stuck"]["error"] == "timeout"
+        assert len(calls) == 1
+
+    def test_result_cached(self, client, settings):
+        """Probes within HEALTH_CHECK_CACHE_SECONDS reuse the last result."""
+        settings.HEALTH_CHECK_CACHE_SECONDS = 60
+
+        with mock.patch.object(
+            health, "run_checks", wraps=health.run_checks
+        ) as run_checks:
+            client.get("/api/health/ready/")
+            client.get("/api/health/ready/")
+
+        assert run_checks.call_count == 1
+
+    def test_liveness_skips_dependencies(self, client):
+        """/api/health/ stays healthy even when a dependency is down."""
+
+        def check_database():
+            raise ConnectionError
+
+        with mock.patch.dict(health.CHECKS, {"database": check_database}):
+            response = client.get("/api/health/")
+
+        assert response.status_code == 200
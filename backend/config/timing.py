@@ -0,0 +1,262 @@
+"""
+Request Timing: Where Each Request Spends Its Time.
+
+When REQUEST_TIMING_ENABLED is on, every response carries a Server-Timing
+header splitting the request into database and Python time:
+
+    Server-Timing: db;dur=12.4;desc="9 queries, 3 duplicates",
+                   serialize;dur=5.1, total;dur=21.0
+
+Browsers show it in the network panel's Timing tab, and load-testing
+tools can record it per request.
+
+How it works:
+    - While a request runs, every query passes through its QueryRecorder
+      (a connection.execute_wrapper()). It counts queries, adds up their
+      time and counts duplicates (the same SQL with the same parameters,
+      the usual sign of an N+1)
+    - db is the total SQL time
+    - serialize is the time from the view starting to the response being
+      rendered, minus the SQL run in between: serializers, permission
+      checks and JSON rendering
+    - total is the wall time through this middleware and everything it wraps
+    - Requests over a budget are logged as a warning on the "config.timing"
+      logger, with the numbers as structured fields (see LOGGING)
+
+The middleware works under WSGI and ASGI, so it doesn't force Django to
+run the async views through a thread. Database connections are per
+thread, and under ASGI the ORM calls of async views run in
+sync_to_async threads with their own connections. So the recorder isn't
+installed on the connections directly: every connection gets one
+dispatching execute_wrapper when it is opened (connection_created), and
+the request's recorders are kept in a context variable, which asgiref
+copies into those threads.
+
+Configuration (config/settings.py):
+    REQUEST_TIMING_ENABLED          - Turn the middleware on (default off)
+    REQUEST_TIME_BUDGET_MS          - Log requests slower than this
+    REQUEST_QUERY_BUDGET            - Log requests running more queries
+    REQUEST_DUPLICATE_QUERY_BUDGET  - Log requests repeating more queries
+
+Server-Timing: https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Server-Timing
+Database instrumentation: https://docs.djangoproject.com/en/5.0/topics/db/instrumentation/
+"""
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Characters of the most repeated statement kept in the log record
+LOGGED_SQL_LENGTH = 300
+
+
+class QueryRecorder:
+    """execute_wrapper that counts queries, their time and duplicates."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            # executemany() parameter lists can be huge; only count the SQL
+            self.statements[(sql, None if many else repr(params))] += 1
+
+    @property
+    def duplicates(self):
+        """Queries that repeated an earlier one exactly."""
+        return sum(count - 1 for count in self.statements.values())
+
+    def most_repeated(self):
+        """The most repeated statement's SQL, or "" if nothing repeated."""
+        if not self.statements:
+            return ""
+        (sql, _), count = self.statements.most_common(1)[0]
+        return sql[:LOGGED_SQL_LENGTH] if count > 1 else ""
+
+
+class RequestTiming:
+    """Timing state of one request (stored on it as request.timing)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = QueryRecorder()
+        self.view_started = None
+        self.db_seconds_before_view = 0.0
+
+    def mark_view_start(self):
+        """Remember when the view started and how much SQL ran before it."""
+        self.view_started = time.perf_counter()
+        self.db_seconds_before_view = self.queries.seconds
+
+    def breakdown(self):
+        """
+        Split the request so far into its parts.
+
+        Returns:
+            dict: db_ms, serialize_ms and total_ms
+        """
+        now = time.perf_counter()
+        serialize = 0.0
+        if self.view_started is not None:
+            view_db = self.queries.seconds - self.db_seconds_before_view
+            serialize = max(now - self.view_started - view_db, 0.0)
+        return {
+            "db_ms": round(self.queries.seconds * 1000, 1),
+            "serialize_ms": round(serialize * 1000, 1),
+            "total_ms": round((now - self.started) * 1000, 1),
+        }
+
+
+def format_server_timing(breakdown, queries):
+    """Server-Timing header value for a request's breakdown."""
+    return (
+        f'db;dur={breakdown["db_ms"]};desc="{queries.count} queries, '
+        f'{queries.duplicates} duplicates", '
+        f'serialize;dur={breakdown["serialize_ms"]}, '
+        f'total;dur={breakdown["total_ms"]}'
+    )
+
+
+def get_exceeded_budgets(breakdown, queries):
+    """Names of the budgets the request went over."""
+    exceeded = []
+    if breakdown["total_ms"] > settings.REQUEST_TIME_BUDGET_MS:
+        exceeded.append("time")
+    if queries.count > settings.REQUEST_QUERY_BUDGET:
+        exceeded.append("queries")
+    if queries.duplicates > settings.REQUEST_DUPLICATE_QUERY_BUDGET:
+        exceeded.append("duplicates")
+    return exceeded
+
+
+# The recorders of the request running in this context. asgiref copies
+# the context into sync_to_async threads, so the ORM calls of async views
+# see their request's recorders even though they use another thread's
+# connection objects
+_active_recorders = ContextVar("active_query_recorders", default=())
+
+
+def run_recorders(execute, sql, params, many, context):
+    """execute_wrapper passing each query through the active recorders."""
+    for recorder in reversed(_active_recorders.get()):
+        execute = partial(recorder, execute)
+    return execute(sql, params, many, context)
+
+
+def install_run_recorders(connection):
+    """Add run_recorders() to a connection's execute_wrappers once."""
+    if run_recorders not in connection.execute_wrappers:
+        connection.execute_wrappers.append(run_recorders)
+
+
+@receiver(connection_created)
+def install_on_new_connection(sender, connection, **kwargs):
+    """Cover connections opened later, in whichever thread opens them."""
+    install_run_recorders(connection)
+
+
+@contextmanager
+def record_queries(recorder):
+    """Pass the queries run in this context through recorder."""
+    for connection in connections.all(initialized_only=True):
+        install_run_recorders(connection)
+    token = _active_recorders.set(_active_recorders.get() + (recorder,))
+    try:
+        yield recorder
+    finally:
+        _active_recorders.reset(token)
+
+
+class RequestTimingMiddleware:
+    """
+    Count each request's SQL, add a Server-Timing header and log slow ones.
+
+    Place it near the top of MIDDLEWARE so "total" covers the middleware
+    below it. Raises MiddlewareNotUsed (Django then skips it) unless
+    REQUEST_TIMING_ENABLED is set. Works under WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+            # A sync process_view would be run through sync_to_async
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.timing = RequestTiming()
+        with record_queries(request.timing.queries):
+            response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        request.timing = RequestTiming()
+        with record_queries(request.timing.queries):
+            response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        """Add the Server-Timing header and log requests over budget."""
+        timing = request.timing
+        breakdown = timing.breakdown()
+        queries = timing.queries
+        server_timing = format_server_timing(breakdown, queries)
+        if response.has_header(SERVER_TIMING_HEADER):
+            server_timing = f"{response[SERVER_TIMING_HEADER]}, {server_timing}"
+        response[SERVER_TIMING_HEADER] = server_timing
+
+        exceeded = get_exceeded_budgets(breakdown, queries)
+        if exceeded:
+            logger.warning(
+                "%s %s over budget (%s)",
+                request.method,
+                request.path,
+                ", ".join(exceeded),
+                extra={
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": queries.count,
+                    "duplicate_queries": queries.duplicates,
+                    "top_duplicate": queries.most_repeated(),
+                    "exceeded": ",".join(exceeded),
+                    **breakdown,
+                },
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Mark the start of the view (the serialize span starts here)."""
+        request.timing.mark_view_start()
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        """Async process_view(), used when the middleware runs under ASGI."""
+        request.timing.mark_view_start()
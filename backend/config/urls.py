@@ -10,10 +10,14 @@ URL Structure:
     /api/cart/              - Shopping cart endpoints
     /api/orders/            - Order management endpoints
     /api/auth/              - Authentication endpoints (register, login, etc.)
-    /api/health/            - Health check endpoint
+    /api/health/            - Health check endpoint (liveness)
+    /api/health/ready/      - Readiness probe (database, cache, migrations,
+                              media storage; config/health.py)
+    /api/metrics/           - Prometheus metrics (config/metrics.py)
     /api/docs/              - Swagger UI documentation
     /api/redoc/             - ReDoc documentation
     /api/schema/            - OpenAPI schema (JSON/YAML)
+    /api/async/             - Async versions of the hot read endpoints (ASGI)
 
 Media Files:
     In development, Django serves uploaded media files.
@@ -36,18 +40,27 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from cart import async_views as cart_async_views
+from config.health import readiness_check
+from config.metrics import metrics_view
+from products import async_views as catalog_async_views
+
 
 def health_check(request):
     """
     Health check endpoint for monitoring and load balancers.
 
     Returns a simple JSON response indicating the service is running.
+    It touches no database or cache, so it stays fast and keeps answering
+    while a dependency is down (restarting the process wouldn't help).
     Used by:
     - Docker health checks
     - Kubernetes liveness probes
-    - Load balancer health checks
     - Monitoring systems
 
+    Load balancers and readiness probes should use /api/health/ready/
+    instead, which also checks the services requests depend on.
+
     Response:
         {
             "status": "healthy",
@@ -84,6 +97,13 @@ urlpatterns = [
     # Simple endpoint to verify the service is running
     # No authentication required
     path("api/health/", health_check, name="health-check"),
+    # Readiness: database, cache, migrations and media storage (503 if not)
+    path("api/health/ready/", readiness_check, name="readiness-check"),
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+    # Prometheus scrape target (Bearer METRICS_TOKEN when set)
+    path("api/metrics/", metrics_view, name="metrics"),
     # -------------------------------------------------------------------------
     # API Documentation (drf-spectacular)
     # -------------------------------------------------------------------------
@@ -115,6 +135,36 @@ urlpatterns = [
     path("api/orders/", include("orders.urls")),
     # Users App: /api/auth/
     path("api/auth/", include("users.urls")),
+    # -------------------------------------------------------------------------
+    # Async Read Endpoints
+    # -------------------------------------------------------------------------
+    # Same payloads as the DRF endpoints, served on the event loop under
+    # ASGI (see products/async_views.py)
+    path(
+        "api/async/products/",
+        catalog_async_views.product_list,
+        name="async-product-list",
+    ),
+    path(
+        "api/async/products/featured/",
+        catalog_async_views.featured_products,
+        name="async-product-featured",
+    ),
+    path(
+        "api/async/products/<slug:slug>/",
+        catalog_async_views.product_detail,
+        name="async-product-detail",
+    ),
+    path(
+        "api/async/categories/",
+        catalog_async_views.category_list,
+        name="async-category-list",
+    ),
+    path(
+        "api/async/cart/summary/",
+        cart_async_views.cart_summary,
+        name="async-cart-summary",
+    ),
 ]
 
 
@@ -11,6 +11,10 @@ Key Features:
 - Actions for status transitions (mark shipped, mark delivered)
 - date_hierarchy for easy navigation by date
 - Read-only price fields (immutable after order creation)
+- Item counts annotated in the changelist query (no per-row queries)
+- Export actions stream the selected orders or their items as CSV
+  (config/exports.py)
+- Status actions touch updated_at so incremental exports pick them up
 
 Django Admin docs: https://docs.djangoproject.com/en/5.0/ref/contrib/admin/
 
@@ -22,8 +26,17 @@ Design Notes:
 """
 
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
 
+from config.exports import streaming_export_response
+
+from .exports import (
+    ORDER_EXPORT_FIELDS,
+    ORDER_ITEM_EXPORT_FIELDS,
+    get_order_export,
+    get_order_item_export,
+)
 from .models import Order, OrderItem
 
 
@@ -162,7 +175,9 @@ class OrderAdmin(admin.ModelAdmin):
         'mark_processing',
         'mark_shipped',
         'mark_delivered',
-        'mark_cancelled'
+        'mark_cancelled',
+        'export_orders_csv',
+        'export_order_items_csv',
     ]
 
     def status_badge(self, obj):
@@ -204,11 +219,23 @@ class OrderAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Status'
     status_badge.admin_order_field = 'status'  # Enable sorting by status
 
+    def get_queryset(self, request):
+        """
+        Annotate item counts for the changelist.
+
+        Without this, item_count_display would run one SUM query per row.
+        """
+        return super().get_queryset(request).with_item_count()
+
     def item_count_display(self, obj):
-        """Display total number of items in order."""
+        """Display total number of items in order (annotation when present)."""
+        annotated = getattr(obj, 'annotated_item_count', None)
+        if annotated is not None:
+            return annotated
         return obj.item_count
 
     item_count_display.short_description = 'Items'
+    item_count_display.admin_order_field = 'annotated_item_count'
 
     def total_amount_display(self, obj):
         """Display order total formatted as currency."""
@@ -222,7 +249,7 @@ class OrderAdmin(admin.ModelAdmin):
         """Bulk update orders to processing status."""
         # Only update orders that are currently pending
         updated = queryset.filter(status=Order.Status.PENDING).update(
-            status=Order.Status.PROCESSING
+            status=Order.Status.PROCESSING, updated_at=timezone.now()
         )
         self.message_user(request, f'{updated} order(s) marked as processing.')
 
@@ -231,7 +258,7 @@ class OrderAdmin(admin.ModelAdmin):
         """Bulk update orders to shipped status."""
         # Only update orders that are currently processing
         updated = queryset.filter(status=Order.Status.PROCESSING).update(
-            status=Order.Status.SHIPPED
+            status=Order.Status.SHIPPED, updated_at=timezone.now()
         )
         self.message_user(request, f'{updated} order(s) marked as shipped.')
 
@@ -240,7 +267,7 @@ class OrderAdmin(admin.ModelAdmin):
         """Bulk update orders to delivered status."""
         # Only update orders that are currently shipped
         updated = queryset.filter(status=Order.Status.SHIPPED).update(
-            status=Order.Status.DELIVERED
+            status=Order.Status.DELIVERED, updated_at=timezone.now()
         )
         self.message_user(request, f'{updated} order(s) marked as delivered.')
 
@@ -251,9 +278,29 @@ class OrderAdmin(admin.ModelAdmin):
         cancellable = queryset.filter(
             status__in=[Order.Status.PENDING, Order.Status.PROCESSING]
         )
-        updated = cancellable.update(status=Order.Status.CANCELLED)
+        updated = cancellable.update(
+            status=Order.Status.CANCELLED, updated_at=timezone.now()
+        )
         self.message_user(request, f'{updated} order(s) cancelled.')
 
+    @admin.action(description='Export selected orders (CSV)')
+    def export_orders_csv(self, request, queryset):
+        """Stream the selected orders as a CSV download."""
+        return streaming_export_response(
+            get_order_export().filter(pk__in=queryset.values('pk')),
+            ORDER_EXPORT_FIELDS,
+            'orders',
+        )
+
+    @admin.action(description='Export items of selected orders (CSV)')
+    def export_order_items_csv(self, request, queryset):
+        """Stream the line items of the selected orders as a CSV download."""
+        return streaming_export_response(
+            get_order_item_export().filter(order__in=queryset.values('pk')),
+            ORDER_ITEM_EXPORT_FIELDS,
+            'order-items',
+        )
+
 
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
@@ -0,0 +1,49 @@
+"""
+Order Export Definitions for BI Dumps.
+
+Columns and querysets used by python manage.py export_orders and the
+"Export selected orders" admin actions. The streaming itself lives in
+config/exports.py.
+
+Incremental exports pass since= to get only orders changed after a point
+in time (updated_at >= since). Order items have no timestamp of their own
+and never change after checkout, so they are selected through their
+order's updated_at. Shipping addresses and notes are left out of the
+dumps on purpose.
+"""
+
+from .models import Order, OrderItem
+
+ORDER_EXPORT_FIELDS = (
+    "id",
+    "user_id",
+    "status",
+    "total_amount",
+    "created_at",
+    "updated_at",
+)
+
+ORDER_ITEM_EXPORT_FIELDS = (
+    "id",
+    "order_id",
+    "product_id",
+    "product__slug",
+    "quantity",
+    "price_at_purchase",
+)
+
+
+def get_order_export(since=None):
+    """Return every order (or those updated since a datetime) by id."""
+    queryset = Order.objects.order_by("pk")
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    return queryset
+
+
+def get_order_item_export(since=None):
+    """Return every order item (or those of recently updated orders) by id."""
+    queryset = OrderItem.objects.order_by("pk")
+    if since is not None:
+        queryset = queryset.filter(order__updated_at__gte=since)
+    return queryset
@@ -0,0 +1,173 @@
+"""
+Idempotency-Key Support for Checkout and Cart Mutations.
+
+Clients that retry a POST after a timeout can't tell whether the first
+attempt went through. By sending the same Idempotency-Key header on every
+attempt, they get the first attempt's response back instead of a second
+order or a doubled cart quantity.
+
+Usage:
+    POST /api/orders/
+    Idempotency-Key: 4f1c9a3e-0d52-4c0b-9a57-2f0a4e3b7c11
+
+    Replayed responses carry "Idempotent-Replayed: true".
+
+How it works:
+    The decorated view runs inside a transaction that first INSERTs an
+    IdempotencyKey row for (user, key). That row is unique, so:
+        - A retry arriving while the first request is still running blocks
+          on the unique index until the first request commits, then reads
+          and replays the stored response - the work never runs twice.
+        - If the first request raises, its transaction (including the key
+          row) rolls back and the retry runs the view itself.
+    5xx responses aren't stored, so the client can retry them.
+
+    Reusing a key for a different method/path/body returns 422. Keys
+    expire after IDEMPOTENCY_KEY_TTL seconds; expired rows are replaced
+    on reuse and purged by: python manage.py purge_idempotency_keys
+
+Requests without the header behave exactly as before.
+
+IETF draft: https://datatracker.ietf.org/doc/draft-ietf-httpapi-idempotency-key-header/
+"""
+
+import functools
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Add to extend_schema(parameters=[...]) on every @idempotent view
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_HEADER,
+    location=OpenApiParameter.HEADER,
+    description=(
+        "Optional client-generated key (e.g. a UUID). Retries with the same "
+        "key return the first response instead of repeating the request."
+    ),
+)
+
+
+def get_fingerprint(request):
+    """Hash the method, path and parsed body of a request."""
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    raw = f"{request.method}|{request.path}|{body}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def replay(record, fingerprint):
+    """Return the stored response for a repeated key."""
+    if record.fingerprint != fingerprint:
+        return Response(
+            {
+                "detail": (
+                    f"{IDEMPOTENCY_HEADER} was already used for a "
+                    "different request."
+                )
+            },
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    response = Response(record.response_body, status=record.response_status)
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def idempotent(view_method):
+    """
+    Make an APIView handler safe to retry with an Idempotency-Key header.
+
+    Apply it above @transaction.atomic so the key row and the view's
+    writes commit (or roll back) together. The handler must require
+    authentication, since keys are stored per user.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+
+        if len(key) > IdempotencyKey._meta.get_field("key").max_length:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} must be at most 255 characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = get_fingerprint(request)
+        now = timezone.now()
+
+        with transaction.atomic():
+            # An expired key may be reused for a new request
+            IdempotencyKey.objects.filter(
+                user=request.user, key=key, expires_at__lte=now
+            ).delete()
+
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user=request.user,
+                        key=key,
+                        fingerprint=fingerprint,
+                        expires_at=now
+                        + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                    )
+            except IntegrityError:
+                # Another request with this key got there first; if it was
+                # still running, the INSERT above waited for it to commit
+                record = IdempotencyKey.objects.get(user=request.user, key=key)
+                return replay(record, fingerprint)
+
+            response = view_method(self, request, *args, **kwargs)
+
+            if response.status_code >= 500:
+                record.delete()
+                return response
+
+            record.response_status = response.status_code
+            record.response_body = (
+                json.loads(JSONRenderer().render(response.data))
+                if response.data is not None
+                else None
+            )
+            record.save(update_fields=["response_status", "response_body"])
+            return response
+
+    return wrapper
+
+
+def purge_expired(batch_size=1000):
+    """
+    Delete expired idempotency keys in batches.
+
+    Args:
+        batch_size: Maximum rows deleted per transaction
+
+    Returns:
+        int: Number of keys deleted
+    """
+    purged = 0
+    now = timezone.now()
+    while True:
+        with transaction.atomic():
+            batch = list(
+                IdempotencyKey.objects.filter(expires_at__lte=now)
+                .order_by("expires_at")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                return purged
+            IdempotencyKey.objects.filter(pk__in=batch).delete()
+        purged += len(batch)
@@ -0,0 +1,38 @@
+"""
+Management command: delete expired Idempotency-Key records.
+
+Expired keys are already ignored and replaced on reuse; this command keeps
+the table small. Run it from cron or a scheduler, e.g. hourly:
+
+    python manage.py purge_idempotency_keys
+    python manage.py purge_idempotency_keys --batch-size 5000
+
+Django management command docs:
+    https://docs.djangoproject.com/en/5.0/howto/custom-management-commands/
+"""
+
+from django.core.management.base import BaseCommand
+
+from orders.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    """Delete expired IdempotencyKey rows in batches."""
+
+    help = "Delete expired Idempotency-Key records in batches."
+
+    def add_arguments(self, parser):
+        """Add the --batch-size option."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Maximum keys deleted per transaction (default 1000)",
+        )
+
+    def handle(self, *args, **options):
+        """Purge expired keys and report how many were deleted."""
+        purged = purge_expired(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {purged} expired idempotency key(s).")
+        )
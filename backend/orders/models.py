@@ -4,6 +4,7 @@ Order Models for E-Commerce Platform.
 This module defines the data models for order management:
 - Order: Container for order items, with status, totals, shipping info
 - OrderItem: Individual item in the order (snapshot of product at purchase)
+- IdempotencyKey: Stored response for a client-supplied Idempotency-Key
 
 Order Lifecycle (Status Workflow):
 1. pending - Order just created, awaiting processing
@@ -31,6 +32,44 @@ from decimal import Decimal
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+
+def get_items_prefetch():
+    """
+    Prefetch for order.items with each product and its category joined in.
+
+    Loads every item of every order in one query, so OrderDetailSerializer
+    (nested products, item_count) doesn't query per item. Usable with
+    prefetch_related() or prefetch_related_objects() on a saved order.
+    """
+    return models.Prefetch(
+        'items',
+        queryset=OrderItem.objects.select_related('product__category').defer(
+            'product__search_vector'
+        ),
+    )
+
+
+class OrderQuerySet(models.QuerySet):
+    """Custom queryset for Order (available as Order.objects.<method>)."""
+
+    def with_items(self):
+        """Prefetch items with products and categories (get_items_prefetch)."""
+        return self.prefetch_related(get_items_prefetch())
+
+    def with_item_count(self):
+        """
+        Annotate each order with 'annotated_item_count'.
+
+        SUM(items.quantity) is computed in the same query as the orders,
+        so listing N orders doesn't run N extra queries through the
+        item_count property. Orders without items get 0, not NULL.
+        """
+        return self.annotate(
+            annotated_item_count=Coalesce(Sum("items__quantity"), 0)
+        )
 
 
 class Order(models.Model):
@@ -55,6 +94,7 @@ class Order(models.Model):
 
     Properties:
         item_count: Total number of items in order (sum of quantities)
+            (use Order.objects.with_item_count() when listing many orders)
 
     Design Notes:
         - total_amount is stored, not calculated, for performance and audit
@@ -107,6 +147,8 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
@@ -116,6 +158,8 @@ class Order(models.Model):
             models.Index(fields=['user', 'status']),
             # Index for admin order management (filter by date)
             models.Index(fields=['-created_at']),
+            # Index for order history keyset pagination (newest first per user)
+            models.Index(fields=['user', '-created_at', '-id']),
         ]
 
     def __str__(self) -> str:
@@ -127,6 +171,9 @@ class Order(models.Model):
         """
         Total number of items in order (considering quantities).
 
+        Runs a query per order unless items are prefetched; querysets from
+        Order.objects.with_item_count() carry the sum as an annotation.
+
         Returns:
             int: Sum of all order item quantities
         """
@@ -201,3 +248,71 @@ class OrderItem(models.Model):
             Decimal: Total value for this order item
         """
         return self.price_at_purchase * self.quantity
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored outcome of a request sent with an Idempotency-Key header.
+
+    Mobile clients retry checkout and cart requests on timeouts. The first
+    request with a given key runs normally and its response is stored here;
+    retries with the same key get that response back instead of running
+    the transactional work again (see orders/idempotency.py).
+
+    Fields:
+        user: Owner of the key (keys are scoped per user)
+        key: Client-generated key (e.g. a UUID), unique per user
+        fingerprint: Hash of method, path and body; reusing a key for a
+            different request is rejected
+        response_status: HTTP status of the stored response (null only
+            inside the first request's still-uncommitted transaction)
+        response_body: JSON body of the stored response
+        created_at: When the key was first used
+        expires_at: After this, the key may be reused for a new request
+
+    Constraints:
+        - (user, key) is unique. A concurrent retry's INSERT waits on this
+          index until the first request commits, then reads its result.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys',
+        help_text="User who sent the key"
+    )
+    key = models.CharField(
+        max_length=255,
+        help_text="Client-supplied Idempotency-Key header value"
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        help_text="SHA-256 of the request method, path and body"
+    )
+    response_status = models.PositiveSmallIntegerField(
+        null=True,
+        help_text="HTTP status code of the stored response"
+    )
+    response_body = models.JSONField(
+        null=True,
+        help_text="JSON body of the stored response"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(
+        db_index=True,
+        help_text="When the stored response is discarded"
+    )
+
+    class Meta:
+        verbose_name = 'Idempotency Key'
+        verbose_name_plural = 'Idempotency Keys'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'key'],
+                name='unique_idempotency_key_per_user',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return string showing the key and its owner id."""
+        return f"{self.key} (user {self.user_id})"
@@ -70,7 +70,7 @@ class OrderListSerializer(serializers.ModelSerializer):
         - Detail endpoint provides the full picture
     """
 
-    item_count = serializers.IntegerField(read_only=True)
+    item_count = serializers.SerializerMethodField()
     status_display = serializers.CharField(
         source="get_status_display", read_only=True
     )
@@ -89,10 +89,22 @@ class OrderListSerializer(serializers.ModelSerializer):
             "id",
             "status",
             "total_amount",
-            "item_count",
             "created_at",
         ]
 
+    def get_item_count(self, obj) -> int:
+        """
+        Return the item count, preferring the annotation for efficiency.
+
+        Querysets from Order.objects.with_item_count() carry
+        'annotated_item_count' (SUM in the same query). Otherwise falls
+        back to the model property (one query per order).
+        """
+        annotated = getattr(obj, "annotated_item_count", None)
+        if annotated is not None:
+            return annotated
+        return obj.item_count
+
 
 class OrderDetailSerializer(serializers.ModelSerializer):
     """
@@ -103,7 +115,7 @@ class OrderDetailSerializer(serializers.ModelSerializer):
     """
 
     items = OrderItemSerializer(many=True, read_only=True)
-    item_count = serializers.IntegerField(read_only=True)
+    item_count = serializers.SerializerMethodField()
     status_display = serializers.CharField(
         source="get_status_display", read_only=True
     )
@@ -126,11 +138,17 @@ class OrderDetailSerializer(serializers.ModelSerializer):
             "id",
             "status",
             "total_amount",
-            "item_count",
             "created_at",
             "updated_at",
         ]
 
+    def get_item_count(self, obj) -> int:
+        """Return item count, preferring annotation over property."""
+        annotated = getattr(obj, "annotated_item_count", None)
+        if annotated is not None:
+            return annotated
+        return obj.item_count
+
 
 class OrderCreateSerializer(serializers.Serializer):
     """
@@ -8,6 +8,9 @@ Comprehensive tests for:
     - Checkout validation (empty cart, inventory, inactive products)
     - Inventory decrement after checkout
     - Cart cleared after checkout
+    - Set-based inventory decrement and concurrent checkouts (no overselling)
+    - Idempotency-Key replay for checkout, cancel and add-to-cart
+    - Streaming order exports (export_orders, admin export actions)
 
 Testing Strategy:
     - All order endpoints require authentication (test 401 for anonymous)
@@ -20,16 +23,33 @@ Testing Strategy:
 pytest-django docs: https://pytest-django.readthedocs.io/
 """
 
+import csv
+import gzip
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from prometheus_client import REGISTRY
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from cart.models import Cart, CartItem
-from orders.models import Order, OrderItem
+from cart.reservations import refresh_hold
+from orders.admin import OrderAdmin
+from orders.idempotency import REPLAYED_HEADER
+from orders.models import IdempotencyKey, Order, OrderItem
+from products.cache import get_catalog_version, get_product_version
+from products.inventory import decrement_inventory
 from products.models import Category, Product
 
 User = get_user_model()
@@ -182,6 +202,76 @@ class TestOrderList:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 0  # Other user's orders not visible
 
+    def test_list_orders_keyset_pagination(self, authenticated_client, test_user):
+        """?cursor= paginates order history newest first."""
+        orders = [
+            Order.objects.create(
+                user=test_user,
+                total_amount="10.00",
+                shipping_address="123 Test St",
+            )
+            for _ in range(3)
+        ]
+        url = reverse("orders:order-list")
+
+        response = authenticated_client.get(url, {"cursor": "", "page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        ids = [o["id"] for o in response.data["results"]]
+        assert response.data["next"] is not None
+
+        response = authenticated_client.get(response.data["next"])
+        ids += [o["id"] for o in response.data["results"]]
+        assert response.data["next"] is None
+
+        assert ids == [o.id for o in reversed(orders)]
+
+    def test_list_orders_item_count(
+        self, authenticated_client, existing_order, second_product
+    ):
+        """item_count sums quantities across the order's items."""
+        OrderItem.objects.create(
+            order=existing_order,
+            product=second_product,
+            quantity=3,
+            price_at_purchase="599.99",
+        )
+        url = reverse("orders:order-list")
+        response = authenticated_client.get(url)
+
+        assert response.data[0]["item_count"] == 4
+
+    def test_list_orders_constant_queries(
+        self, authenticated_client, test_user, product
+    ):
+        """Order history costs the same number of queries for 1 or 10 orders."""
+        url = reverse("orders:order-list")
+
+        def create_orders(count):
+            for _ in range(count):
+                order = Order.objects.create(
+                    user=test_user,
+                    total_amount="999.99",
+                    shipping_address="123 Test St",
+                )
+                OrderItem.objects.create(
+                    order=order,
+                    product=product,
+                    quantity=2,
+                    price_at_purchase="999.99",
+                )
+
+        create_orders(1)
+        with CaptureQueriesContext(connection) as one_order:
+            authenticated_client.get(url)
+
+        create_orders(9)
+        with CaptureQueriesContext(connection) as ten_orders:
+            response = authenticated_client.get(url)
+
+        assert len(response.data) == 10
+        assert all(order["item_count"] == 2 for order in response.data)
+        assert len(ten_orders) == len(one_order)
+
     def test_list_orders_unauthenticated(self, api_client):
         """Unauthenticated users cannot list orders."""
         url = reverse("orders:order-list")
@@ -327,6 +417,26 @@ class TestCheckout:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_checkout_outcomes_counted(self, authenticated_client, cart_with_items):
+        """Each checkout attempt is counted in checkouts_total by outcome."""
+
+        def count(outcome):
+            value = REGISTRY.get_sample_value(
+                "checkouts_total", {"outcome": outcome}
+            )
+            return value or 0
+
+        url = reverse("orders:order-list")
+        before = {name: count(name) for name in ["invalid", "created", "empty_cart"]}
+
+        authenticated_client.post(url, {}, format="json")
+        authenticated_client.post(url, {"shipping_address": "1 Main St"}, format="json")
+        authenticated_client.post(url, {"shipping_address": "1 Main St"}, format="json")
+
+        assert count("invalid") == before["invalid"] + 1
+        assert count("created") == before["created"] + 1
+        assert count("empty_cart") == before["empty_cart"] + 1
+
     def test_checkout_insufficient_inventory(
         self, authenticated_client, test_user, product
     ):
@@ -350,6 +460,28 @@ class TestCheckout:
         product.refresh_from_db()
         assert product.inventory_count == 3
 
+    def test_checkout_respects_other_carts_reservations(
+        self, authenticated_client, cart_with_items, second_product
+    ):
+        """Units reserved by another shopper can't be checked out."""
+        rival = User.objects.create_user(
+            email="rival@example.com", password="TestPassword123!"
+        )
+        rival_item = CartItem.objects.create(
+            cart=Cart.objects.create(user=rival),
+            product=second_product,
+            quantity=5,
+        )
+        refresh_hold(rival_item)
+
+        url = reverse("orders:order-list")
+        data = {"shipping_address": "456 Delivery Ave"}
+        response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        second_product.refresh_from_db()
+        assert second_product.inventory_count == 5
+
     def test_checkout_price_snapshot(
         self, authenticated_client, cart_with_items, product
     ):
@@ -374,3 +506,331 @@ class TestCheckout:
         response = api_client.post(url, data, format="json")
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# =============================================================================
+# Inventory Decrement Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestInventoryDecrement:
+    """Test the set-based inventory helpers used by checkout."""
+
+    def test_checkout_decrements_in_one_update(
+        self, authenticated_client, cart_with_items, django_assert_max_num_queries
+    ):
+        """Checkout query count doesn't grow with one UPDATE per line."""
+        url = reverse("orders:order-list")
+        data = {"shipping_address": "456 Delivery Ave"}
+
+        # cart, items, lock, holds, update (with savepoint and release),
+        # stock read for cache invalidation, order, order items, clear cart
+        # (select, reservations, items), items with products and categories
+        # for the response, plus the view's savepoint and release
+        with django_assert_max_num_queries(16):
+            response = authenticated_client.post(url, data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["item_count"] == 3
+
+    def test_stock_change_only_invalidates_changed_products(
+        self, product, second_product
+    ):
+        """Lists are only invalidated when a product sells out."""
+        catalog_version = get_catalog_version()
+        product_version = get_product_version(product.slug)
+        other_version = get_product_version(second_product.slug)
+
+        decrement_inventory({product.id: 2})
+
+        assert get_catalog_version() == catalog_version
+        assert get_product_version(product.slug) != product_version
+        assert get_product_version(second_product.slug) == other_version
+
+        decrement_inventory({second_product.id: 5})
+
+        assert get_catalog_version() != catalog_version
+
+    def test_failed_line_changes_nothing(self, product, second_product):
+        """If one line lacks stock, no product is decremented."""
+        failed = decrement_inventory({product.id: 2, second_product.id: 6})
+
+        assert failed == [second_product.id]
+        product.refresh_from_db()
+        second_product.refresh_from_db()
+        assert product.inventory_count == 10
+        assert second_product.inventory_count == 5
+
+
+# =============================================================================
+# Idempotency-Key Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestIdempotencyKey:
+    """Test Idempotency-Key replay on checkout and cart mutations."""
+
+    def test_retried_checkout_creates_one_order(
+        self, authenticated_client, cart_with_items, product
+    ):
+        """A retry with the same key replays the first order."""
+        url = reverse("orders:order-list")
+        data = {"shipping_address": "456 Delivery Ave"}
+
+        first = authenticated_client.post(
+            url, data, format="json", HTTP_IDEMPOTENCY_KEY="checkout-1"
+        )
+        retry = authenticated_client.post(
+            url, data, format="json", HTTP_IDEMPOTENCY_KEY="checkout-1"
+        )
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry[REPLAYED_HEADER] == "true"
+        assert retry.data["id"] == first.data["id"]
+        assert Order.objects.count() == 1
+        product.refresh_from_db()
+        assert product.inventory_count == 8
+
+    def test_key_reused_for_different_body_is_rejected(
+        self, authenticated_client, cart_with_items
+    ):
+        """The same key with a different payload returns 422."""
+        url = reverse("orders:order-list")
+        authenticated_client.post(
+            url,
+            {"shipping_address": "456 Delivery Ave"},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="checkout-2",
+        )
+
+        response = authenticated_client.post(
+            url,
+            {"shipping_address": "Somewhere else"},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="checkout-2",
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_retried_add_to_cart_does_not_double_quantity(
+        self, authenticated_client, product
+    ):
+        """Retrying add-to-cart with the same key keeps the first quantity."""
+        url = reverse("cart:cart-items")
+        data = {"product_id": product.id, "quantity": 2}
+
+        for _ in range(2):
+            response = authenticated_client.post(
+                url, data, format="json", HTTP_IDEMPOTENCY_KEY="add-1"
+            )
+
+        assert response.data["quantity"] == 2
+        assert CartItem.objects.get(product=product).quantity == 2
+
+    def test_retried_cancel_restores_inventory_once(
+        self, authenticated_client, cart_with_items, product
+    ):
+        """A retried cancel doesn't restore stock twice."""
+        order = authenticated_client.post(
+            reverse("orders:order-list"),
+            {"shipping_address": "456 Delivery Ave"},
+            format="json",
+        ).data
+        url = reverse("orders:order-cancel", kwargs={"pk": order["id"]})
+
+        for _ in range(2):
+            response = authenticated_client.post(
+                url, HTTP_IDEMPOTENCY_KEY="cancel-1"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        product.refresh_from_db()
+        assert product.inventory_count == 10
+
+    def test_keys_are_scoped_per_user(self, api_client, test_user, product):
+        """Two users can use the same key independently."""
+        other = User.objects.create_user(
+            email="other@example.com", password="TestPassword123!"
+        )
+        url = reverse("cart:cart-items")
+        data = {"product_id": product.id, "quantity": 1}
+
+        for user in (test_user, other):
+            api_client.force_authenticate(user=user)
+            response = api_client.post(
+                url, data, format="json", HTTP_IDEMPOTENCY_KEY="shared"
+            )
+            assert REPLAYED_HEADER not in response
+
+        assert IdempotencyKey.objects.filter(key="shared").count() == 2
+
+
+# =============================================================================
+# Order Export Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestOrderExport:
+    """Test streaming order and order item exports."""
+
+    def test_export_orders_csv(self, existing_order, tmp_path):
+        """Orders are written as CSV without shipping addresses."""
+        path = tmp_path / "orders.csv"
+
+        call_command("export_orders", output=str(path))
+
+        rows = list(csv.DictReader(path.open()))
+        assert len(rows) == 1
+        assert rows[0]["id"] == str(existing_order.id)
+        assert rows[0]["total_amount"] == "999.99"
+        assert "shipping_address" not in rows[0]
+
+    def test_export_items_jsonl_gzip(self, existing_order, product, tmp_path):
+        """--items --format jsonl --gzip writes gzipped JSON Lines."""
+        path = tmp_path / "items.jsonl.gz"
+
+        call_command(
+            "export_orders", items=True, format="jsonl", gzip=True,
+            output=str(path),
+        )
+
+        with gzip.open(path, "rt") as stream:
+            rows = [json.loads(line) for line in stream]
+        assert rows == [
+            {
+                "id": existing_order.items.get().id,
+                "order_id": existing_order.id,
+                "product_id": product.id,
+                "product__slug": product.slug,
+                "quantity": 1,
+                "price_at_purchase": "999.99",
+            }
+        ]
+
+    def test_since_includes_admin_status_changes(
+        self, existing_order, tmp_path, rf
+    ):
+        """Admin status actions touch updated_at, so --since picks them up."""
+        since = timezone.now()
+        Order.objects.update(updated_at=since - timedelta(days=1))
+        path = tmp_path / "orders.csv"
+
+        call_command("export_orders", since=since, output=str(path))
+        assert list(csv.DictReader(path.open())) == []
+
+        model_admin = OrderAdmin(Order, None)
+        model_admin.message_user = lambda *args, **kwargs: None
+        model_admin.mark_processing(rf.get("/"), Order.objects.all())
+
+        call_command("export_orders", since=since, output=str(path))
+        rows = list(csv.DictReader(path.open()))
+        assert [row["status"] for row in rows] == ["processing"]
+
+    def test_admin_export_action_streams(self, existing_order, rf):
+        """The admin action returns a streaming CSV download."""
+        model_admin = OrderAdmin(Order, None)
+
+        response = model_admin.export_order_items_csv(
+            rf.get("/"), Order.objects.all()
+        )
+
+        assert response.streaming
+        assert "order-items.csv" in response["Content-Disposition"]
+        content = b"".join(response.streaming_content).decode()
+        assert content.splitlines()[0].startswith("id,order_id,product_id")
+        assert len(content.splitlines()) == 2
+
+
+# =============================================================================
+# Concurrent Checkout Stress Test
+# =============================================================================
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentCheckout:
+    """Parallel checkouts must never sell more than the available stock."""
+
+    def test_parallel_checkouts_never_oversell(self, product, second_product):
+        """12 shoppers race for 5 tablets; exactly 5 checkouts succeed."""
+        if connection.vendor != "postgresql":
+            pytest.skip("Row locking requires PostgreSQL")
+
+        shoppers = []
+        for i in range(12):
+            user = User.objects.create_user(
+                email=f"shopper{i}@example.com", password="TestPassword123!"
+            )
+            cart = Cart.objects.create(user=user)
+            # Alternate line order so lock ordering is exercised
+            lines = [(product, 1), (second_product, 1)]
+            for line_product, quantity in lines[:: 1 if i % 2 else -1]:
+                CartItem.objects.create(
+                    cart=cart, product=line_product, quantity=quantity
+                )
+            shoppers.append(user)
+
+        start = threading.Barrier(len(shoppers))
+
+        def checkout(user):
+            client = APIClient()
+            client.force_authenticate(user=user)
+            start.wait()
+            try:
+                return client.post(
+                    reverse("orders:order-list"),
+                    {"shipping_address": "1 Race St"},
+                    format="json",
+                ).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=len(shoppers)) as pool:
+            status_codes = list(pool.map(checkout, shoppers))
+
+        assert status_codes.count(status.HTTP_201_CREATED) == 5
+        assert status_codes.count(status.HTTP_400_BAD_REQUEST) == 7
+
+        product.refresh_from_db()
+        second_product.refresh_from_db()
+        assert second_product.inventory_count == 0
+        assert product.inventory_count == 5
+        sold = OrderItem.objects.filter(product=second_product).aggregate(
+            total=Sum("quantity")
+        )["total"]
+        assert sold == 5
+
+    def test_concurrent_retries_run_checkout_once(
+        self, test_user, product, second_product
+    ):
+        """Parallel requests with one key wait for and replay the first."""
+        if connection.vendor != "postgresql":
+            pytest.skip("Row locking requires PostgreSQL")
+
+        cart = Cart.objects.create(user=test_user)
+        CartItem.objects.create(cart=cart, product=product, quantity=1)
+        start = threading.Barrier(4)
+
+        def checkout(_):
+            client = APIClient()
+            client.force_authenticate(user=test_user)
+            start.wait()
+            try:
+                return client.post(
+                    reverse("orders:order-list"),
+                    {"shipping_address": "1 Retry Rd"},
+                    format="json",
+                    HTTP_IDEMPOTENCY_KEY="flaky-network",
+                ).data["id"]
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            order_ids = set(pool.map(checkout, range(4)))
+
+        assert len(order_ids) == 1
+        assert Order.objects.count() == 1
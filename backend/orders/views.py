@@ -2,7 +2,8 @@
 Order API Views.
 
 Provides endpoints for order management:
-    GET    /api/orders/         - List user's orders (order history)
+    GET    /api/orders/         - List user's orders (order history;
+                                  ?cursor= for keyset pagination)
     POST   /api/orders/         - Create order (checkout from cart)
     GET    /api/orders/{id}/    - View order details
 
@@ -12,30 +13,50 @@ Users can only view their own orders.
 Checkout Process (POST /api/orders/):
     1. Validate user has items in cart
     2. Validate shipping address is provided
-    3. Validate inventory is available for ALL cart items
-    4. Create Order with calculated total
-    5. Create OrderItems with price snapshots
-    6. Decrement product inventory
+    3. Lock the product rows and validate inventory for ALL cart items
+    4. Decrement product inventory in one conditional UPDATE
+    5. Create Order with calculated total
+    6. Create OrderItems with price snapshots
     7. Clear the cart
     8. Return the created order
 
 The entire checkout is wrapped in @transaction.atomic to ensure
 data consistency - if any step fails, everything is rolled back.
+Row locks (SELECT ... FOR UPDATE, see products/inventory.py) prevent
+two concurrent checkouts from selling the same stock twice.
+
+Checkout and cancel accept an Idempotency-Key header so client retries
+replay the first response instead of repeating the work
+(see orders/idempotency.py).
+
+Each checkout attempt is counted by outcome in the checkouts_total metric
+(see config/metrics.py).
 
 DRF Views docs: https://www.django-rest-framework.org/api-guide/views/
 """
 
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from cart.models import Cart
+from cart.reservations import get_reserved_quantities
+from config.metrics import record_checkout
+from config.pagination import KeysetPagination
+from products.inventory import (
+    decrement_inventory,
+    lock_products,
+    restore_inventory,
+)
 
-from .models import Order, OrderItem
+from .idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from .models import Order, OrderItem, get_items_prefetch
 from .serializers import (
     OrderCreateSerializer,
     OrderDetailSerializer,
@@ -60,14 +81,35 @@ class OrderListCreateView(APIView):
 
     @extend_schema(
         summary="List orders",
-        description="Get the authenticated user's order history.",
+        description=(
+            "Get the authenticated user's order history. Returns a plain "
+            "list by default; send ?cursor= (empty for the first page) for "
+            "keyset pagination with next/previous links."
+        ),
+        parameters=KeysetPagination().get_schema_operation_parameters(None),
         responses={200: OrderListSerializer(many=True)},
     )
     def get(self, request):
-        """Return all orders for the authenticated user, newest first."""
-        orders = Order.objects.filter(user=request.user).order_by(
-            "-created_at"
+        """
+        Return orders for the authenticated user, newest first.
+
+        Without ?cursor= the full history is returned as a list (the
+        original behavior). With ?cursor= the history is paginated with
+        KeysetPagination, served by the (user, -created_at, -id) index.
+        """
+        # item_count is summed in the same query (no per-order N+1)
+        orders = (
+            Order.objects.filter(user=request.user)
+            .with_item_count()
+            .order_by("-created_at", "-id")
         )
+
+        if KeysetPagination.cursor_query_param in request.query_params:
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(orders, request, view=self)
+            serializer = OrderListSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = OrderListSerializer(orders, many=True)
         return Response(serializer.data)
 
@@ -79,11 +121,13 @@ class OrderListCreateView(APIView):
             "decrements inventory, and clears the cart."
         ),
         request=OrderCreateSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={
             201: OrderDetailSerializer,
             400: OpenApiResponse(description="Validation error"),
         },
     )
+    @idempotent
     @transaction.atomic
     def post(self, request):
         """
@@ -92,61 +136,92 @@ class OrderListCreateView(APIView):
         This is the core checkout flow:
         1. Validate input (shipping address)
         2. Get user's cart and validate it has items
-        3. Check inventory for all items
-        4. Create the order and order items
-        5. Decrement product inventory
+        3. Lock the products and check inventory for all items
+        4. Decrement product inventory (one UPDATE for all lines)
+        5. Create the order and order items
         6. Clear the cart
         7. Return the created order
 
         Everything is wrapped in @transaction.atomic so if any step
         fails (e.g., insufficient inventory), the entire operation
-        is rolled back and no data is changed.
+        is rolled back and no data is changed. The product row locks
+        are held until commit, so concurrent checkouts can't oversell.
         """
         # Step 1: Validate input
         serializer = OrderCreateSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        if not serializer.is_valid():
+            record_checkout("invalid")
+            raise ValidationError(serializer.errors)
 
         # Step 2: Get cart and validate it has items
         try:
             cart = Cart.objects.get(user=request.user)
         except Cart.DoesNotExist:
+            record_checkout("empty_cart")
             return Response(
                 {"detail": "Your cart is empty."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        cart_items = cart.items.select_related("product").all()
+        cart_items = list(cart.items.all())
 
-        if not cart_items.exists():
+        if not cart_items:
+            record_checkout("empty_cart")
             return Response(
                 {"detail": "Your cart is empty."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Step 3: Validate inventory for ALL items before creating anything
-        # This prevents partial orders where some items succeed and others fail
+        # Step 3: Lock the products (in id order) and validate inventory for
+        # ALL items against the locked rows before creating anything.
+        # Concurrent checkouts for the same products wait here.
+        # Units held by other shoppers' carts are not available to this one.
+        quantities = {item.product_id: item.quantity for item in cart_items}
+        products = lock_products(quantities)
+        held = get_reserved_quantities(quantities, exclude_cart=cart)
+
         inventory_errors = []
         for item in cart_items:
-            if not item.product.is_active:
+            product = products[item.product_id]
+            available = max(
+                product.inventory_count - held.get(product.pk, 0), 0
+            )
+            if not product.is_active:
                 inventory_errors.append(
-                    f"{item.product.name} is no longer available."
+                    f"{product.name} is no longer available."
                 )
-            elif item.quantity > item.product.inventory_count:
+            elif item.quantity > available:
                 inventory_errors.append(
-                    f"Only {item.product.inventory_count} of "
-                    f"{item.product.name} available "
+                    f"Only {available} of "
+                    f"{product.name} available "
                     f"(requested {item.quantity})."
                 )
 
         if inventory_errors:
+            record_checkout("unavailable")
             return Response(
                 {"detail": inventory_errors},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Step 4: Calculate total and create order
+        # Step 4: Decrement inventory for every line in one conditional
+        # UPDATE; it refuses (and changes nothing) if any line lacks stock
+        failed_ids = decrement_inventory(quantities)
+        if failed_ids:
+            record_checkout("out_of_stock")
+            return Response(
+                {
+                    "detail": [
+                        f"{products[product_id].name} is out of stock."
+                        for product_id in failed_ids
+                    ]
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Step 5: Calculate total and create the order with price snapshots
         total_amount = sum(
-            item.product.price * item.quantity for item in cart_items
+            products[item.product_id].price * item.quantity for item in cart_items
         )
 
         order = Order.objects.create(
@@ -157,28 +232,25 @@ class OrderListCreateView(APIView):
             status=Order.Status.PENDING,
         )
 
-        # Step 5: Create order items with price snapshots and decrement inventory
-        order_items = []
-        for item in cart_items:
-            order_items.append(
+        # Bulk create order items for efficiency
+        OrderItem.objects.bulk_create(
+            [
                 OrderItem(
                     order=order,
-                    product=item.product,
+                    product=products[item.product_id],
                     quantity=item.quantity,
-                    price_at_purchase=item.product.price,
+                    price_at_purchase=products[item.product_id].price,
                 )
-            )
-            # Decrement inventory
-            item.product.inventory_count -= item.quantity
-            item.product.save(update_fields=["inventory_count"])
-
-        # Bulk create order items for efficiency
-        OrderItem.objects.bulk_create(order_items)
+                for item in cart_items
+            ]
+        )
 
-        # Step 6: Clear the cart
+        # Step 6: Clear the cart (also releases its reservations)
         cart.items.all().delete()
 
-        # Step 7: Return the created order
+        # Step 7: Return the created order, its items loaded in one query
+        prefetch_related_objects([order], get_items_prefetch())
+        record_checkout("created")
         return Response(
             OrderDetailSerializer(order).data,
             status=status.HTTP_201_CREATED,
@@ -207,7 +279,9 @@ class OrderDetailView(APIView):
     )
     def get(self, request, pk):
         """Return order details, ensuring it belongs to the authenticated user."""
-        order = get_object_or_404(Order, pk=pk, user=request.user)
+        order = get_object_or_404(
+            Order.objects.with_items(), pk=pk, user=request.user
+        )
         serializer = OrderDetailSerializer(order)
         return Response(serializer.data)
 
@@ -231,12 +305,14 @@ class OrderCancelView(APIView):
             "for all items in the order."
         ),
         request=None,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={
             200: OrderDetailSerializer,
             400: OpenApiResponse(description="Order cannot be cancelled"),
             404: OpenApiResponse(description="Order not found"),
         },
     )
+    @idempotent
     @transaction.atomic
     def post(self, request, pk):
         """
@@ -245,7 +321,10 @@ class OrderCancelView(APIView):
         Only pending orders can be cancelled. Processing/shipped/delivered
         orders require a different workflow (returns, refunds, etc.).
         """
-        order = get_object_or_404(Order, pk=pk, user=request.user)
+        # Lock the order so two concurrent cancels can't both restore stock
+        order = get_object_or_404(
+            Order.objects.select_for_update(), pk=pk, user=request.user
+        )
 
         if order.status != Order.Status.PENDING:
             return Response(
@@ -253,12 +332,16 @@ class OrderCancelView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Restore inventory for each order item
-        for item in order.items.select_related("product").all():
-            item.product.inventory_count += item.quantity
-            item.product.save(update_fields=["inventory_count"])
+        # Restore inventory for all order items in one UPDATE
+        quantities = {}
+        for product_id, quantity in order.items.values_list(
+            "product_id", "quantity"
+        ):
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+        restore_inventory(quantities)
 
         order.status = Order.Status.CANCELLED
         order.save(update_fields=["status", "updated_at"])
 
+        prefetch_related_objects([order], get_items_prefetch())
         return Response(OrderDetailSerializer(order).data)
@@ -11,7 +11,12 @@ Key Features:
   - Filters by category, is_active, featured
   - Search by name, description
   - Bulk actions for activate/deactivate
+  - Bulk actions invalidate the cached catalog responses and touch
+    updated_at (queryset.update() skips the post_save signal and auto_now
+    that normally do this); (de)activation also updates the categories'
+    stored product counts
   - Inline editing for price, inventory, status flags
+  - Export action streams the selected products as CSV (config/exports.py)
 
 Django Admin docs: https://docs.djangoproject.com/en/5.0/ref/contrib/admin/
 
@@ -23,8 +28,14 @@ Design Notes:
 """
 
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
 
+from config.exports import streaming_export_response
+
+from .cache import invalidate_catalog
+from .counts import set_products_active
+from .exports import PRODUCT_EXPORT_FIELDS, get_product_export
 from .models import Category, Product
 
 
@@ -74,13 +85,14 @@ class CategoryAdmin(admin.ModelAdmin):
         """
         Display count of active products in this category.
 
-        Uses the model's product_count property which filters by is_active.
+        Reads the stored active_product_count column (no COUNT per row).
         This gives admins a quick view of category popularity.
         """
-        return obj.product_count
+        return obj.active_product_count
 
-    # Set column header for custom method
+    # Set column header for custom method and allow sorting by it
     product_count.short_description = 'Products'
+    product_count.admin_order_field = 'active_product_count'
 
 
 @admin.register(Product)
@@ -162,7 +174,13 @@ class ProductAdmin(admin.ModelAdmin):
     )
 
     # Custom admin actions for bulk operations
-    actions = ['make_active', 'make_inactive', 'make_featured', 'remove_featured']
+    actions = [
+        'make_active',
+        'make_inactive',
+        'make_featured',
+        'remove_featured',
+        'export_csv',
+    ]
 
     def is_in_stock_display(self, obj):
         """
@@ -186,23 +204,36 @@ class ProductAdmin(admin.ModelAdmin):
     @admin.action(description='Mark selected products as active')
     def make_active(self, request, queryset):
         """Bulk activate selected products."""
-        updated = queryset.update(is_active=True)
+        updated = set_products_active(queryset, True)
+        invalidate_catalog()
         self.message_user(request, f'{updated} product(s) marked as active.')
 
     @admin.action(description='Mark selected products as inactive')
     def make_inactive(self, request, queryset):
         """Bulk deactivate selected products."""
-        updated = queryset.update(is_active=False)
+        updated = set_products_active(queryset, False)
+        invalidate_catalog()
         self.message_user(request, f'{updated} product(s) marked as inactive.')
 
     @admin.action(description='Mark selected products as featured')
     def make_featured(self, request, queryset):
         """Bulk mark products as featured."""
-        updated = queryset.update(featured=True)
+        updated = queryset.update(featured=True, updated_at=timezone.now())
+        invalidate_catalog()
         self.message_user(request, f'{updated} product(s) marked as featured.')
 
     @admin.action(description='Remove featured status from selected products')
     def remove_featured(self, request, queryset):
         """Bulk remove featured status from products."""
-        updated = queryset.update(featured=False)
+        updated = queryset.update(featured=False, updated_at=timezone.now())
+        invalidate_catalog()
         self.message_user(request, f'{updated} product(s) removed from featured.')
+
+    @admin.action(description='Export selected products (CSV)')
+    def export_csv(self, request, queryset):
+        """Stream the selected products as a CSV download."""
+        return streaming_export_response(
+            get_product_export().filter(pk__in=queryset.values('pk')),
+            PRODUCT_EXPORT_FIELDS,
+            'products',
+        )
@@ -23,3 +23,7 @@ class ProductsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "products"
     verbose_name = "Product Catalog"
+
+    def ready(self):
+        """Connect signal handlers and register the catalog cache check."""
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,238 @@
+"""
+Async Views for the Hot Catalog Read Path.
+
+The storefront's busiest reads also have native async versions:
+
+    GET /api/async/products/              -> like GET /api/products/
+    GET /api/async/products/featured/     -> like GET /api/products/featured/
+    GET /api/async/products/{slug}/       -> like GET /api/products/{slug}/
+    GET /api/async/categories/            -> like GET /api/categories/
+    GET /api/async/cart/summary/          -> like GET /api/cart/summary/
+                                             (cart/async_views.py)
+
+Under an ASGI server each request waiting on the database or the cache
+yields the event loop instead of holding a worker, so one process keeps
+many slow requests in flight at once.
+
+How it works:
+    - Rows come from the async ORM (aiterator(), aget(), acount()) with
+      select_related(), then go through the regular DRF serializers. All
+      serialized fields are already loaded, so serializing never queries
+    - Filters (?category=, ?min_price=, ?search=, ...) reuse ProductFilter
+      and ?ordering= accepts ProductViewSet.ordering_fields
+    - Responses share the versioned catalog cache (products/cache.py)
+      through cache.aget()/aset(). The payloads don't depend on the user,
+      so every request can use it
+
+Differences from the DRF endpoints:
+    - Page numbers only (no ?cursor= keyset pagination)
+    - No ETag/Last-Modified or browsable API
+
+DRF 3.14 views are sync-only, which is why these are plain Django views.
+Under WSGI they still work but gain nothing; production serves
+config.asgi:application with Uvicorn workers (see Dockerfile.prod).
+The gain also depends on every middleware in MIDDLEWARE being
+async-capable: a single sync-only one makes Django run each request in a
+thread (WhiteNoise is wrapped for this, see config/static.py), which
+config/tests.py checks.
+Compare both paths under load with python manage.py benchmark_async_catalog.
+
+Django async support: https://docs.djangoproject.com/en/5.0/topics/async/
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from config.metrics import record_cache_lookup
+from config.pagination import apaginate_queryset
+
+from .cache import (
+    CACHE_STATUS_HEADER,
+    aget_catalog_version,
+    aget_product_version,
+    get_request_digest,
+)
+from .filters import ProductFilter
+from .models import Category, Product
+from .search import RANK_ANNOTATION
+from .serializers import (
+    CategorySerializer,
+    ProductDetailSerializer,
+    ProductListSerializer,
+)
+from .views import ProductViewSet
+
+NOT_FOUND = {"detail": "Not found."}
+INVALID_PAGE = {"detail": "Invalid page."}
+
+
+def json_response(data, status=200):
+    """Render serializer data the way the DRF endpoints do."""
+    return JsonResponse(
+        data,
+        status=status,
+        safe=False,
+        encoder=DjangoJSONEncoder,
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+async def cached_catalog_response(request, name, build, product=None, **kwargs):
+    """
+    Serve an async catalog read through the versioned catalog cache.
+
+    Args:
+        request: The request being served
+        name: Cache key segment identifying the endpoint
+        build: Coroutine function (request, **kwargs) returning
+            (status code, data)
+        product: Slug of the product whose stock the response shows; its
+            stock version is then part of the key
+        **kwargs: URL keyword arguments, passed on to build
+
+    Only 200 responses are cached; CATALOG_CACHE_TIMEOUT = 0 disables it.
+    """
+    timeout = getattr(settings, "CATALOG_CACHE_TIMEOUT", 0)
+    if not timeout:
+        status, data = await build(request, **kwargs)
+        return json_response(data, status)
+
+    if product is None:
+        version = await aget_catalog_version()
+    else:
+        version = await aget_product_version(product)
+    key = (
+        f"catalog:v{version}:async:{name}:{get_request_digest(request, kwargs)}"
+    )
+    data = await cache.aget(key)
+    record_cache_lookup("catalog", hit=data is not None)
+    if data is not None:
+        response = json_response(data)
+        response[CACHE_STATUS_HEADER] = "HIT"
+        return response
+
+    status, data = await build(request, **kwargs)
+    response = json_response(data, status)
+    if status == 200:
+        await cache.aset(key, data, timeout)
+        response[CACHE_STATUS_HEADER] = "MISS"
+    return response
+
+
+def get_product_queryset():
+    """Active products with their category joined in (no N+1)."""
+    return Product.objects.filter(is_active=True).select_related("category")
+
+
+def get_ordering(request, searching):
+    """
+    Apply ?ordering= the way ProductOrderingFilter does.
+
+    Unknown fields are ignored; without a valid term the default is newest
+    first, or most relevant first for searches.
+    """
+    terms = [
+        term.strip()
+        for term in request.GET.get("ordering", "").split(",")
+        if term.strip().lstrip("-") in ProductViewSet.ordering_fields
+    ]
+    if terms:
+        return terms
+    if searching:
+        return [f"-{RANK_ANNOTATION}", *ProductViewSet.ordering]
+    return list(ProductViewSet.ordering)
+
+
+async def build_product_list(request):
+    """Filter, order and paginate the product list."""
+    filterset = ProductFilter(
+        request.GET, queryset=get_product_queryset(), request=request
+    )
+    if not filterset.is_valid():
+        errors = filterset.errors.get_json_data()
+        return 400, {
+            field: [error["message"] for error in field_errors]
+            for field, field_errors in errors.items()
+        }
+
+    searching = bool((filterset.form.cleaned_data.get("search") or "").strip())
+    queryset = filterset.qs.order_by(*get_ordering(request, searching))
+    page = await apaginate_queryset(queryset, request)
+    if page is None:
+        return 404, INVALID_PAGE
+
+    products, envelope = page
+    results = ProductListSerializer(
+        products, many=True, context={"request": request}
+    ).data
+    return 200, {**envelope, "results": results}
+
+
+async def build_featured_products(request):
+    """Up to 8 featured products for the homepage."""
+    products = [
+        product
+        async for product in get_product_queryset()
+        .filter(featured=True)[:8]
+        .aiterator()
+    ]
+    return 200, ProductListSerializer(
+        products, many=True, context={"request": request}
+    ).data
+
+
+async def build_product_detail(request, slug):
+    """One active product by slug."""
+    try:
+        product = await get_product_queryset().aget(slug=slug)
+    except Product.DoesNotExist:
+        return 404, NOT_FOUND
+    return 200, ProductDetailSerializer(product, context={"request": request}).data
+
+
+async def build_category_list(request):
+    """Active categories, paginated like the DRF category list."""
+    page = await apaginate_queryset(
+        Category.objects.filter(is_active=True), request
+    )
+    if page is None:
+        return 404, INVALID_PAGE
+
+    categories, envelope = page
+    results = CategorySerializer(
+        categories, many=True, context={"request": request}
+    ).data
+    return 200, {**envelope, "results": results}
+
+
+@require_safe
+async def product_list(request):
+    """GET /api/async/products/"""
+    return await cached_catalog_response(request, "product:list", build_product_list)
+
+
+@require_safe
+async def featured_products(request):
+    """GET /api/async/products/featured/"""
+    return await cached_catalog_response(
+        request, "product:featured", build_featured_products
+    )
+
+
+@require_safe
+async def product_detail(request, slug):
+    """GET /api/async/products/{slug}/"""
+    return await cached_catalog_response(
+        request, "product:retrieve", build_product_detail, product=slug, slug=slug
+    )
+
+
+@require_safe
+async def category_list(request):
+    """GET /api/async/categories/"""
+    return await cached_catalog_response(
+        request, "category:list", build_category_list
+    )
@@ -0,0 +1,231 @@
+"""
+Versioned Response Cache for Anonymous Catalog Reads.
+
+The public catalog endpoints return the same payload to every anonymous
+visitor, so their serialized responses are cached and reused:
+    - GET /api/categories/
+    - GET /api/products/
+    - GET /api/products/{slug}/
+    - GET /api/products/featured/
+    - The async versions of these under /api/async/ (products/async_views.py)
+
+How invalidation works:
+    Every cache key embeds a catalog version number. Any write to Product or
+    Category (post_save/post_delete signals, see products/signals.py) and
+    every admin bulk action bumps the version, so all previously cached
+    responses stop matching at once. Nothing has to be deleted - stale
+    entries simply expire from the cache backend on their own.
+
+Stock changes:
+    Checkout and order cancellation change inventory_count on every order,
+    so they don't bump the catalog version. Product detail responses (the
+    only payloads showing inventory_count) embed a per-product stock
+    version as well, which invalidate_product_stock() resets for just the
+    products whose stock moved. Lists only show is_in_stock, so the whole
+    catalog is invalidated only when a product runs out of stock or comes
+    back (see products/inventory.py).
+
+Key layout:
+    catalog:version                               -> current version (int)
+    catalog:stock:<slug>                          -> stock version (int)
+    catalog:v<version>:<view>:<action>:<digest>   -> cached response data
+    catalog:v<version>.<stock>:product:retrieve:<digest>
+                                                  -> product detail
+    catalog:v<version>:async:<name>:<digest>      -> same, async views
+
+    <digest> is a hash of the host, path kwargs and the sorted query
+    parameters, so ?page=2&ordering=price and ?ordering=price&page=2 share
+    one entry.
+
+Measuring hit rates:
+    Cacheable responses carry an X-Catalog-Cache header (HIT or MISS), which
+    can be counted from access logs or a reverse proxy. Every lookup is also
+    counted in the cache_lookups_total{cache="catalog"} metric (see
+    config/metrics.py).
+
+Configuration (config/settings.py):
+    CACHES["default"]        - Any Django cache backend (locmem, file, Redis)
+    CATALOG_CACHE_TIMEOUT    - Seconds to keep each response (0 disables)
+
+Django cache framework docs: https://docs.djangoproject.com/en/5.0/topics/cache/
+"""
+
+import functools
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from config.metrics import record_cache_lookup
+
+VERSION_KEY = "catalog:version"
+
+# Response header reporting whether a cacheable response was a hit or miss
+CACHE_STATUS_HEADER = "X-Catalog-Cache"
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version, initializing it if missing.
+
+    The initial value is a millisecond timestamp rather than 1: if the
+    cache evicts the version key, the new version can't collide with
+    versions that still have cached responses.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key missing (never set or evicted) - start a fresh version
+        get_catalog_version()
+
+
+def invalidate_catalog():
+    """
+    Bump the catalog version now and again once the transaction commits.
+
+    The immediate bump stops this process serving old responses right away;
+    the second one drops anything another request cached from rows read
+    before the write became visible.
+    """
+    bump_catalog_version()
+    transaction.on_commit(bump_catalog_version)
+
+
+async def aget_catalog_version():
+    """Async version of get_catalog_version() for async views."""
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def get_stock_key(slug):
+    """Cache key holding a product's stock version."""
+    return f"catalog:stock:{slug}"
+
+
+def get_product_version(slug):
+    """
+    Return "<catalog version>.<stock version>" for one product's responses.
+
+    Both versions are read in one cache round trip. A missing stock version
+    starts from a millisecond timestamp, like the catalog version.
+    """
+    stock_key = get_stock_key(slug)
+    versions = cache.get_many([VERSION_KEY, stock_key])
+    catalog_version = versions.get(VERSION_KEY) or get_catalog_version()
+    stock_version = versions.get(stock_key)
+    if stock_version is None:
+        cache.add(stock_key, int(time.time() * 1000), timeout=None)
+        stock_version = cache.get(stock_key)
+    return f"{catalog_version}.{stock_version}"
+
+
+async def aget_product_version(slug):
+    """Async version of get_product_version() for async views."""
+    stock_key = get_stock_key(slug)
+    versions = await cache.aget_many([VERSION_KEY, stock_key])
+    catalog_version = versions.get(VERSION_KEY) or await aget_catalog_version()
+    stock_version = versions.get(stock_key)
+    if stock_version is None:
+        await cache.aadd(stock_key, int(time.time() * 1000), timeout=None)
+        stock_version = await cache.aget(stock_key)
+    return f"{catalog_version}.{stock_version}"
+
+
+def bump_stock_versions(keys):
+    """Invalidate the cached detail responses behind these stock keys."""
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read (or evicted) - the next read starts a fresh version
+            pass
+
+
+def invalidate_product_stock(slugs):
+    """
+    Drop the cached detail responses of the given products only.
+
+    Bumps their stock versions now and again once the transaction commits,
+    like invalidate_catalog().
+    """
+    keys = [get_stock_key(slug) for slug in slugs]
+    if not keys:
+        return
+    bump_stock_versions(keys)
+    transaction.on_commit(lambda: bump_stock_versions(keys))
+
+
+def get_request_digest(request, kwargs):
+    """Hash the host, scheme, path kwargs and sorted query parameters."""
+    params = sorted(
+        (key, value) for key, values in request.GET.lists() for value in values
+    )
+    raw = "|".join(
+        [
+            request.get_host(),
+            request.scheme,
+            urlencode(sorted(kwargs.items())),
+            urlencode(params),
+        ]
+    )
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def get_cache_key(request, view, version):
+    """Build the cache key for a catalog request."""
+    digest = get_request_digest(request, view.kwargs)
+    return f"catalog:v{version}:{view.basename}:{view.action}:{digest}"
+
+
+def cache_catalog_response(view_method):
+    """
+    Cache a ViewSet action's 200 responses for anonymous users.
+
+    Authenticated requests always bypass the cache, as do requests when
+    CATALOG_CACHE_TIMEOUT is 0. Only response.data is stored, so any
+    backend that can pickle plain dicts/lists works. Detail actions of views
+    with cache_by_stock_version = True are also keyed by the product's
+    stock version.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        timeout = getattr(settings, "CATALOG_CACHE_TIMEOUT", 0)
+        if not timeout or request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+
+        if self.detail and getattr(self, "cache_by_stock_version", False):
+            version = get_product_version(kwargs[self.lookup_field])
+        else:
+            version = get_catalog_version()
+        key = get_cache_key(request, self, version)
+        data = cache.get(key)
+        record_cache_lookup("catalog", hit=data is not None)
+        if data is not None:
+            response = Response(data)
+            response[CACHE_STATUS_HEADER] = "HIT"
+            return response
+
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout)
+            response[CACHE_STATUS_HEADER] = "MISS"
+        return response
+
+    return wrapper
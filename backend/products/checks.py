@@ -0,0 +1,55 @@
+"""
+Deployment Checks for the Catalog Cache.
+
+The catalog cache (products/cache.py) invalidates by bumping a version
+number stored in the default cache. With a process-local backend such as
+LocMemCache every server worker has its own copy of that number: a write
+handled by one worker bumps only that worker's version, and the other
+workers keep serving the old responses until CATALOG_CACHE_TIMEOUT runs
+out. Production servers run several workers (see Dockerfile.prod), so
+the cache must be shared between them.
+
+How it works:
+    - The check runs with "manage.py check --deploy", which Dockerfile.prod
+      runs before starting the server, so a deploy with the catalog cache
+      on and a process-local backend fails to start instead of serving
+      stale data
+    - Development (runserver, one process) and tests are not affected
+
+Configuration (config/settings.py):
+    CACHES["default"]        - Set CACHE_BACKEND/CACHE_LOCATION to Redis
+                               (docker-compose.prod.yml does)
+    CATALOG_CACHE_TIMEOUT    - Or set to 0 to turn the catalog cache off
+
+System check framework docs: https://docs.djangoproject.com/en/5.0/topics/checks/
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends whose entries live in the memory of one process
+PROCESS_LOCAL_BACKENDS = {"django.core.cache.backends.locmem.LocMemCache"}
+
+
+def is_cache_shared(alias="default"):
+    """Return True if every server process sees the same cache entries."""
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
+
+
+@register(Tags.caches, deploy=True)
+def check_catalog_cache_backend(app_configs, **kwargs):
+    """Refuse a process-local cache backend while the catalog cache is on."""
+    if not getattr(settings, "CATALOG_CACHE_TIMEOUT", 0) or is_cache_shared():
+        return []
+    return [
+        Error(
+            "The catalog cache is enabled but the default cache backend is "
+            "process-local, so catalog writes only invalidate the worker "
+            "that handled them.",
+            hint=(
+                "Set CACHE_BACKEND and CACHE_LOCATION to a shared backend "
+                "(e.g. Redis), or set CATALOG_CACHE_TIMEOUT=0."
+            ),
+            id="products.E001",
+        )
+    ]
@@ -0,0 +1,161 @@
+"""
+Conditional GET Support (ETag / Last-Modified / 304) for Catalog Endpoints.
+
+Product and category responses carry validators derived from the rows
+behind them, so browsers and proxies can revalidate with If-None-Match or
+If-Modified-Since and get an empty 304 instead of a full payload.
+
+Validators:
+    Lists (GET /api/products/, GET /api/categories/):
+        With a cache backend shared by all workers (products/checks.py):
+            ETag: hash of the request URL and the catalog cache version
+                  (products/cache.py). Every catalog write bumps the
+                  version, so the ETag changes whenever any list could
+                  have changed. No query at all: a cached anonymous read
+                  stays a cache read.
+            No Last-Modified; the version isn't a timestamp.
+        With a process-local backend (locmem) each worker has its own
+        version, so a write handled by another worker would never change
+        it. The validators then come from the database instead:
+            Last-Modified: MAX(updated_at) over the filtered rows (and
+                  their nested category, see list_timestamp_fields)
+            ETag: hash of the request URL, MAX(updated_at) and COUNT(id),
+                  all from one aggregate query.
+
+    Details (GET /api/products/{slug}/, GET /api/categories/{slug}/):
+        Last-Modified: MAX(updated_at) over the row and its related rows
+        ETag: hash of the request URL, MAX(updated_at) and the row count.
+              The count catches related rows being deleted, which doesn't
+              move MAX(updated_at).
+        Both come from one aggregate query on a single-row lookup.
+
+    When the client's validators still match, the view is never called -
+    no serialization, no list query.
+
+Caveat:
+    updated_at is an auto_now field, so it only changes through save().
+    Code that writes with queryset.update() or save(update_fields=[...])
+    must set/include updated_at too (see products/admin.py, orders/views.py).
+    Stored category counts (products/counts.py) do, so a nested
+    product_count change moves the category's updated_at.
+
+HTTP conditional requests: https://developer.mozilla.org/en-US/docs/Web/HTTP/Conditional_requests
+Django helper docs: https://docs.djangoproject.com/en/5.0/ref/utils/#django.utils.cache.get_conditional_response
+"""
+
+import functools
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .cache import get_catalog_version
+from .checks import is_cache_shared
+
+
+def spans_relation(model, field):
+    """True if aggregating field joins another table."""
+    return "__" in field or model._meta.get_field(field).is_relation
+
+
+def get_queryset_state(
+    queryset, timestamp_fields=("updated_at",), count_fields=("id",)
+):
+    """
+    Aggregate the validator inputs for a queryset in one query.
+
+    Args:
+        queryset: Rows the response is built from
+        timestamp_fields: updated_at fields to take the maximum of (related
+            rows via e.g. "products__updated_at")
+        count_fields: Fields to count distinct values of (a relation such as
+            "products" counts the related rows)
+
+    Returns:
+        tuple: (latest timestamp or None, dict of every aggregated value)
+    """
+    # Joined rows repeat the base row, so counts only need DISTINCT then
+    joined = any(
+        spans_relation(queryset.model, field)
+        for field in (*timestamp_fields, *count_fields)
+    )
+    aggregates = {}
+    for field in timestamp_fields:
+        aggregates[f"max_{field}"] = Max(field)
+    for field in count_fields:
+        aggregates[f"count_{field}"] = Count(field, distinct=joined)
+    state = queryset.order_by().aggregate(**aggregates)
+
+    timestamps = [
+        state[f"max_{field}"]
+        for field in timestamp_fields
+        if state[f"max_{field}"] is not None
+    ]
+    return (max(timestamps) if timestamps else None), state
+
+
+def get_list_state(view, request, *args, **kwargs):
+    """
+    Validators for list endpoints (the get_state of a list action).
+
+    Costs a cache read when the catalog version is shared by all workers,
+    otherwise one aggregate over the view's filtered queryset, taking the
+    maximum of view.list_timestamp_fields (default: "updated_at").
+    """
+    if is_cache_shared():
+        return None, {"catalog_version": get_catalog_version()}
+    return get_queryset_state(
+        view.filter_queryset(view.get_queryset()),
+        timestamp_fields=getattr(view, "list_timestamp_fields", ("updated_at",)),
+    )
+
+
+def get_etag(request, state):
+    """Build a strong ETag from the request URL and the aggregated state."""
+    raw = "|".join(
+        [request.get_host(), request.get_full_path()]
+        + [f"{key}={value}" for key, value in sorted(state.items())]
+    )
+    return '"%s"' % hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_catalog_response(get_state):
+    """
+    Add ETag/Last-Modified to a view and answer 304 when they still match.
+
+    Args:
+        get_state: Callable (view, request, *args, **kwargs) returning the
+            (last_modified, state) pair from get_queryset_state()
+
+    Responses also get Cache-Control: no-cache, which lets browsers store
+    them but makes them revalidate before every reuse.
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            last_modified, state = get_state(self, request, *args, **kwargs)
+            etag = get_etag(request, state)
+            timestamp = (
+                timegm(last_modified.utctimetuple()) if last_modified else None
+            )
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            patch_cache_control(response, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,151 @@
+"""
+Stored Active Product Counts for Categories.
+
+Category.active_product_count holds the number of active products in each
+category. Category payloads (the category list and detail, and every
+product, cart and order response that nests a category) read that column
+instead of running a COUNT per category.
+
+How the column stays correct:
+    - Product signals (products/signals.py) apply +1/-1 deltas when a
+      product is created, deleted, activated, deactivated or moved to
+      another category
+    - Admin bulk (de)activation goes through set_products_active(), which
+      applies the deltas for the rows it flips in the same transaction
+    - recount_categories() rebuilds the column from the products table.
+      Run python manage.py recount_categories after writes that bypass
+      signals (raw SQL, bulk_create(), queryset.update() of is_active or
+      category)
+
+Deltas are applied as
+
+    UPDATE products_category
+    SET active_product_count = active_product_count + 1, updated_at = ...
+    WHERE id = ...
+
+so concurrent writers never overwrite each other's changes. updated_at
+moves with the count, so ETags built from it (products/conditional.py)
+change when the nested product_count does.
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Category, Product
+
+# Product fields whose changes can move the stored counts
+COUNTED_FIELDS = frozenset({"category", "category_id", "is_active"})
+
+
+def adjust_product_counts(deltas):
+    """
+    Add deltas to the stored counts.
+
+    Args:
+        deltas: {category_id: change}; zero changes are skipped
+    """
+    for category_id, delta in deltas.items():
+        if delta:
+            Category.objects.filter(pk=category_id).update(
+                active_product_count=F("active_product_count") + delta,
+                updated_at=timezone.now(),
+            )
+
+
+def get_count_deltas(before, after):
+    """
+    Return the count changes for one product going from before to after.
+
+    Args:
+        before: (category_id, is_active) previously stored, or None for a
+            new product
+        after: (category_id, is_active) now stored, or None once deleted
+
+    Returns:
+        Counter: {category_id: change}
+    """
+    deltas = Counter()
+    if before is not None and before[1]:
+        deltas[before[0]] -= 1
+    if after is not None and after[1]:
+        deltas[after[0]] += 1
+    return deltas
+
+
+def set_products_active(queryset, is_active):
+    """
+    Bulk (de)activate products and update their categories' counts.
+
+    Only rows whose flag actually flips move the counts. They are locked
+    first, so a concurrent save can't flip them in between.
+
+    Args:
+        queryset: Products to update
+        is_active: New value of the is_active flag
+
+    Returns:
+        int: Number of products updated
+    """
+    with transaction.atomic():
+        flipping = (
+            queryset.exclude(is_active=is_active)
+            .select_for_update()
+            .order_by("pk")
+            .values_list("category_id", flat=True)
+        )
+        deltas = Counter(flipping)
+        updated = queryset.update(is_active=is_active, updated_at=timezone.now())
+        sign = 1 if is_active else -1
+        adjust_product_counts(
+            {category_id: sign * n for category_id, n in deltas.items()}
+        )
+    return updated
+
+
+def recount_categories(category_ids=None, batch_size=1000):
+    """
+    Recompute stored counts from the products table.
+
+    Each batch is one UPDATE with a correlated COUNT subquery, served by
+    the (category, is_active) index on Product.
+
+    Args:
+        category_ids: Categories to recount; None recounts all of them
+        batch_size: Maximum categories updated per statement
+
+    Returns:
+        int: Number of categories recounted
+    """
+    active = (
+        Product.objects.filter(category=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("category")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    categories = Category.objects.all()
+    if category_ids is not None:
+        categories = categories.filter(pk__in=list(category_ids))
+
+    recounted = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            categories.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not batch:
+            return recounted
+        Category.objects.filter(pk__in=batch).update(
+            active_product_count=Coalesce(
+                Subquery(active, output_field=IntegerField()), 0
+            ),
+            updated_at=timezone.now(),
+        )
+        recounted += len(batch)
+        last_pk = batch[-1]
@@ -0,0 +1,37 @@
+"""
+Product Export Definitions for BI Dumps.
+
+Columns and querysets used by python manage.py export_catalog and the
+"Export selected products" admin action. The streaming itself lives in
+config/exports.py.
+
+Incremental exports pass since= to get only products changed after a
+point in time (updated_at >= since). Stock changes and admin bulk actions
+touch updated_at too (see products/inventory.py, products/admin.py), so
+nothing is missed.
+"""
+
+from .models import Product
+
+PRODUCT_EXPORT_FIELDS = (
+    "id",
+    "slug",
+    "name",
+    "description",
+    "category_id",
+    "category__slug",
+    "price",
+    "inventory_count",
+    "is_active",
+    "featured",
+    "created_at",
+    "updated_at",
+)
+
+
+def get_product_export(since=None):
+    """Return every product (or those updated since a datetime) by id."""
+    queryset = Product.objects.order_by("pk")
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    return queryset
@@ -0,0 +1,174 @@
+"""
+Faceted Search Counts for the Product Listing.
+
+Computes the sidebar counts shown next to each filter option so they always
+match the current ProductFilter state:
+    - Per-category counts
+    - In-stock / out-of-stock counts
+    - Featured count
+    - Price bucket counts
+
+How it works:
+    Every facet is a conditional aggregate, Count("id", filter=Q(...)), and
+    all of them are evaluated in a single SELECT over the product table.
+
+    Each facet ignores its own filter dimension. With ?category=books, the
+    category facet still counts every category (so the user can switch to
+    another one), while the price and stock facets only count books.
+
+Example: /api/products/facets/?category=books&in_stock=true
+    {
+        "total": 12,
+        "categories": [{"slug": "books", "name": "Books", "count": 12}, ...],
+        "in_stock": 12,
+        "out_of_stock": 3,
+        "featured": 2,
+        "price_ranges": [{"min": "0.00", "max": "25.00", "count": 5}, ...]
+    }
+
+Django conditional aggregation docs:
+    https://docs.djangoproject.com/en/5.0/topics/db/aggregation/#filtering-on-annotations
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, Q
+
+# Price bucket edges: [0, 25), [25, 50), ... [500, no upper bound)
+PRICE_BUCKET_EDGES = [
+    Decimal("0.00"),
+    Decimal("25.00"),
+    Decimal("50.00"),
+    Decimal("100.00"),
+    Decimal("250.00"),
+    Decimal("500.00"),
+]
+
+# Filter dimensions that have their own facet
+CATEGORY = "category"
+IN_STOCK = "in_stock"
+FEATURED = "featured"
+PRICE = "price"
+
+
+def get_price_buckets():
+    """Return (min, max) pairs for the price facet; max is None for the last."""
+    upper_edges = PRICE_BUCKET_EDGES[1:] + [None]
+    return list(zip(PRICE_BUCKET_EDGES, upper_edges))
+
+
+def get_dimension_filters(data, category_ids_by_slug):
+    """
+    Translate cleaned ProductFilter data into one Q object per dimension.
+
+    Args:
+        data: ProductFilter form cleaned_data
+        category_ids_by_slug: {slug: id} for active categories
+
+    Returns:
+        dict: {dimension: Q}; dimensions without an active filter are omitted
+    """
+    conditions = {}
+
+    if data.get("category"):
+        category_id = category_ids_by_slug.get(data["category"])
+        # Unknown slug matches nothing, like ?category=<unknown> on the list
+        conditions[CATEGORY] = (
+            Q(category_id=category_id) if category_id else Q(pk__in=[])
+        )
+
+    if data.get("in_stock") is True:
+        conditions[IN_STOCK] = Q(inventory_count__gt=0)
+    elif data.get("in_stock") is False:
+        conditions[IN_STOCK] = Q(inventory_count=0)
+
+    if data.get("featured") is not None:
+        conditions[FEATURED] = Q(featured=data["featured"])
+
+    price = Q()
+    if data.get("min_price") is not None:
+        price &= Q(price__gte=data["min_price"])
+    if data.get("max_price") is not None:
+        price &= Q(price__lte=data["max_price"])
+    if price:
+        conditions[PRICE] = price
+
+    return conditions
+
+
+def compute_facets(queryset, data, categories):
+    """
+    Compute every facet count in one aggregate query.
+
+    Args:
+        queryset: Active products, already narrowed by non-faceted filters
+            (e.g. ?search=)
+        data: ProductFilter form cleaned_data
+        categories: Active categories to report counts for
+
+    Returns:
+        dict: Facet counts (see module docstring for the shape)
+    """
+    conditions = get_dimension_filters(
+        data, {category.slug: category.id for category in categories}
+    )
+
+    def excluding(dimension=None):
+        """AND of every active filter except the given dimension."""
+        combined = Q()
+        for name, condition in conditions.items():
+            if name != dimension:
+                combined &= condition
+        return combined
+
+    price_buckets = get_price_buckets()
+
+    # Aliases are prefixed so none can clash with a Product field: an
+    # aggregate named "featured" next to a featured=... filter makes the
+    # ORM raise FieldError
+    aggregates = {"facet_total": Count("id", filter=excluding())}
+    for category in categories:
+        aggregates[f"facet_category_{category.id}"] = Count(
+            "id", filter=excluding(CATEGORY) & Q(category_id=category.id)
+        )
+    aggregates["facet_in_stock"] = Count(
+        "id", filter=excluding(IN_STOCK) & Q(inventory_count__gt=0)
+    )
+    aggregates["facet_out_of_stock"] = Count(
+        "id", filter=excluding(IN_STOCK) & Q(inventory_count=0)
+    )
+    aggregates["facet_featured"] = Count(
+        "id", filter=excluding(FEATURED) & Q(featured=True)
+    )
+    for index, (low, high) in enumerate(price_buckets):
+        bucket = Q(price__gte=low)
+        if high is not None:
+            bucket &= Q(price__lt=high)
+        aggregates[f"facet_price_{index}"] = Count(
+            "id", filter=excluding(PRICE) & bucket
+        )
+
+    counts = queryset.aggregate(**aggregates)
+
+    return {
+        "total": counts["facet_total"],
+        "categories": [
+            {
+                "slug": category.slug,
+                "name": category.name,
+                "count": counts[f"facet_category_{category.id}"],
+            }
+            for category in categories
+        ],
+        "in_stock": counts["facet_in_stock"],
+        "out_of_stock": counts["facet_out_of_stock"],
+        "featured": counts["facet_featured"],
+        "price_ranges": [
+            {
+                "min": str(low),
+                "max": str(high) if high is not None else None,
+                "count": counts[f"facet_price_{index}"],
+            }
+            for index, (low, high) in enumerate(price_buckets)
+        ],
+    }
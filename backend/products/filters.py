@@ -14,9 +14,10 @@ django-filter docs: https://django-filter.readthedocs.io/
 """
 
 import django_filters
-from django.db.models import Q
+from rest_framework import filters
 
 from .models import Product
+from .search import RANK_ANNOTATION, search_products
 
 
 class ProductFilter(django_filters.FilterSet):
@@ -102,15 +103,32 @@ class ProductFilter(django_filters.FilterSet):
         """
         Full-text search across product name and description.
 
-        Uses case-insensitive contains (icontains) for simple search.
-        For production at scale, consider PostgreSQL full-text search
-        or a dedicated search engine like Elasticsearch.
+        Delegates to products.search.search_products(), which uses the
+        GIN-indexed tsvector column on PostgreSQL (name weighted above
+        description) and falls back to icontains on other databases.
 
-        The Q objects allow combining conditions with OR logic:
-        a product matches if the search term is in the name OR description.
+        Results are annotated with 'search_rank'; ProductOrderingFilter
+        orders by it when no explicit ?ordering= is requested.
         """
         if not value:
             return queryset
-        return queryset.filter(
-            Q(name__icontains=value) | Q(description__icontains=value)
-        )
+        return search_products(queryset, value.strip())
+
+
+class ProductOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that ranks search results by relevance by default.
+
+    Without ?search=, behaves exactly like DRF's OrderingFilter and falls
+    back to the view's default ordering (-created_at). With ?search= and no
+    explicit ?ordering=, the most relevant products come first, using the
+    view's default ordering as the tie-breaker.
+    """
+
+    def get_default_ordering(self, view):
+        """Prefer relevance ordering for search requests."""
+        ordering = super().get_default_ordering(view)
+        request = getattr(view, "request", None)
+        if request is not None and request.query_params.get("search", "").strip():
+            return [f"-{RANK_ANNOTATION}", *(ordering or [])]
+        return ordering
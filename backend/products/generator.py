@@ -0,0 +1,346 @@
+"""
+Synthetic Catalog Generator for Scale Testing.
+
+The fixtures hold a handful of rows, which hides how list, search, facet
+and checkout queries behave at production size. This module fills the
+database with categories, products, users, carts and orders shaped like
+a real store:
+
+    python manage.py generate_catalog --products 1000000
+
+Distributions:
+    - Category sizes are Zipf-like: a few large categories and a long
+      tail of small ones
+    - Each category has its own price band (books are cheap, computers
+      aren't); prices are log-normal around it and end in .99, .49 or .00
+    - Popularity is Zipf-distributed over a random ranking of the active
+      products, so a small set of bestsellers fills most carts and orders
+    - 8% of products are out of stock and 17% have 1-5 units left; 3% are
+      inactive and 1% featured
+    - Orders favour repeat customers (users are Zipf-weighted too) and are
+      mostly delivered, with some pending, processing, shipped and
+      cancelled
+
+How it works:
+    - Rows are built lazily and inserted with bulk_create(), batch_size at
+      a time, each chunk in its own transaction. Only primary keys (and
+      product prices) stay in memory, so 1M products take minutes
+    - Everything comes from random.Random(seed): the same seed and sizes
+      produce the same rows
+    - Weighted picks use random.choices() with precomputed cumulative
+      weights, which is one bisect per pick
+
+Generated rows are recognisable by GENERATED_PREFIX in their slugs and
+emails; delete_generated() removes them again.
+
+bulk_create() skips save() and signals, so afterwards the stored
+category counts are rebuilt (products/counts.py) and the catalog cache
+is invalidated. The search vector is filled by its database trigger.
+"""
+
+import random
+import time
+from decimal import Decimal
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from cart.models import Cart, CartItem
+from orders.models import Order, OrderItem
+
+from .cache import invalidate_catalog
+from .counts import recount_categories
+from .models import Category, Product
+
+User = get_user_model()
+
+# Marks generated slugs and emails
+GENERATED_PREFIX = "gen-"
+
+# Every generated user shares this password (hashed once)
+GENERATED_PASSWORD = "generated-password"
+
+# (category name, median price, product nouns)
+CATEGORY_THEMES = [
+    ("Electronics", 250, ["Headphones", "Speaker", "Camera", "Monitor"]),
+    ("Books", 15, ["Novel", "Cookbook", "Biography", "Atlas"]),
+    ("Home & Kitchen", 40, ["Kettle", "Skillet", "Blender", "Knife Set"]),
+    ("Clothing", 35, ["Jacket", "Sweater", "Jeans", "Sneakers"]),
+    ("Toys", 25, ["Puzzle", "Robot Kit", "Board Game", "Plush Bear"]),
+    ("Sports", 60, ["Yoga Mat", "Dumbbell", "Tennis Racket", "Bike Helmet"]),
+    ("Beauty", 20, ["Face Cream", "Shampoo", "Perfume", "Lipstick"]),
+    ("Garden", 45, ["Hose", "Planter", "Pruner", "Lawn Chair"]),
+    ("Computers", 600, ["Laptop", "Keyboard", "Tablet", "Router"]),
+    ("Grocery", 8, ["Coffee", "Olive Oil", "Tea", "Granola"]),
+    ("Jewelry", 150, ["Necklace", "Ring", "Bracelet", "Watch"]),
+    ("Automotive", 70, ["Car Charger", "Dash Cam", "Seat Cover", "Tire Gauge"]),
+]
+ADJECTIVES = ["Classic", "Compact", "Deluxe", "Eco", "Portable", "Pro", "Smart"]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Novak", "Silva", "Patel"]
+PRICE_ENDINGS = [".99", ".99", ".99", ".49", ".00"]
+
+ORDER_STATUSES = [
+    Order.Status.DELIVERED,
+    Order.Status.CANCELLED,
+    Order.Status.SHIPPED,
+    Order.Status.PENDING,
+    Order.Status.PROCESSING,
+]
+ORDER_STATUS_WEIGHTS = [65, 15, 8, 7, 5]
+
+
+def _chunks(iterable, size):
+    """Yield lists of up to size items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _bulk_create(model, rows, batch_size):
+    """
+    Insert rows chunk by chunk, each chunk in its own transaction.
+
+    Returns:
+        list: Primary keys of the new rows (instances are not kept, so
+            memory stays flat at any scale)
+    """
+    pks = []
+    for chunk in _chunks(rows, batch_size):
+        with transaction.atomic():
+            pks.extend(row.pk for row in model.objects.bulk_create(chunk))
+    return pks
+
+
+def zipf_cum_weights(count, exponent=1.0):
+    """Cumulative weights giving rank r a share proportional to 1/r**exponent."""
+    return list(accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+def generated_rows_exist():
+    """True if an earlier run left generated categories behind."""
+    return Category.objects.filter(slug__startswith=GENERATED_PREFIX).exists()
+
+
+def delete_generated():
+    """
+    Delete every generated user, category and product.
+
+    Goes through the ORM (cascades and signals included), so it's slow for
+    millions of rows; recreating the database is faster.
+    """
+    User.objects.filter(email__startswith=GENERATED_PREFIX).delete()
+    Category.objects.filter(slug__startswith=GENERATED_PREFIX).delete()
+    invalidate_catalog()
+
+
+def generate_catalog(
+    products=10_000,
+    users=1_000,
+    carts=500,
+    orders=5_000,
+    seed=0,
+    batch_size=5_000,
+    log=None,
+):
+    """
+    Create a synthetic catalog and shopping history.
+
+    Args:
+        products: Products to create (one category per ~1000, 10-200)
+        users: Users to create
+        carts: Users (of those) that get a cart
+        orders: Orders to create
+        seed: Random seed; the same seed gives the same data
+        batch_size: Rows per INSERT
+        log: Optional callable(message) for progress lines
+
+    Returns:
+        dict: Rows created per model, plus the total seconds taken
+
+    Raises:
+        ValueError: Carts or orders were requested without users or
+            products to fill them
+    """
+    if (carts or orders) and not (users and products):
+        raise ValueError("Carts and orders need at least one user and product.")
+
+    rng = random.Random(seed)
+    started = time.monotonic()
+    counts = {}
+
+    def record(name, count, step_started):
+        """Store a step's row count and log how long it took."""
+        counts[name] = count
+        if log is not None:
+            seconds = time.monotonic() - step_started
+            log(f"{count} {name} in {seconds:.1f}s")
+
+    # Categories, each with a price band from its theme
+    step_started = time.monotonic()
+    category_count = min(max(products // 1000, 10), 200)
+    themes = [
+        CATEGORY_THEMES[n % len(CATEGORY_THEMES)] for n in range(category_count)
+    ]
+    category_ids = _bulk_create(
+        Category,
+        (
+            Category(
+                # Numbered, so names don't clash with real categories
+                name=f"{name} {n + 1}",
+                slug=f"{GENERATED_PREFIX}category-{n}",
+                description=f"Generated {name.lower()} category.",
+            )
+            for n, (name, _, _) in enumerate(themes)
+        ),
+        batch_size,
+    )
+    medians = [median * rng.uniform(0.7, 1.4) for _, median, _ in themes]
+    record("categories", len(category_ids), step_started)
+
+    # Products: Zipf category sizes, per-category prices, stock-outs
+    step_started = time.monotonic()
+    category_weights = zipf_cum_weights(category_count, 0.9)
+    category_indexes = range(category_count)
+    prices = []
+    active = []
+
+    def product_rows():
+        for n in range(products):
+            index = rng.choices(category_indexes, cum_weights=category_weights)[0]
+            noun = rng.choice(themes[index][2])
+            whole = int(medians[index] * rng.lognormvariate(0, 0.6))
+            price = Decimal(f"{min(whole, 99_998)}{rng.choice(PRICE_ENDINGS)}")
+            if price < 1:
+                price = Decimal("0.99")
+            stock = rng.random()
+            if stock < 0.08:
+                inventory = 0
+            elif stock < 0.25:
+                inventory = rng.randint(1, 5)
+            else:
+                inventory = min(int(rng.expovariate(1 / 80)) + 6, 5_000)
+            is_active = rng.random() >= 0.03
+            prices.append(price)
+            active.append(is_active)
+            yield Product(
+                name=f"{rng.choice(ADJECTIVES)} {noun} {n}",
+                slug=f"{GENERATED_PREFIX}product-{n}",
+                description=f"Generated {noun.lower()} for scale testing.",
+                price=price,
+                category_id=category_ids[index],
+                inventory_count=inventory,
+                is_active=is_active,
+                featured=is_active and rng.random() < 0.01,
+            )
+
+    product_ids = _bulk_create(Product, product_rows(), batch_size)
+    price_by_id = dict(zip(product_ids, prices))
+    record("products", len(product_ids), step_started)
+
+    # Users
+    step_started = time.monotonic()
+    password = make_password(GENERATED_PASSWORD)
+    user_ids = _bulk_create(
+        User,
+        (
+            User(
+                email=f"{GENERATED_PREFIX}user-{n}@example.com",
+                password=password,
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+            )
+            for n in range(users)
+        ),
+        batch_size,
+    )
+    record("users", len(user_ids), step_started)
+
+    # Popularity: Zipf over a random ranking of the active products
+    bestsellers = [
+        pk for pk, is_active in zip(product_ids, active) if is_active
+    ] or list(product_ids)
+    rng.shuffle(bestsellers)
+    popularity = zipf_cum_weights(len(bestsellers), 1.07)
+
+    def pick_products(count):
+        """Up to count distinct products, popular ones more often."""
+        picks = rng.choices(bestsellers, cum_weights=popularity, k=count)
+        return list(dict.fromkeys(picks))
+
+    def line_count(mean, limit):
+        """Between 1 and limit lines, exponentially distributed."""
+        return 1 + min(int(rng.expovariate(1 / mean)), limit - 1)
+
+    # Carts: 1-10 lines, mostly 1-3
+    step_started = time.monotonic()
+    cart_users = rng.sample(user_ids, min(carts, users))
+    cart_ids = _bulk_create(
+        Cart, (Cart(user_id=user_id) for user_id in cart_users), batch_size
+    )
+    cart_item_ids = _bulk_create(
+        CartItem,
+        (
+            CartItem(
+                cart_id=cart_id,
+                product_id=product_id,
+                quantity=rng.choices([1, 2, 3], [80, 15, 5])[0],
+            )
+            for cart_id in cart_ids
+            for product_id in pick_products(line_count(1.5, 10))
+        ),
+        batch_size,
+    )
+    counts["carts"] = len(cart_ids)
+    record("cart_items", len(cart_item_ids), step_started)
+
+    # Orders: repeat customers, 1-8 lines, prices snapshotted
+    step_started = time.monotonic()
+    customers = list(user_ids)
+    rng.shuffle(customers)
+    loyalty = zipf_cum_weights(len(customers), 0.8)
+
+    def new_order():
+        """One order and its (product id, quantity) lines."""
+        lines = [
+            (product_id, rng.choices([1, 2, 3], [85, 12, 3])[0])
+            for product_id in pick_products(line_count(1.2, 8))
+        ]
+        order = Order(
+            user_id=rng.choices(customers, cum_weights=loyalty)[0],
+            status=rng.choices(ORDER_STATUSES, ORDER_STATUS_WEIGHTS)[0],
+            total_amount=sum(price_by_id[pk] * quantity for pk, quantity in lines),
+            shipping_address=f"{rng.randint(1, 999)} Generated Street",
+        )
+        return order, lines
+
+    # Each chunk of orders is inserted together with its items, so only
+    # one chunk's lines are ever held in memory
+    order_count = order_item_count = 0
+    for chunk in _chunks((new_order() for _ in range(orders)), batch_size):
+        with transaction.atomic():
+            created = Order.objects.bulk_create([order for order, _ in chunk])
+            items = OrderItem.objects.bulk_create(
+                (
+                    OrderItem(
+                        order_id=order.pk,
+                        product_id=product_id,
+                        quantity=quantity,
+                        price_at_purchase=price_by_id[product_id],
+                    )
+                    for order, (_, lines) in zip(created, chunk)
+                    for product_id, quantity in lines
+                ),
+                batch_size=batch_size,
+            )
+        order_count += len(created)
+        order_item_count += len(items)
+    counts["orders"] = order_count
+    record("order_items", order_item_count, step_started)
+
+    recount_categories()
+    invalidate_catalog()
+    counts["seconds"] = round(time.monotonic() - started, 1)
+    return counts
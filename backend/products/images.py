@@ -0,0 +1,245 @@
+"""
+Image Derivatives: Pre-Generated Thumbnails for Responsive Images.
+
+Product and category images are stored as uploaded, often several
+megabytes. Grids and cards only need a few hundred pixels, so after each
+upload this module writes resized copies next to the media files:
+
+    products/laptop.jpg
+    derivatives/products/laptop-200w.webp   derivatives/products/laptop-200w.jpg
+    derivatives/products/laptop-400w.webp   derivatives/products/laptop-400w.jpg
+    ...
+
+and records them in the row's image_variants field:
+
+    {"source": "products/laptop.jpg",
+     "webp": {"200": "derivatives/products/laptop-200w.webp", ...},
+     "jpeg": {"200": "derivatives/products/laptop-200w.jpg", ...}}
+
+Serializers turn that into srcset strings (ImageSrcsetField), so reading
+it costs no storage calls.
+
+How it works:
+    - A post_save signal (products/signals.py) queues generation when the
+      image differs from image_variants["source"], after the transaction
+      commits
+    - A small thread pool does the work off the request thread. Pillow
+      releases the GIL while decoding, resizing and encoding, so threads
+      run in parallel
+    - The result is written with queryset.update() only if the row still
+      has the same image, then the catalog cache is invalidated
+    - python manage.py generate_image_derivatives backfills existing media
+      and invalidates the catalog cache once at the end, not per image
+
+Configuration (config/settings.py):
+    IMAGE_DERIVATIVE_WIDTHS   - Target widths in pixels
+    IMAGE_DERIVATIVE_QUALITY  - WebP/JPEG quality (1-100)
+    IMAGE_DERIVATIVE_WORKERS  - Background threads (0 = generate inline)
+
+Pillow docs: https://pillow.readthedocs.io/
+"""
+
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import invalidate_catalog
+
+logger = logging.getLogger(__name__)
+
+# Output formats: variants key -> (Pillow format, file extension)
+FORMATS = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+DERIVATIVES_DIR = "derivatives"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def needs_derivatives(instance):
+    """Return True if the instance's image_variants don't match its image."""
+    name = instance.image.name if instance.image else ""
+    return name != instance.image_variants.get("source", "")
+
+
+def get_derivative_name(name, width, extension):
+    """Return the storage name of one resized copy of an image."""
+    stem = os.path.splitext(name)[0]
+    return f"{DERIVATIVES_DIR}/{stem}-{width}w.{extension}"
+
+
+def _encode(image, pillow_format):
+    """Encode an image for one output format."""
+    if pillow_format == "JPEG" and image.mode != "RGB":
+        # JPEG has no alpha channel: flatten transparency onto white
+        background = Image.new("RGB", image.size, "white")
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    output = io.BytesIO()
+    image.save(
+        output,
+        pillow_format,
+        quality=settings.IMAGE_DERIVATIVE_QUALITY,
+        optimize=True,
+    )
+    return output.getvalue()
+
+
+def render_derivatives(name):
+    """
+    Write resized copies of one stored image.
+
+    Widths larger than the original are capped at its width, so small
+    images are re-encoded but never upscaled.
+
+    Returns:
+        dict: image_variants value for the image
+    """
+    variants = {"source": name}
+    with default_storage.open(name, "rb") as source:
+        with Image.open(source) as original:
+            original = ImageOps.exif_transpose(original)
+            widths = sorted(
+                {
+                    min(width, original.width)
+                    for width in settings.IMAGE_DERIVATIVE_WIDTHS
+                }
+            )
+            for width in widths:
+                resized = original.copy()
+                resized.thumbnail((width, resized.height), Image.LANCZOS)
+                for key, (pillow_format, extension) in FORMATS.items():
+                    derivative = get_derivative_name(name, width, extension)
+                    if default_storage.exists(derivative):
+                        default_storage.delete(derivative)
+                    default_storage.save(
+                        derivative, ContentFile(_encode(resized, pillow_format))
+                    )
+                    variants.setdefault(key, {})[str(width)] = derivative
+    return variants
+
+
+def _stored_names(variants):
+    """Return the derivative file names listed in an image_variants value."""
+    return {
+        derivative
+        for key in FORMATS
+        for derivative in variants.get(key, {}).values()
+    }
+
+
+def update_derivatives(model, pk, invalidate=True):
+    """
+    Bring one row's image_variants up to date with its image.
+
+    Generates the copies, saves them only if the row still has the same
+    image, and removes derivative files that are no longer referenced.
+
+    Args:
+        model: Product or Category
+        pk: Primary key of the row
+        invalidate: Invalidate the catalog cache if the row was updated;
+            backfills pass False and invalidate once when they finish
+
+    Returns:
+        bool: True if the row was updated
+    """
+    row = model.objects.filter(pk=pk).values("image", "image_variants").first()
+    if row is None:
+        return False
+
+    name = row["image"] or ""
+    variants = render_derivatives(name) if name else {}
+    # A cleared image is stored as "" or NULL depending on how it was cleared
+    same_image = Q(image=name) if name else Q(image="") | Q(image__isnull=True)
+    updated = model.objects.filter(same_image, pk=pk).update(
+        image_variants=variants, updated_at=timezone.now()
+    )
+    if not updated:
+        # The image changed meanwhile; that save queued its own run
+        stale = _stored_names(variants)
+    else:
+        stale = _stored_names(row["image_variants"]) - _stored_names(variants)
+        if invalidate:
+            invalidate_catalog()
+
+    for derivative in stale:
+        default_storage.delete(derivative)
+    return bool(updated)
+
+
+def _run_in_worker(model, pk):
+    """Thread pool entry point: log failures and release the connection."""
+    try:
+        update_derivatives(model, pk)
+    except Exception:
+        logger.exception(
+            "Generating image derivatives failed for %s %s",
+            model._meta.label,
+            pk,
+        )
+    finally:
+        connections.close_all()
+
+
+def queue_derivatives(model, pk):
+    """
+    Generate a row's derivatives in the background (or inline).
+
+    Call after the transaction that saved the image commits, e.g. from
+    transaction.on_commit(), so the worker sees the new row.
+    """
+    if settings.IMAGE_DERIVATIVE_WORKERS <= 0:
+        update_derivatives(model, pk)
+        return
+
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+                thread_name_prefix="image-derivatives",
+            )
+    _executor.submit(_run_in_worker, model, pk)
+
+
+def build_srcset(variants, request=None):
+    """
+    Turn an image_variants value into srcset strings.
+
+    Returns:
+        dict: {"webp": "<url> 200w, <url> 400w", "jpeg": "..."}; empty
+            while derivatives haven't been generated
+    """
+    srcset = {}
+    for key in FORMATS:
+        sizes = sorted(
+            variants.get(key, {}).items(), key=lambda item: int(item[0])
+        )
+        if not sizes:
+            continue
+        entries = []
+        for width, derivative in sizes:
+            url = default_storage.url(derivative)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            entries.append(f"{url} {width}w")
+        srcset[key] = ", ".join(entries)
+    return srcset
@@ -0,0 +1,240 @@
+"""
+Bulk Product Import from CSV or JSON Lines.
+
+Supplier feeds carry far more rows than the one-product-per-request API
+can handle. This module streams a feed in chunks and upserts each chunk
+with a single statement:
+
+    INSERT INTO products_product (...) VALUES (...), (...), ...
+    ON CONFLICT (slug) DO UPDATE SET name = EXCLUDED.name, ...
+
+Used by:
+    python manage.py import_products feed.csv
+    POST /api/products/import/ (admin only, multipart "file" upload)
+
+Input:
+    CSV with a header row, or JSON Lines (one object per line). Columns /
+    keys: slug, name, price, category (slug), and optionally description,
+    inventory_count, is_active, featured. New products get the model
+    defaults for missing keys and empty CSV cells; an existing slug is only
+    updated with the fields its row provides, so a partial feed (e.g.
+    slug,name,price,category) keeps the stored stock and flags.
+
+How it works:
+    - Rows are read lazily and processed batch_size at a time, so memory
+      use doesn't depend on the feed size
+    - Categories are loaded once into a {slug: Category} dict
+    - Each row is validated by ProductImportSerializer (the same rules as
+      ProductCreateUpdateSerializer); invalid rows are reported by row
+      number and skipped
+    - Each chunk is upserted in its own transaction, with one statement
+      per distinct set of provided fields (usually just one)
+    - If a slug appears twice in a chunk, the later row wins and the
+      earlier one is counted in "duplicates" and reported by row number,
+      so rows always equals created + updated + failed + duplicates
+
+bulk_create() skips save() and signals, so afterwards the import
+recounts the touched categories (products/counts.py) and invalidates the
+catalog cache (products/cache.py) itself. The search vector is filled by
+its database trigger as usual.
+"""
+
+import csv
+import json
+import time
+from collections import defaultdict
+from itertools import islice
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .cache import invalidate_catalog
+from .counts import recount_categories
+from .models import Category, Product
+from .serializers import ProductImportSerializer
+
+FORMATS = ("csv", "jsonl")
+
+# Fields written on insert and, when the row provides them, overwritten on
+# conflict (updated_at always is)
+UPSERT_FIELDS = [
+    "name",
+    "description",
+    "price",
+    "category",
+    "inventory_count",
+    "is_active",
+    "featured",
+    "updated_at",
+]
+
+# Keep at most this many row errors in the report
+MAX_REPORTED_ERRORS = 1000
+
+
+def get_format(filename):
+    """Guess the feed format from a file name, or return None."""
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def read_rows(stream, file_format):
+    """
+    Yield (row_number, data, error) for every record in a text stream.
+
+    data is a dict, or None when the record couldn't be parsed (error then
+    says why). Row numbers start at 1 for the first record.
+    """
+    if file_format == "csv":
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            # Drop empty cells: new products get the model defaults, existing
+            # ones keep their stored values
+            data = {
+                key: value
+                for key, value in row.items()
+                if key and value not in ("", None)
+            }
+            yield number, data, None
+        return
+
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            data = json.loads(line)
+        except ValueError as exc:
+            yield number, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(data, dict):
+            yield number, None, "Each line must be a JSON object."
+            continue
+        yield number, data, None
+
+
+def get_update_fields(data):
+    """Return the UPSERT_FIELDS an existing product takes from a validated row."""
+    return tuple(
+        field for field in UPSERT_FIELDS if field in data or field == "updated_at"
+    )
+
+
+def import_products(stream, file_format, batch_size=1000):
+    """
+    Validate and upsert every product in a CSV or JSON Lines stream.
+
+    Args:
+        stream: Text stream (file opened in text mode, newline="")
+        file_format: "csv" or "jsonl"
+        batch_size: Rows validated and upserted per chunk
+
+    Returns:
+        dict: rows, created, updated, failed, duplicates, errors (first
+            MAX_REPORTED_ERRORS as {"row": n, "errors": {...}}, covering
+            failed and duplicate rows), seconds and rows_per_second
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown format {file_format!r}, use csv or jsonl.")
+
+    started = time.monotonic()
+    categories = {
+        category.slug: category
+        for category in Category.objects.filter(is_active=True)
+    }
+    validator = ProductImportSerializer(context={"categories": categories})
+    report = {
+        "rows": 0,
+        "created": 0,
+        "updated": 0,
+        "failed": 0,
+        "duplicates": 0,
+        "errors": [],
+    }
+    touched_categories = set()
+
+    def add_error(number, error):
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": number, "errors": error})
+
+    rows = read_rows(stream, file_format)
+    while chunk := list(islice(rows, batch_size)):
+        products = {}
+        update_fields = {}
+        row_numbers = {}
+        for number, data, error in chunk:
+            report["rows"] += 1
+            if data is not None:
+                try:
+                    validated = validator.run_validation(data)
+                except serializers.ValidationError as exc:
+                    error = exc.detail
+                else:
+                    product = Product(**validated)
+                    if product.slug in products:
+                        report["duplicates"] += 1
+                        add_error(
+                            row_numbers[product.slug],
+                            {"slug": [f"Replaced by row {number} (same slug)."]},
+                        )
+                    products[product.slug] = product
+                    update_fields[product.slug] = get_update_fields(validated)
+                    row_numbers[product.slug] = number
+                    continue
+            report["failed"] += 1
+            add_error(number, error)
+
+        if products:
+            previous_categories = _upsert(products, update_fields)
+            report["updated"] += len(previous_categories)
+            report["created"] += len(products) - len(previous_categories)
+            touched_categories.update(previous_categories.values())
+            touched_categories.update(
+                product.category_id for product in products.values()
+            )
+
+    if touched_categories:
+        recount_categories(touched_categories)
+        invalidate_catalog()
+
+    report["seconds"] = round(time.monotonic() - started, 3)
+    report["rows_per_second"] = round(
+        report["rows"] / report["seconds"] if report["seconds"] else 0.0, 1
+    )
+    return report
+
+
+def _upsert(products, update_fields):
+    """
+    Upsert one chunk of validated products.
+
+    Args:
+        products: {slug: unsaved Product}
+        update_fields: {slug: fields to overwrite if the slug exists}
+
+    Returns:
+        dict: {slug: previous category_id} for the rows that already existed
+            (products moving category change both categories' counts)
+    """
+    groups = defaultdict(list)
+    for slug, product in products.items():
+        groups[update_fields[slug]].append(product)
+
+    with transaction.atomic():
+        previous_categories = dict(
+            Product.objects.filter(slug__in=list(products)).values_list(
+                "slug", "category_id"
+            )
+        )
+        for fields, group in groups.items():
+            Product.objects.bulk_create(
+                group,
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=list(fields),
+            )
+    return previous_categories
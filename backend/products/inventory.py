@@ -0,0 +1,151 @@
+"""
+Set-Based Inventory Updates for Checkout and Order Cancellation.
+
+Checkout used to read stock in Python and save each product separately:
+one UPDATE per cart line, and two concurrent checkouts could both read the
+same stock level and oversell. These helpers replace that with:
+
+    1. lock_products(): SELECT ... FOR UPDATE on every product in the order,
+       in primary key order. Concurrent checkouts touching the same products
+       queue up instead of interleaving, and the fixed lock order means two
+       carts holding the same products in a different order can't deadlock.
+    2. decrement_inventory(): one conditional UPDATE for all lines:
+
+        UPDATE products_product
+        SET inventory_count = inventory_count - CASE id WHEN 1 THEN 2 ... END
+        WHERE (id = 1 AND inventory_count >= 2) OR (id = 7 AND ...)
+
+       If any line lacks stock, fewer rows match, the statement is rolled
+       back and the failing product ids are returned.
+
+Both must run inside transaction.atomic() (the row locks last until commit).
+
+Stock changes go through queryset.update(), which skips post_save and
+auto_now, so these helpers set updated_at and invalidate the catalog cache
+themselves (see products/cache.py and products/conditional.py). Only the
+changed products' cached detail responses are dropped; the whole catalog
+is invalidated only when a product runs out of stock or comes back in
+stock, the one change list payloads show (is_in_stock).
+
+select_for_update docs: https://docs.djangoproject.com/en/5.0/ref/models/querysets/#select-for-update
+"""
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from .cache import invalidate_catalog, invalidate_product_stock
+from .models import Product
+
+
+def lock_products(product_ids):
+    """
+    Lock product rows for the rest of the transaction.
+
+    Args:
+        product_ids: Iterable of product primary keys
+
+    Returns:
+        dict: {product_id: Product} with current (locked) values; ids that
+            no longer exist are missing
+    """
+    products = (
+        Product.objects.select_for_update()
+        .filter(pk__in=list(product_ids))
+        .order_by("pk")
+    )
+    return {product.pk: product for product in products}
+
+
+def _quantity_case(quantities):
+    """CASE expression mapping each product id to its quantity."""
+    return Case(
+        *[
+            When(pk=product_id, then=Value(quantity))
+            for product_id, quantity in quantities.items()
+        ],
+        output_field=IntegerField(),
+    )
+
+
+def invalidate_stock(quantities, flipped):
+    """
+    Invalidate cached responses after a stock change.
+
+    Args:
+        quantities: {product_id: quantity} that was removed or added back
+        flipped: Callable (stock now, quantity) -> True if the product's
+            is_in_stock changed
+    """
+    stock = Product.objects.filter(pk__in=list(quantities)).values_list(
+        "pk", "slug", "inventory_count"
+    )
+    slugs = []
+    for product_id, slug, inventory_count in stock:
+        if flipped(inventory_count, quantities[product_id]):
+            invalidate_catalog()
+            return
+        slugs.append(slug)
+    invalidate_product_stock(slugs)
+
+
+def decrement_inventory(quantities):
+    """
+    Decrement stock for several products in one conditional UPDATE.
+
+    Args:
+        quantities: {product_id: quantity to remove}
+
+    Returns:
+        list: Product ids without enough stock; empty on success. On
+            failure no product is changed.
+    """
+    if not quantities:
+        return []
+
+    has_stock = Q()
+    for product_id, quantity in quantities.items():
+        has_stock |= Q(pk=product_id, inventory_count__gte=quantity)
+
+    with transaction.atomic():
+        updated = Product.objects.filter(has_stock).update(
+            inventory_count=F("inventory_count") - _quantity_case(quantities),
+            updated_at=timezone.now(),
+        )
+        if updated != len(quantities):
+            # Roll back to the savepoint so no line is partially applied
+            transaction.set_rollback(True)
+
+    if updated != len(quantities):
+        stock = dict(
+            Product.objects.filter(pk__in=list(quantities)).values_list(
+                "pk", "inventory_count"
+            )
+        )
+        return [
+            product_id
+            for product_id, quantity in quantities.items()
+            if stock.get(product_id, 0) < quantity
+        ]
+
+    # Sold out now: list payloads change too
+    invalidate_stock(quantities, lambda stock, quantity: stock == 0)
+    return []
+
+
+def restore_inventory(quantities):
+    """
+    Add stock back for several products in one UPDATE.
+
+    Args:
+        quantities: {product_id: quantity to add back}
+    """
+    if not quantities:
+        return
+
+    Product.objects.filter(pk__in=list(quantities)).update(
+        inventory_count=F("inventory_count") + _quantity_case(quantities),
+        updated_at=timezone.now(),
+    )
+    # Back in stock (was 0): list payloads change too
+    invalidate_stock(quantities, lambda stock, quantity: stock == quantity)
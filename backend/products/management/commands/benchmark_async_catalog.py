@@ -0,0 +1,184 @@
+"""
+Management command: load-test the sync and async catalog endpoints.
+
+Sends the same number of concurrent requests to each DRF endpoint and to
+its async twin under /api/async/ (products/async_views.py), and prints
+throughput and latency side by side:
+
+    python manage.py benchmark_async_catalog --url http://localhost:8000
+    python manage.py benchmark_async_catalog --concurrency 50 200 500
+    python manage.py benchmark_async_catalog --endpoints products detail \\
+        --token <access token>
+
+Start the server the way production does, so both paths run on the same
+ASGI workers:
+
+    CATALOG_CACHE_TIMEOUT=0 DB_CONN_MAX_AGE=0 gunicorn --workers 4 \\
+        --worker-class uvicorn.workers.UvicornWorker config.asgi:application
+
+CATALOG_CACHE_TIMEOUT=0 makes every request reach the database; leave it
+on to compare cache hits instead. The load generator is a thread pool,
+so run it on another machine (or pin it to other cores) when measuring
+high concurrency. The detail endpoint uses the newest active product
+unless --slug is given; cart-summary needs --token.
+
+Django management command docs:
+    https://docs.djangoproject.com/en/5.0/howto/custom-management-commands/
+"""
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.models import Product
+
+# name -> (sync path, async path)
+ENDPOINTS = {
+    "products": ("/api/products/", "/api/async/products/"),
+    "featured": ("/api/products/featured/", "/api/async/products/featured/"),
+    "detail": ("/api/products/{slug}/", "/api/async/products/{slug}/"),
+    "categories": ("/api/categories/", "/api/async/categories/"),
+    "cart-summary": ("/api/cart/summary/", "/api/async/cart/summary/"),
+}
+
+WARMUP_REQUESTS = 20
+
+
+def fetch(url, headers, timeout):
+    """
+    Send one GET request.
+
+    Returns:
+        tuple: (seconds taken, True if the response was a 200)
+    """
+    started = time.perf_counter()
+    try:
+        with urlopen(Request(url, headers=headers), timeout=timeout) as response:
+            response.read()
+            ok = response.status == 200
+    except (URLError, OSError):
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def run_load(url, requests, concurrency, headers, timeout):
+    """
+    Send requests GETs with concurrency of them in flight at a time.
+
+    Returns:
+        dict: requests_per_second, p50_ms, p95_ms and errors
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        results = list(
+            pool.map(lambda _: fetch(url, headers, timeout), range(requests))
+        )
+        elapsed = time.perf_counter() - started
+
+    latencies = [seconds for seconds, _ in results]
+    return {
+        "requests_per_second": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": statistics.quantiles(latencies, n=20)[-1] * 1000,
+        "errors": sum(1 for _, ok in results if not ok),
+    }
+
+
+class Command(BaseCommand):
+    """Compare sync (DRF) and async catalog endpoints under load."""
+
+    help = "Load-test the sync and async catalog endpoints side by side."
+
+    def add_arguments(self, parser):
+        """Add the target, load shape and endpoint options."""
+        parser.add_argument(
+            "--url",
+            default="http://localhost:8000",
+            help="Base URL of the running server (default http://localhost:8000)",
+        )
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=list(ENDPOINTS),
+            default=["products", "featured", "detail", "categories"],
+            help="Endpoints to compare (default: all catalog endpoints)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[50, 200],
+            help="Requests in flight at once; several values run in turn",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Requests per endpoint, mode and concurrency (default 2000)",
+        )
+        parser.add_argument(
+            "--slug", help="Product slug for the detail endpoint"
+        )
+        parser.add_argument(
+            "--token", help="JWT access token for the cart-summary endpoint"
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30.0,
+            help="Seconds before a request counts as an error (default 30)",
+        )
+
+    def handle(self, *args, **options):
+        """Warm up each endpoint, then run the load and print the table."""
+        base_url = options["url"].rstrip("/")
+        slug = options["slug"]
+        if "detail" in options["endpoints"] and slug is None:
+            slug = (
+                Product.objects.filter(is_active=True)
+                .values_list("slug", flat=True)
+                .first()
+            )
+            if slug is None:
+                raise CommandError("No active product for --endpoints detail.")
+        if "cart-summary" in options["endpoints"] and not options["token"]:
+            raise CommandError("--endpoints cart-summary needs --token.")
+
+        headers = {"Accept": "application/json"}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+
+        self.stdout.write(
+            f"{'endpoint':<14}{'mode':<7}{'conc':>6}{'req/s':>10}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}"
+        )
+        for name in options["endpoints"]:
+            for concurrency in options["concurrency"]:
+                throughput = {}
+                for mode, path in zip(("sync", "async"), ENDPOINTS[name]):
+                    url = base_url + path.format(slug=slug)
+                    run_load(url, WARMUP_REQUESTS, concurrency, headers, 10)
+                    result = run_load(
+                        url,
+                        options["requests"],
+                        concurrency,
+                        headers,
+                        options["timeout"],
+                    )
+                    throughput[mode] = result["requests_per_second"]
+                    self.stdout.write(
+                        f"{name:<14}{mode:<7}{concurrency:>6}"
+                        f"{result['requests_per_second']:>10.1f}"
+                        f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                        f"{result['errors']:>8}"
+                    )
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{name} at {concurrency}: async/sync throughput "
+                        f"{throughput['async'] / throughput['sync']:.2f}x"
+                    )
+                )
@@ -0,0 +1,110 @@
+"""
+Management command: fill the database with a synthetic catalog.
+
+Creates categories, products, users, carts and orders with realistic
+distributions (see products/generator.py), so production-scale behaviour
+can be reproduced locally:
+
+    python manage.py generate_catalog
+    python manage.py generate_catalog --products 1000000 --users 100000 \\
+        --carts 20000 --orders 500000
+    python manage.py generate_catalog --seed 42 --flush
+
+The same --seed and sizes always produce the same rows. Generated rows
+use "gen-" slugs and emails; --flush deletes an earlier run's rows first.
+
+Django management command docs:
+    https://docs.djangoproject.com/en/5.0/howto/custom-management-commands/
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.generator import (
+    GENERATED_PASSWORD,
+    delete_generated,
+    generate_catalog,
+    generated_rows_exist,
+)
+
+
+class Command(BaseCommand):
+    """Generate a synthetic catalog and shopping history."""
+
+    help = "Create synthetic products, categories, users, carts and orders."
+
+    def add_arguments(self, parser):
+        """Add the size, --seed, --batch-size and --flush options."""
+        parser.add_argument(
+            "--products",
+            type=int,
+            default=10_000,
+            help="Products to create (default 10000)",
+        )
+        parser.add_argument(
+            "--users", type=int, default=1_000, help="Users to create (default 1000)"
+        )
+        parser.add_argument(
+            "--carts",
+            type=int,
+            default=500,
+            help="Users that get a filled cart (default 500)",
+        )
+        parser.add_argument(
+            "--orders", type=int, default=5_000, help="Orders to create (default 5000)"
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed; the same seed gives the same data (default 0)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5_000,
+            help="Rows per INSERT (default 5000)",
+        )
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Delete previously generated rows first",
+        )
+
+    def handle(self, *args, **options):
+        """Check the options, generate the rows and print the totals."""
+        sizes = {
+            name: options[name] for name in ("products", "users", "carts", "orders")
+        }
+        if any(size < 0 for size in sizes.values()):
+            raise CommandError("Sizes can't be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if sizes["carts"] > sizes["users"]:
+            raise CommandError("--carts can't exceed --users (one cart per user).")
+
+        if generated_rows_exist():
+            if not options["flush"]:
+                raise CommandError(
+                    "Generated rows already exist; pass --flush to replace them."
+                )
+            self.stdout.write("Deleting previously generated rows...")
+            delete_generated()
+
+        try:
+            counts = generate_catalog(
+                **sizes,
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                log=self.stdout.write,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {counts['products']} products, {counts['users']} "
+                f"users, {counts['carts']} carts and {counts['orders']} orders "
+                f"in {counts['seconds']}s. Users log in with "
+                f'"{GENERATED_PASSWORD}".'
+            )
+        )
@@ -0,0 +1,95 @@
+"""
+Management command: generate thumbnails for existing product/category images.
+
+New uploads get their derivatives automatically (see products/images.py).
+Run this once after deploying, after loading fixtures, or after changing
+IMAGE_DERIVATIVE_WIDTHS / IMAGE_DERIVATIVE_QUALITY:
+
+    python manage.py generate_image_derivatives
+    python manage.py generate_image_derivatives --workers 8
+    python manage.py generate_image_derivatives --force
+
+Images are processed in parallel by a thread pool; Pillow releases the GIL
+while resizing and encoding, so threads use several CPU cores. The catalog
+cache is invalidated once when the run finishes, not once per image, so a
+large backfill doesn't keep emptying it while the storefront is serving.
+
+Django management command docs:
+    https://docs.djangoproject.com/en/5.0/howto/custom-management-commands/
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from products.cache import invalidate_catalog
+from products.images import needs_derivatives, update_derivatives
+from products.models import Category, Product
+
+
+def _process(model, pk):
+    """Generate one row's derivatives in a worker thread."""
+    try:
+        return update_derivatives(model, pk, invalidate=False)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    """Backfill image_variants for every product and category image."""
+
+    help = "Generate resized WebP/JPEG copies of existing images in parallel."
+
+    def add_arguments(self, parser):
+        """Add the --workers and --force options."""
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Images processed at the same time (default: CPU count)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate derivatives that are already up to date",
+        )
+
+    def handle(self, *args, **options):
+        """Queue every image that needs work and report the outcome."""
+        jobs = []
+        for model in (Category, Product):
+            rows = (
+                model.objects.exclude(image="")
+                .exclude(image__isnull=True)
+                .only("pk", "image", "image_variants")
+                .iterator()
+            )
+            jobs.extend(
+                (model, row.pk)
+                for row in rows
+                if options["force"] or needs_derivatives(row)
+            )
+
+        generated = failed = 0
+        with ThreadPoolExecutor(max_workers=max(options["workers"], 1)) as pool:
+            futures = {pool.submit(_process, *job): job for job in jobs}
+            for future in as_completed(futures):
+                model, pk = futures[future]
+                try:
+                    if future.result():
+                        generated += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"{model._meta.label} {pk}: {exc}")
+
+        if generated:
+            invalidate_catalog()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated derivatives for {generated} image(s), "
+                f"{failed} failed."
+            )
+        )
@@ -0,0 +1,74 @@
+"""
+Management command: bulk import products from a CSV or JSON Lines feed.
+
+Streams the file in chunks, validates every row and upserts by slug (see
+products/importer.py for the format and the rules):
+
+    python manage.py import_products feed.csv
+    python manage.py import_products feed.jsonl --batch-size 5000
+    zcat feed.jsonl.gz | python manage.py import_products - --format jsonl
+
+Invalid rows are skipped and listed after the summary.
+
+Django management command docs:
+    https://docs.djangoproject.com/en/5.0/howto/custom-management-commands/
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.importer import FORMATS, get_format, import_products
+
+
+class Command(BaseCommand):
+    """Upsert products from a CSV or JSON Lines file."""
+
+    help = "Bulk import (create or update by slug) products from CSV or JSONL."
+
+    def add_arguments(self, parser):
+        """Add the path, --format and --batch-size options."""
+        parser.add_argument("path", help="Feed file, or - to read stdin")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Feed format (default: guessed from the file extension)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows validated and upserted per transaction (default 1000)",
+        )
+
+    def handle(self, *args, **options):
+        """Run the import and print throughput and row errors."""
+        path = options["path"]
+        file_format = options["format"] or get_format(path)
+        if file_format is None:
+            raise CommandError("Can't guess the format, pass --format csv|jsonl.")
+
+        if path == "-":
+            report = import_products(sys.stdin, file_format, options["batch_size"])
+        else:
+            try:
+                with open(path, encoding="utf-8-sig", newline="") as stream:
+                    report = import_products(
+                        stream, file_format, options["batch_size"]
+                    )
+            except OSError as exc:
+                raise CommandError(f"Can't read {path}: {exc}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['rows']} row(s) in {report['seconds']}s "
+                f"({report['rows_per_second']} rows/s): "
+                f"{report['created']} created, {report['updated']} updated, "
+                f"{report['failed']} failed, {report['duplicates']} duplicate(s)."
+            )
+        )
+        for row_error in report["errors"]:
+            self.stderr.write(f"Row {row_error['row']}: {row_error['errors']}")
+        unreported = report["failed"] + report["duplicates"] - len(report["errors"])
+        if unreported > 0:
+            self.stderr.write(f"... and {unreported} more.")
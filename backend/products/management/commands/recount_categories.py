@@ -0,0 +1,42 @@
+"""
+Management command: rebuild the stored category product counts.
+
+Category.active_product_count is normally kept up to date by signals and
+the admin actions (see products/counts.py). Run this after writes that
+bypass them - raw SQL, bulk_create(), or queryset.update() of is_active or
+category - or whenever the counts look wrong:
+
+    python manage.py recount_categories
+    python manage.py recount_categories --batch-size 500
+
+Django management command docs:
+    https://docs.djangoproject.com/en/5.0/howto/custom-management-commands/
+"""
+
+from django.core.management.base import BaseCommand
+
+from products.cache import invalidate_catalog
+from products.counts import recount_categories
+
+
+class Command(BaseCommand):
+    """Recompute Category.active_product_count from the products table."""
+
+    help = "Recompute every category's stored active product count."
+
+    def add_arguments(self, parser):
+        """Add the --batch-size option."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Maximum categories updated per statement (default 1000)",
+        )
+
+    def handle(self, *args, **options):
+        """Recount all categories and report how many were updated."""
+        recounted = recount_categories(batch_size=options["batch_size"])
+        invalidate_catalog()
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted {recounted} category(ies).")
+        )
@@ -0,0 +1,74 @@
+"""
+Add full-text search support to Product.
+
+PostgreSQL only:
+- A BEFORE INSERT/UPDATE trigger keeps search_vector in sync with
+  name (weight A) and description (weight B)
+- Existing rows are backfilled
+- A GIN index makes @@ lookups index scans
+
+On other databases (e.g. SQLite for quick local tests) only the column is
+added; products.search falls back to icontains matching.
+"""
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+CREATE_SQL = """
+CREATE OR REPLACE FUNCTION products_product_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS products_product_search_vector_trigger ON products_product;
+CREATE TRIGGER products_product_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, search_vector
+    ON products_product
+    FOR EACH ROW EXECUTE FUNCTION products_product_search_vector_update();
+
+UPDATE products_product SET search_vector =
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B');
+
+CREATE INDEX IF NOT EXISTS products_product_search_vector_gin
+    ON products_product USING GIN (search_vector);
+"""
+
+DROP_SQL = """
+DROP INDEX IF EXISTS products_product_search_vector_gin;
+DROP TRIGGER IF EXISTS products_product_search_vector_trigger ON products_product;
+DROP FUNCTION IF EXISTS products_product_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    """Install the trigger, backfill and index (PostgreSQL only)."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_search_trigger(apps, schema_editor):
+    """Remove the trigger, function and index (PostgreSQL only)."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full-text search document (maintained by a database trigger)', null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
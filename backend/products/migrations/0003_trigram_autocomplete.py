@@ -0,0 +1,50 @@
+"""
+Add trigram indexes for product/category autocomplete.
+
+PostgreSQL only:
+- Enables the pg_trgm extension
+- Adds GIN (gin_trgm_ops) indexes on Product.name and Category.name so the
+  word-similarity operator (%>) used by products.search.autocomplete() is an
+  index scan
+
+On other databases this migration is a no-op.
+"""
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+CREATE_SQL = """
+CREATE INDEX IF NOT EXISTS products_product_name_trgm
+    ON products_product USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS products_category_name_trgm
+    ON products_category USING GIN (name gin_trgm_ops);
+"""
+
+DROP_SQL = """
+DROP INDEX IF EXISTS products_product_name_trgm;
+DROP INDEX IF EXISTS products_category_name_trgm;
+"""
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Create the trigram indexes (PostgreSQL only)."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_SQL)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    """Drop the trigram indexes (PostgreSQL only)."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-16 12:00
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_product_counts(apps, schema_editor):
+    """Store the current number of active products on every category."""
+    Category = apps.get_model('products', 'Category')
+    Product = apps.get_model('products', 'Product')
+    active = (
+        Product.objects.filter(category=OuterRef('pk'), is_active=True)
+        .order_by()
+        .values('category')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Category.objects.update(
+        active_product_count=Coalesce(
+            Subquery(active, output_field=IntegerField()), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_product_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active products (kept up to date automatically)'),
+        ),
+        migrations.RunPython(backfill_product_counts, migrations.RunPython.noop),
+    ]
@@ -19,6 +19,7 @@ Relationships:
 - Product -> OrderItem (reverse relation via 'order_items')
 """
 
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 
@@ -37,7 +38,10 @@ class Category(models.Model):
         slug: URL-friendly identifier, auto-generated from name if not provided
         description: Optional description for category pages
         image: Optional thumbnail image for visual representation
+        image_variants: Resized copies of image (filled by products/images.py)
         is_active: Controls visibility in the storefront (soft delete pattern)
+        active_product_count: Stored number of active products (maintained
+            by products/counts.py, never counted on read)
         created_at: Timestamp when category was created
         updated_at: Timestamp when category was last modified
 
@@ -67,11 +71,22 @@ class Category(models.Model):
         null=True,
         help_text="Category thumbnail image"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/JPEG copies of the image (generated automatically)"
+    )
     is_active = models.BooleanField(
         default=True,
         db_index=True,
         help_text="Inactive categories are hidden from the store"
     )
+    active_product_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of active products (kept up to date automatically)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -93,20 +108,44 @@ class Category(models.Model):
         - Converts to lowercase
         - Replaces spaces with hyphens
         - Removes non-alphanumeric characters
+
+        active_product_count is changed in the database by
+        products/counts.py, so the value on a loaded instance may already
+        be stale. A plain update writes the column back to itself instead
+        of overwriting it; callers' update_fields/force_* are left as is.
         """
         if not self.slug:
             self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        keep_count = (
+            not self._state.adding
+            and not kwargs.get('force_insert')
+            and kwargs.get('update_fields') is None
+            and 'active_product_count' in self.__dict__
+        )
+        if not keep_count:
+            super().save(*args, **kwargs)
+            return
+        loaded_count = self.active_product_count
+        self.active_product_count = models.F('active_product_count')
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            self.active_product_count = loaded_count
+
+
+class ProductManager(models.Manager):
+    """
+    Default Product manager: leaves search_vector out of the SELECT.
 
-    @property
-    def product_count(self) -> int:
-        """
-        Return count of active products in this category.
+    The tsvector is only read by the database itself (the search filter
+    and SearchRank use the column in SQL), yet it is usually larger than
+    the rest of the row, so loading it with every product is wasted I/O
+    and memory. Accessing product.search_vector still works; Django then
+    fetches it with one extra query.
+    """
 
-        Used in admin list view and API responses to show category popularity.
-        Only counts active products (not soft-deleted ones).
-        """
-        return self.products.filter(is_active=True).count()
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
 
 
 class Product(models.Model):
@@ -130,9 +169,11 @@ class Product(models.Model):
         price: Product price as Decimal (max 10 digits, 2 decimal places)
         category: ForeignKey to Category (required)
         image: Main product image
+        image_variants: Resized copies of image (filled by products/images.py)
         inventory_count: Number of items in stock
         is_active: Controls visibility (soft delete pattern)
         featured: Flag for homepage/special placement
+        search_vector: Weighted tsvector of name + description (full-text search)
         created_at: Timestamp when product was created
         updated_at: Timestamp when product was last modified
 
@@ -141,14 +182,22 @@ class Product(models.Model):
         - is_active: Frequently filtered
         - featured + is_active: For homepage queries
         - category + is_active: For category listing pages
-        - created_at: For "newest" sorting
-        - price: For price range filtering
+        - created_at + id: For "newest" sorting and keyset pagination
+        - price + id: For price range filtering and keyset pagination
+        - name + id: For alphabetical sorting and keyset pagination
+        - search_vector: GIN index for full-text search (PostgreSQL only,
+          created in migration 0002_product_search_vector)
 
     Design Notes:
         - Using Decimal for price to avoid floating-point errors
         - inventory_count is PositiveIntegerField (can't go negative)
         - Slug auto-generated from name if not provided
         - Related names allow reverse lookups (category.products.all())
+        - search_vector is filled by a database trigger, never by Python,
+          so bulk writes that bypass save() still keep it up to date
+        - search_vector is deferred by ProductManager; select_related()
+          paths through a foreign key defer it explicitly
+          (e.g. .defer('product__search_vector'))
     """
 
     name = models.CharField(
@@ -181,6 +230,12 @@ class Product(models.Model):
         null=True,
         help_text="Main product image"
     )
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized WebP/JPEG copies of the image (generated automatically)"
+    )
     inventory_count = models.PositiveIntegerField(
         default=0,
         help_text="Number of items in stock (cannot be negative)"
@@ -195,9 +250,16 @@ class Product(models.Model):
         db_index=True,
         help_text="Featured products appear on the homepage"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Full-text search document (maintained by a database trigger)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductManager()
+
     class Meta:
         verbose_name = 'Product'
         verbose_name_plural = 'Products'
@@ -207,16 +269,30 @@ class Product(models.Model):
             models.Index(fields=['category', 'is_active']),
             # Composite index for homepage featured products
             models.Index(fields=['featured', 'is_active']),
-            # Index for newest products sorting
-            models.Index(fields=['-created_at']),
-            # Index for price range filtering
-            models.Index(fields=['price']),
+            # Indexes for sorting; 'id' is the keyset pagination tie-breaker,
+            # so "WHERE (price, id) > (...) ORDER BY price, id" is a range scan
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['price', 'id']),
+            models.Index(fields=['name', 'id']),
         ]
 
     def __str__(self) -> str:
         """Return product name for display in admin and shell."""
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the loaded (category_id, is_active).
+
+        Saves that change neither can't move the stored category counts,
+        so products/signals.py skips looking up the previous state for them.
+        """
+        instance = super().from_db(db, field_names, values)
+        if 'category_id' in instance.__dict__ and 'is_active' in instance.__dict__:
+            instance._counted_loaded = (instance.category_id, instance.is_active)
+        return instance
+
     def save(self, *args, **kwargs):
         """
         Auto-generate slug from name if not provided.
@@ -0,0 +1,107 @@
+"""
+Product Search Engine.
+
+Shared search implementation used by both product search entry points:
+    - ProductViewSet.search   (GET /api/products/search/?q=term)
+    - ProductFilter.filter_search (GET /api/products/?search=term)
+
+Plus typeahead suggestions for the storefront search box:
+    - ProductViewSet.autocomplete (GET /api/products/autocomplete/?q=lap)
+
+How it works (PostgreSQL):
+    - Product.search_vector is a tsvector column maintained by a database
+      trigger (see migration 0002_product_search_vector), so every write path
+      (save(), queryset.update(), bulk_create(), raw SQL) keeps it current
+    - Name is weighted 'A' and description 'B', so name matches rank higher
+    - A GIN index on search_vector turns searches into index lookups instead
+      of a sequential scan with ILIKE '%term%'
+    - User input is parsed with websearch_to_tsquery, which understands
+      quoted phrases, "or" and -exclusions and never raises on bad syntax
+
+Fallback (SQLite and other non-PostgreSQL databases):
+    - Uses the previous icontains search on name and description
+    - Annotates a constant rank so callers can always order by search_rank
+
+Autocomplete (PostgreSQL):
+    - pg_trgm GIN indexes on Product.name and Category.name (migration
+      0003_trigram_autocomplete) serve the word-similarity operator (%>)
+    - word_similarity matches partial words, so "lap" finds "Laptop Pro"
+    - Only (id, slug, name) tuples are fetched via values(), so no model
+      instances or serializers are involved
+
+PostgreSQL full-text search docs:
+    https://docs.djangoproject.com/en/5.0/ref/contrib/postgres/search/
+"""
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+
+# Text search configuration used by the trigger and the query parser.
+# Must match the configuration in migration 0002_product_search_vector,
+# otherwise stemming differs between indexed and queried terms.
+SEARCH_CONFIG = "english"
+
+# Name of the relevance annotation added by search_products()
+RANK_ANNOTATION = "search_rank"
+
+# Fields returned by autocomplete() - everything a suggestion dropdown needs
+AUTOCOMPLETE_FIELDS = ("id", "slug", "name")
+
+
+def supports_full_text_search(queryset) -> bool:
+    """Return True if the queryset's database supports tsvector search."""
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def search_products(queryset, query: str):
+    """
+    Filter a Product queryset by a search query and annotate relevance.
+
+    Args:
+        queryset: Product queryset to search within (already filtered)
+        query: Raw user input, e.g. 'wireless "noise cancelling" -earbuds'
+
+    Returns:
+        QuerySet: Matching products annotated with 'search_rank'.
+        Ordering is left to the caller.
+    """
+    if not supports_full_text_search(queryset):
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        ).annotate(**{RANK_ANNOTATION: Value(0.0, output_field=FloatField())})
+
+    search_query = SearchQuery(
+        query, search_type="websearch", config=SEARCH_CONFIG
+    )
+    return queryset.filter(search_vector=search_query).annotate(
+        **{RANK_ANNOTATION: SearchRank(F("search_vector"), search_query)}
+    )
+
+
+def autocomplete(queryset, query: str, limit: int) -> list[dict]:
+    """
+    Return typeahead suggestions from a Product or Category queryset.
+
+    Args:
+        queryset: Queryset of a model with 'name' and 'slug' fields
+        query: Partial user input, e.g. "lap"
+        limit: Maximum number of suggestions
+
+    Returns:
+        list[dict]: [{"id": 1, "slug": "laptop-pro", "name": "Laptop Pro"}, ...]
+        ordered by similarity (best first), then name.
+    """
+    if not supports_full_text_search(queryset):
+        matches = queryset.filter(name__icontains=query).order_by("name")
+    else:
+        matches = (
+            queryset.filter(name__trigram_word_similar=query)
+            .annotate(similarity=TrigramWordSimilarity(query, "name"))
+            .order_by("-similarity", "name")
+        )
+    return list(matches.values(*AUTOCOMPLETE_FIELDS)[:limit])
@@ -9,6 +9,9 @@ Serializer Hierarchy:
     - ProductListSerializer: Minimal data for list views (performance)
     - ProductDetailSerializer: Full data for detail views
     - ProductCreateUpdateSerializer: For POST/PUT operations (admin only)
+    - ProductImportSerializer: One row of a bulk import (admin only)
+    - AutocompleteSerializer: Typeahead suggestions (documentation only)
+    - ProductFacetsSerializer: Sidebar facet counts (documentation only)
 
 Design Principles:
     - Never use fields = '__all__' (explicit is better, prevents accidental exposure)
@@ -21,9 +24,28 @@ DRF Serializers docs: https://www.django-rest-framework.org/api-guide/serializer
 
 from rest_framework import serializers
 
+from .images import build_srcset
 from .models import Category, Product
 
 
+class ImageSrcsetField(serializers.ReadOnlyField):
+    """
+    Read-only srcset strings for an image's pre-generated derivatives.
+
+    Reads the stored image_variants value, so it never touches storage:
+        {"webp": "https://.../laptop-200w.webp 200w, ...", "jpeg": "..."}
+    Empty until the derivatives exist (see products/images.py).
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "image_variants")
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        """Build absolute URLs when the request is available."""
+        return build_srcset(value or {}, self.context.get("request"))
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """
     Basic Category serializer for nested views.
@@ -38,14 +60,17 @@ class CategorySerializer(serializers.ModelSerializer):
             "slug": "electronics",
             "description": "Smartphones, laptops, tablets, and accessories",
             "image": null,
+            "image_srcset": {},
             "product_count": 5
         }
     """
 
-    # Use SerializerMethodField to handle both the annotated value
-    # (from CategoryViewSet.get_queryset) and the model property fallback
-    # (when used as a nested serializer in product responses).
-    product_count = serializers.SerializerMethodField()
+    # Stored column maintained by products/counts.py, so nesting a category
+    # in product, cart or order payloads never runs a COUNT
+    product_count = serializers.IntegerField(
+        source="active_product_count", read_only=True
+    )
+    image_srcset = ImageSrcsetField()
 
     class Meta:
         model = Category
@@ -55,20 +80,10 @@ class CategorySerializer(serializers.ModelSerializer):
             "slug",
             "description",
             "image",
+            "image_srcset",
             "product_count",
         ]
 
-    def get_product_count(self, obj):
-        """
-        Return the product count, preferring the annotation for efficiency.
-
-        When accessed via CategoryViewSet, the queryset has an
-        'annotated_product_count' annotation (single query with COUNT).
-        When used as a nested serializer, falls back to the model property
-        (which does a separate COUNT query per category).
-        """
-        return getattr(obj, "annotated_product_count", obj.product_count)
-
 
 class ProductListSerializer(serializers.ModelSerializer):
     """
@@ -86,6 +101,7 @@ class ProductListSerializer(serializers.ModelSerializer):
 
     category = CategorySerializer(read_only=True)
     is_in_stock = serializers.BooleanField(read_only=True)
+    image_srcset = ImageSrcsetField()
 
     class Meta:
         model = Product
@@ -96,6 +112,7 @@ class ProductListSerializer(serializers.ModelSerializer):
             "price",
             "category",
             "image",
+            "image_srcset",
             "is_in_stock",
             "featured",
         ]
@@ -111,7 +128,10 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
     """
 
     products = serializers.SerializerMethodField()
-    product_count = serializers.SerializerMethodField()
+    product_count = serializers.IntegerField(
+        source="active_product_count", read_only=True
+    )
+    image_srcset = ImageSrcsetField()
 
     class Meta:
         model = Category
@@ -121,15 +141,12 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
             "slug",
             "description",
             "image",
+            "image_srcset",
             "product_count",
             "products",
             "created_at",
         ]
 
-    def get_product_count(self, obj):
-        """Return product count, preferring annotation over property."""
-        return getattr(obj, "annotated_product_count", obj.product_count)
-
     def get_products(self, obj):
         """
         Return active products in this category.
@@ -153,6 +170,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
 
     category = CategorySerializer(read_only=True)
     is_in_stock = serializers.BooleanField(read_only=True)
+    image_srcset = ImageSrcsetField()
 
     class Meta:
         model = Product
@@ -164,6 +182,7 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             "price",
             "category",
             "image",
+            "image_srcset",
             "inventory_count",
             "is_in_stock",
             "is_active",
@@ -232,3 +251,116 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
                 "Product name must be at least 3 characters."
             )
         return value.strip()
+
+
+class ProductImportSerializer(ProductCreateUpdateSerializer):
+    """
+    Serializer for one row of a bulk product import.
+
+    Used by products/importer.py (import_products command and
+    POST /api/products/import/). Same rules as ProductCreateUpdateSerializer,
+    except:
+        - category is a slug, resolved from context["categories"] (a dict
+          built once per import) instead of one query per row
+        - slug has no uniqueness check: an existing slug is updated
+        - no image (imports carry data only)
+    """
+
+    category_id = None
+    category = serializers.SlugField(
+        help_text="Slug of the category (must be an active category)"
+    )
+    slug = serializers.SlugField(max_length=200)
+
+    class Meta(ProductCreateUpdateSerializer.Meta):
+        fields = [
+            "name",
+            "slug",
+            "description",
+            "price",
+            "category",
+            "inventory_count",
+            "is_active",
+            "featured",
+        ]
+
+    def validate_category(self, value):
+        """Resolve the category slug without a query."""
+        category = self.context["categories"].get(value)
+        if category is None:
+            raise serializers.ValidationError(
+                "Unknown or inactive category."
+            )
+        return category
+
+
+class ProductImportReportSerializer(serializers.Serializer):
+    """
+    Response shape for POST /api/products/import/.
+
+    Used only for the OpenAPI schema - the view returns the report dict
+    built by products/importer.py.
+    """
+
+    rows = serializers.IntegerField()
+    created = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    duplicates = serializers.IntegerField()
+    errors = serializers.ListField(child=serializers.DictField())
+    seconds = serializers.FloatField()
+    rows_per_second = serializers.FloatField()
+
+
+class AutocompleteItemSerializer(serializers.Serializer):
+    """A single typeahead suggestion: just enough to render and link it."""
+
+    id = serializers.IntegerField()
+    slug = serializers.SlugField()
+    name = serializers.CharField()
+
+
+class AutocompleteSerializer(serializers.Serializer):
+    """
+    Response shape for GET /api/products/autocomplete/.
+
+    Used only for the OpenAPI schema - the view returns the values() rows
+    directly, skipping serializer overhead on this latency-critical path.
+    """
+
+    products = AutocompleteItemSerializer(many=True)
+    categories = AutocompleteItemSerializer(many=True)
+
+
+class CategoryFacetSerializer(serializers.Serializer):
+    """Product count for one category in the facets sidebar."""
+
+    slug = serializers.SlugField()
+    name = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class PriceRangeFacetSerializer(serializers.Serializer):
+    """Product count for one price bucket (max is null for the last one)."""
+
+    min = serializers.DecimalField(max_digits=10, decimal_places=2)
+    max = serializers.DecimalField(
+        max_digits=10, decimal_places=2, allow_null=True
+    )
+    count = serializers.IntegerField()
+
+
+class ProductFacetsSerializer(serializers.Serializer):
+    """
+    Response shape for GET /api/products/facets/.
+
+    Used only for the OpenAPI schema - products.facets.compute_facets()
+    already returns plain JSON-ready data.
+    """
+
+    total = serializers.IntegerField()
+    categories = CategoryFacetSerializer(many=True)
+    in_stock = serializers.IntegerField()
+    out_of_stock = serializers.IntegerField()
+    featured = serializers.IntegerField()
+    price_ranges = PriceRangeFacetSerializer(many=True)
@@ -0,0 +1,97 @@
+"""
+Signal Handlers for the Products App.
+
+Keeps data derived from products in sync with the database:
+    - Cached catalog responses (products/cache.py): any Product or Category
+      save or delete invalidates them
+    - Category.active_product_count (products/counts.py): product creates,
+      deletes, (de)activations and category moves apply +1/-1 deltas
+    - Image derivatives (products/images.py): a new or changed image queues
+      thumbnail generation once the transaction commits
+
+Signals are connected in ProductsConfig.ready().
+
+Django signals docs: https://docs.djangoproject.com/en/5.0/topics/signals/
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_catalog
+from .counts import COUNTED_FIELDS, adjust_product_counts, get_count_deltas
+from .images import needs_derivatives, queue_derivatives
+from .models import Category, Product
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_catalog_cache(sender, **kwargs):
+    """Invalidate cached catalog responses after a catalog write."""
+    invalidate_catalog()
+
+
+@receiver(pre_save, sender=Product)
+def remember_counted_state(sender, instance, update_fields=None, **kwargs):
+    """
+    Record the stored (category_id, is_active) before a product is saved.
+
+    Saves that can't change the counts skip the lookup: new products,
+    update_fields without category/is_active, and saves where both still
+    have the values they were loaded (or last saved) with.
+    """
+    instance._counted_before = None
+    instance._counted_skip = bool(
+        update_fields is not None and not COUNTED_FIELDS & set(update_fields)
+    ) or getattr(instance, "_counted_loaded", None) == (
+        instance.category_id,
+        instance.is_active,
+    )
+    if instance._state.adding or instance._counted_skip:
+        return
+    instance._counted_before = (
+        Product.objects.filter(pk=instance.pk)
+        .values_list("category_id", "is_active")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Product)
+def update_counts_on_save(sender, instance, **kwargs):
+    """Apply the count deltas of a product create or update."""
+    if getattr(instance, "_counted_skip", False):
+        return
+    counted = (instance.category_id, instance.is_active)
+    adjust_product_counts(
+        get_count_deltas(getattr(instance, "_counted_before", None), counted)
+    )
+    instance._counted_loaded = counted
+
+
+@receiver(post_delete, sender=Product)
+def update_counts_on_delete(sender, instance, **kwargs):
+    """Remove a deleted active product from its category's count."""
+    adjust_product_counts(
+        get_count_deltas((instance.category_id, instance.is_active), None)
+    )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Category)
+def schedule_image_derivatives(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    """
+    Queue thumbnail generation when the saved image has no derivatives.
+
+    Fixture loading (raw saves) is skipped; run
+    python manage.py generate_image_derivatives afterwards instead.
+    """
+    if raw or (update_fields is not None and "image" not in update_fields):
+        return
+    if needs_derivatives(instance):
+        transaction.on_commit(partial(queue_derivatives, sender, instance.pk))
@@ -5,7 +5,19 @@ Test Structure:
     - TestCategoryAPI: Category endpoint tests
     - TestProductAPI: Product endpoint tests
     - TestProductFiltering: Filter and search tests
+    - TestProductFullTextSearch: Ranked full-text search tests
+    - TestAutocomplete: Typeahead suggestion tests
     - TestProductOrdering: Ordering tests
+    - TestProductKeysetPagination: Cursor pagination tests
+    - TestProductFacets: Sidebar facet count tests
+    - TestCatalogCache: Versioned response cache tests
+    - TestConditionalGet: ETag / Last-Modified / 304 tests
+    - TestCategoryProductCount: Stored active_product_count tests
+    - TestProductImport: Bulk CSV/JSONL upsert tests
+    - TestCatalogExport: Streaming CSV/JSONL export tests
+    - TestImageDerivatives: Thumbnail generation and srcset tests
+    - TestAsyncCatalogViews: Async read endpoints under /api/async/
+    - TestGenerateCatalog: Synthetic catalog generator command
 
 Testing Strategy:
     - Use pytest fixtures for test data setup
@@ -16,13 +28,36 @@ Testing Strategy:
 pytest-django docs: https://pytest-django.readthedocs.io/
 """
 
+import csv
+import io
+from datetime import timedelta
 from decimal import Decimal
+from unittest import mock
 
 import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from prometheus_client import REGISTRY
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from cart.models import Cart
+from orders.models import Order, OrderItem
+from products import conditional
+from products.admin import ProductAdmin
+from products.cache import CACHE_STATUS_HEADER, get_catalog_version
+from products.checks import check_catalog_cache_backend
+from products.generator import GENERATED_PREFIX
+from products.images import update_derivatives
+from products.importer import import_products
 from products.models import Category, Product
 
 
@@ -31,6 +66,17 @@ from products.models import Category, Product
 # =============================================================================
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """
+    Start every test with an empty cache.
+
+    Test transactions are rolled back without firing post_delete, so
+    responses cached by an earlier test would otherwise still match.
+    """
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Return an unauthenticated API client."""
@@ -339,6 +385,147 @@ class TestProductFiltering:
             assert p["is_in_stock"] is True
 
 
+# =============================================================================
+# Full-Text Search Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestProductFullTextSearch:
+    """Tests for ranked full-text search (products/search.py)."""
+
+    @pytest.fixture
+    def description_match(self, category):
+        """Product mentioning 'laptop' only in its description."""
+        return Product.objects.create(
+            name="Carrying Sleeve",
+            slug="carrying-sleeve",
+            description="Padded sleeve that fits any laptop",
+            price=Decimal("29.99"),
+            category=category,
+            inventory_count=5,
+            is_active=True,
+        )
+
+    def test_name_match_ranks_above_description_match(
+        self, api_client, product, description_match
+    ):
+        """Name matches (weight A) come before description matches (weight B)."""
+        if connection.vendor != "postgresql":
+            pytest.skip("Weighted ranking requires PostgreSQL")
+
+        url = reverse("product-search")
+        response = api_client.get(url, {"q": "laptop"})
+
+        slugs = [p["slug"] for p in response.data]
+        assert slugs == ["test-laptop", "carrying-sleeve"]
+
+    def test_search_matches_word_stems(self, api_client, product):
+        """Stemming lets 'laptops' match a product named 'Laptop'."""
+        if connection.vendor != "postgresql":
+            pytest.skip("Stemming requires PostgreSQL")
+
+        url = reverse("product-search")
+        response = api_client.get(url, {"q": "laptops"})
+
+        assert [p["slug"] for p in response.data] == ["test-laptop"]
+
+    def test_websearch_syntax_excludes_terms(
+        self, api_client, product, description_match
+    ):
+        """A leading '-' excludes products containing that term."""
+        if connection.vendor != "postgresql":
+            pytest.skip("websearch_to_tsquery requires PostgreSQL")
+
+        url = reverse("product-search")
+        response = api_client.get(url, {"q": "laptop -sleeve"})
+
+        assert [p["slug"] for p in response.data] == ["test-laptop"]
+
+    def test_list_search_filter_orders_by_relevance(
+        self, api_client, product, description_match
+    ):
+        """?search= on the list endpoint returns the best match first."""
+        if connection.vendor != "postgresql":
+            pytest.skip("Weighted ranking requires PostgreSQL")
+
+        url = reverse("product-list")
+        response = api_client.get(url, {"search": "laptop"})
+
+        slugs = [p["slug"] for p in response.data["results"]]
+        assert slugs == ["test-laptop", "carrying-sleeve"]
+
+    def test_search_vector_follows_updates(self, api_client, product):
+        """Renaming a product updates what it can be found by."""
+        product.name = "Gaming Notebook"
+        product.save()
+
+        url = reverse("product-search")
+        response = api_client.get(url, {"q": "notebook"})
+
+        assert any(p["slug"] == "test-laptop" for p in response.data)
+
+    def test_search_vector_not_loaded(self, product):
+        """Product queries leave the tsvector column out of the SELECT."""
+        loaded = Product.objects.get(pk=product.pk)
+
+        assert "search_vector" in loaded.get_deferred_fields()
+
+
+# =============================================================================
+# Autocomplete Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestAutocomplete:
+    """Tests for GET /api/products/autocomplete/."""
+
+    def test_partial_word_matches_product_and_category(
+        self, api_client, product, category
+    ):
+        """A word prefix finds both products and categories."""
+        url = reverse("product-autocomplete")
+        response = api_client.get(url, {"q": "lapt"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["products"] == [
+            {"id": product.id, "slug": "test-laptop", "name": "Test Laptop"}
+        ]
+
+        response = api_client.get(url, {"q": "electro"})
+        assert [c["slug"] for c in response.data["categories"]] == ["electronics"]
+
+    def test_excludes_inactive_products(self, api_client, inactive_product):
+        """Inactive products are never suggested."""
+        url = reverse("product-autocomplete")
+        response = api_client.get(url, {"q": "inactive"})
+
+        assert response.data["products"] == []
+
+    def test_respects_limit(self, api_client, category):
+        """?limit= caps the number of suggestions per type."""
+        for i in range(5):
+            Product.objects.create(
+                name=f"Laptop Model {i}",
+                slug=f"laptop-model-{i}",
+                price=Decimal("10.00"),
+                category=category,
+            )
+
+        url = reverse("product-autocomplete")
+        response = api_client.get(url, {"q": "laptop", "limit": 3})
+
+        assert len(response.data["products"]) == 3
+
+    def test_requires_two_characters(self, api_client):
+        """Single-character queries are rejected."""
+        url = reverse("product-autocomplete")
+        response = api_client.get(url, {"q": "l"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 # =============================================================================
 # Product Ordering Tests
 # =============================================================================
@@ -415,3 +602,1010 @@ class TestProductOrdering:
 
         # The newest product should appear first
         assert response.data["results"][0]["slug"] == newer_product.slug
+
+
+# =============================================================================
+# Keyset Pagination Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestProductKeysetPagination:
+    """Tests for ?cursor= keyset pagination on the product list."""
+
+    @pytest.fixture
+    def many_products(self, category):
+        """Create 7 products where several share the same price."""
+        return [
+            Product.objects.create(
+                name=f"Product {i}",
+                slug=f"product-{i}",
+                price=Decimal("10.00") if i % 2 else Decimal("20.00"),
+                category=category,
+                inventory_count=1,
+            )
+            for i in range(7)
+        ]
+
+    def collect(self, api_client, params):
+        """Follow 'next' links from the first page and return all slugs."""
+        response = api_client.get(reverse("product-list"), params)
+        slugs = [p["slug"] for p in response.data["results"]]
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            assert response.status_code == status.HTTP_200_OK
+            slugs += [p["slug"] for p in response.data["results"]]
+        return slugs
+
+    def test_walks_every_product_exactly_once_with_ties(
+        self, api_client, many_products
+    ):
+        """Equal prices are tie-broken by id, so nothing is skipped or repeated."""
+        slugs = self.collect(
+            api_client, {"cursor": "", "ordering": "price", "page_size": 2}
+        )
+
+        expected = [
+            p.slug
+            for p in sorted(many_products, key=lambda p: (p.price, p.id))
+        ]
+        assert slugs == expected
+
+    def test_default_ordering_newest_first(self, api_client, many_products):
+        """Without ?ordering= pages follow the default -created_at order."""
+        slugs = self.collect(api_client, {"cursor": "", "page_size": 3})
+
+        assert slugs == [p.slug for p in reversed(many_products)]
+
+    def test_previous_link_returns_prior_page(self, api_client, many_products):
+        """Following 'previous' from page 2 returns page 1 again."""
+        url = reverse("product-list")
+        first = api_client.get(
+            url, {"cursor": "", "ordering": "-price", "page_size": 3}
+        )
+        second = api_client.get(first.data["next"])
+        back = api_client.get(second.data["previous"])
+
+        assert back.data["results"] == first.data["results"]
+
+    def test_count_is_opt_in(self, api_client, many_products):
+        """The total count is skipped unless ?count=true is sent."""
+        url = reverse("product-list")
+
+        response = api_client.get(url, {"cursor": ""})
+        assert "count" not in response.data
+
+        response = api_client.get(url, {"cursor": "", "count": "true"})
+        assert response.data["count"] == 7
+
+    def test_invalid_cursor_returns_404(self, api_client, many_products):
+        """Tampered cursors are rejected."""
+        url = reverse("product-list")
+        response = api_client.get(url, {"cursor": "not-a-cursor"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_search_with_cursor(self, api_client, many_products):
+        """Search results page on the first concrete field, not the rank."""
+        slugs = self.collect(
+            api_client, {"search": "product", "cursor": "", "page_size": 3}
+        )
+
+        assert slugs == [p.slug for p in reversed(many_products)]
+
+    def test_page_number_pagination_still_default(self, api_client, many_products):
+        """Without ?cursor= the response keeps the page-number format."""
+        response = api_client.get(reverse("product-list"))
+
+        assert response.data["count"] == 7
+
+
+# =============================================================================
+# Facet Count Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestProductFacets:
+    """Tests for GET /api/products/facets/."""
+
+    @pytest.fixture
+    def catalog(self, product, out_of_stock_product, second_category):
+        """Add a cheap in-stock book next to the two electronics products."""
+        return Product.objects.create(
+            name="Paperback Novel",
+            slug="paperback-novel",
+            price=Decimal("12.50"),
+            category=second_category,
+            inventory_count=4,
+        )
+
+    def test_unfiltered_counts(self, api_client, catalog):
+        """Without filters every facet counts the whole active catalog."""
+        response = api_client.get(reverse("product-facets"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total"] == 3
+        counts = {c["slug"]: c["count"] for c in response.data["categories"]}
+        assert counts == {"electronics": 2, "books": 1}
+        assert response.data["in_stock"] == 2
+        assert response.data["out_of_stock"] == 1
+        assert response.data["featured"] == 1
+        assert response.data["price_ranges"][0] == {
+            "min": "0.00",
+            "max": "25.00",
+            "count": 1,
+        }
+        assert response.data["price_ranges"][-1]["max"] is None
+
+    def test_facet_ignores_its_own_filter(self, api_client, catalog):
+        """?category= narrows the other facets but not the category facet."""
+        response = api_client.get(
+            reverse("product-facets"), {"category": "electronics"}
+        )
+
+        assert response.data["total"] == 2
+        counts = {c["slug"]: c["count"] for c in response.data["categories"]}
+        assert counts == {"electronics": 2, "books": 1}
+        assert response.data["in_stock"] == 1
+        assert response.data["out_of_stock"] == 1
+
+    def test_matches_list_endpoint(self, api_client, catalog):
+        """The total equals the list count for the same filters."""
+        params = {"in_stock": "true", "max_price": "100"}
+        facets = api_client.get(reverse("product-facets"), params)
+        listing = api_client.get(reverse("product-list"), params)
+
+        assert facets.data["total"] == listing.data["count"] == 1
+
+    def test_single_aggregate_query(
+        self, api_client, catalog, django_assert_num_queries
+    ):
+        """All counts come from one aggregate plus the category lookup."""
+        with django_assert_num_queries(2):
+            api_client.get(
+                reverse("product-facets"), {"category": "books", "featured": "true"}
+            )
+
+    def test_featured_filter_with_price_buckets(self, api_client, catalog):
+        """?featured= combines with the price buckets (no alias clash)."""
+        response = api_client.get(reverse("product-facets"), {"featured": "true"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total"] == 1
+        assert response.data["featured"] == 1
+        buckets = [bucket["count"] for bucket in response.data["price_ranges"]]
+        assert buckets[0] == 0
+        assert sum(buckets) == 1
+
+    def test_invalid_filter_returns_400(self, api_client, catalog):
+        """Malformed filter values are rejected like on the list endpoint."""
+        response = api_client.get(reverse("product-facets"), {"min_price": "abc"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# =============================================================================
+# Catalog Cache Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestCatalogCache:
+    """Tests for the versioned anonymous response cache."""
+
+    def test_second_request_is_a_hit(self, api_client, product):
+        """Repeated anonymous reads are served from the cache."""
+        url = reverse("product-list")
+
+        first = api_client.get(url)
+        second = api_client.get(url)
+
+        assert first[CACHE_STATUS_HEADER] == "MISS"
+        assert second[CACHE_STATUS_HEADER] == "HIT"
+        assert second.data == first.data
+
+    def test_lookups_counted(self, api_client, product):
+        """Hits and misses are counted in cache_lookups_total."""
+
+        def count(result):
+            value = REGISTRY.get_sample_value(
+                "cache_lookups_total", {"cache": "catalog", "result": result}
+            )
+            return value or 0
+
+        url = reverse("product-list")
+        hits, misses = count("hit"), count("miss")
+
+        api_client.get(url)
+        api_client.get(url)
+
+        assert count("miss") == misses + 1
+        assert count("hit") == hits + 1
+
+    def test_query_param_order_is_normalized(self, api_client, product):
+        """Parameter order doesn't create separate cache entries."""
+        url = reverse("product-list")
+        api_client.get(f"{url}?ordering=price&in_stock=true")
+        response = api_client.get(f"{url}?in_stock=true&ordering=price")
+
+        assert response[CACHE_STATUS_HEADER] == "HIT"
+
+    def test_save_invalidates(self, api_client, product):
+        """Saving a product bumps the version and drops cached responses."""
+        url = reverse("product-detail", kwargs={"slug": product.slug})
+        api_client.get(url)
+
+        product.price = Decimal("10.00")
+        product.save()
+        response = api_client.get(url)
+
+        assert response[CACHE_STATUS_HEADER] == "MISS"
+        assert response.data["price"] == "10.00"
+
+    def test_category_delete_invalidates_category_list(
+        self, api_client, category, second_category
+    ):
+        """Deleting a category removes it from the cached list."""
+        url = reverse("category-list")
+        api_client.get(url)
+
+        second_category.delete()
+        response = api_client.get(url)
+
+        slugs = [c["slug"] for c in response.data["results"]]
+        assert slugs == ["electronics"]
+
+    def test_deploy_check_rejects_process_local_cache(self, settings):
+        """check --deploy fails while the catalog cache uses locmem."""
+        settings.CATALOG_CACHE_TIMEOUT = 300
+        errors = check_catalog_cache_backend(None)
+
+        assert [error.id for error in errors] == ["products.E001"]
+
+        settings.CATALOG_CACHE_TIMEOUT = 0
+        assert check_catalog_cache_backend(None) == []
+
+    def test_admin_bulk_action_invalidates(self, api_client, product, rf):
+        """queryset.update() in admin actions still invalidates the cache."""
+        url = reverse("product-featured")
+        assert len(api_client.get(url).data) == 1
+
+        model_admin = ProductAdmin(Product, None)
+        model_admin.message_user = lambda *args, **kwargs: None
+        model_admin.remove_featured(rf.get("/"), Product.objects.all())
+
+        response = api_client.get(url)
+        assert response[CACHE_STATUS_HEADER] == "MISS"
+        assert response.data == []
+
+    def test_authenticated_requests_bypass_cache(self, api_client, product):
+        """Logged-in users always get a fresh, uncached response."""
+        user = get_user_model().objects.create_user(
+            email="shopper@example.com", password="testpass123"
+        )
+        api_client.force_authenticate(user=user)
+
+        api_client.get(reverse("product-list"))
+        response = api_client.get(reverse("product-list"))
+
+        assert CACHE_STATUS_HEADER not in response
+
+
+# =============================================================================
+# Conditional GET Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Tests for ETag/Last-Modified validators and 304 responses."""
+
+    def test_detail_has_validators(self, api_client, product):
+        """Product detail responses carry ETag and Last-Modified."""
+        url = reverse("product-detail", kwargs={"slug": product.slug})
+        response = api_client.get(url)
+
+        assert response["ETag"].startswith('"')
+        assert "Last-Modified" in response
+        assert "no-cache" in response["Cache-Control"]
+
+    def test_matching_etag_returns_304(self, api_client, product):
+        """If-None-Match with the current ETag short-circuits to 304."""
+        url = reverse("product-detail", kwargs={"slug": product.slug})
+        etag = api_client.get(url)["ETag"]
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    def test_if_modified_since_returns_304(self, api_client, category):
+        """If-Modified-Since at or after Last-Modified short-circuits."""
+        url = reverse("category-detail", kwargs={"slug": category.slug})
+        last_modified = api_client.get(url)["Last-Modified"]
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_update_changes_etag(self, api_client, product):
+        """Saving the product produces a new ETag."""
+        url = reverse("product-detail", kwargs={"slug": product.slug})
+        etag = api_client.get(url)["ETag"]
+
+        product.price = Decimal("5.00")
+        product.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_list_etag_tracks_deletions(
+        self, api_client, product, out_of_stock_product
+    ):
+        """Deleting a row changes the list ETag even if MAX(updated_at) doesn't."""
+        url = reverse("product-list")
+        etag = api_client.get(url)["ETag"]
+
+        product.delete()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_etag_depends_on_query(self, api_client, product):
+        """Different filters or pages get different ETags."""
+        url = reverse("product-list")
+
+        assert (
+            api_client.get(url)["ETag"]
+            != api_client.get(url, {"in_stock": "true"})["ETag"]
+        )
+
+    @pytest.mark.parametrize("url_name", ["product-list", "category-list"])
+    def test_list_validators_cost_no_query_with_shared_cache(
+        self, api_client, product, url_name, django_assert_num_queries
+    ):
+        """With a shared cache, list ETags come from the catalog version."""
+        url = reverse(url_name)
+        with mock.patch.object(conditional, "is_cache_shared", return_value=True):
+            etag = api_client.get(url)["ETag"]
+
+            with django_assert_num_queries(0):
+                cached = api_client.get(url)
+                not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert cached[CACHE_STATUS_HEADER] == "HIT"
+        assert cached["ETag"] == etag
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.parametrize("url_name", ["product-list", "category-list"])
+    def test_list_validators_from_database_with_local_cache(
+        self, api_client, product, url_name, django_assert_num_queries
+    ):
+        """With a per-process cache, a 304 costs one aggregate query."""
+        url = reverse(url_name)
+        etag = api_client.get(url)["ETag"]
+
+        with django_assert_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_category_list_etag_tracks_product_count(
+        self, api_client, category, product
+    ):
+        """A new product changes its category's product_count and ETag."""
+        url = reverse("category-list")
+        etag = api_client.get(url)["ETag"]
+
+        Product.objects.create(
+            name="Tablet", slug="tablet", price="299.99", category=category
+        )
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["product_count"] == 2
+
+
+# =============================================================================
+# Stored Category Product Count Tests
+# =============================================================================
+
+
+def stored_count(category):
+    """Read a category's stored count straight from the database."""
+    return Category.objects.values_list(
+        "active_product_count", flat=True
+    ).get(pk=category.pk)
+
+
+@pytest.mark.django_db
+class TestCategoryProductCount:
+    """Test that Category.active_product_count follows product writes."""
+
+    def test_create_and_delete(self, category, product, inactive_product):
+        """Only active products count; deleting one decrements."""
+        assert stored_count(category) == 1
+
+        product.delete()
+
+        assert stored_count(category) == 0
+
+    def test_activate_deactivate_and_move(
+        self, category, second_category, product
+    ):
+        """Saving is_active or category changes adjusts the right rows."""
+        product.is_active = False
+        product.save()
+        assert stored_count(category) == 0
+
+        product.is_active = True
+        product.category = second_category
+        product.save()
+        assert stored_count(category) == 0
+        assert stored_count(second_category) == 1
+
+    def test_unrelated_update_fields_skip_lookup(
+        self, product, django_assert_num_queries
+    ):
+        """Saves that can't change the counts cost no extra query."""
+        product.inventory_count = 3
+
+        with django_assert_num_queries(1):
+            product.save(update_fields=["inventory_count", "updated_at"])
+
+    def test_unchanged_counted_fields_skip_lookup(
+        self, product, django_assert_num_queries
+    ):
+        """A full save that keeps category and is_active is one UPDATE."""
+        loaded = Product.objects.get(pk=product.pk)
+        loaded.price = Decimal("5.00")
+
+        with django_assert_num_queries(1):
+            loaded.save()
+
+    def test_stale_category_save_keeps_count(self, category):
+        """Saving a loaded category never overwrites the stored count."""
+        stale = Category.objects.get(pk=category.pk)
+        Product.objects.create(
+            name="Tablet", slug="tablet", price="299.99", category=category
+        )
+
+        stale.description = "Updated"
+        stale.save()
+
+        assert stored_count(category) == 1
+        assert stale.active_product_count == 0
+        stale.refresh_from_db()
+        assert stale.description == "Updated"
+
+    def test_admin_bulk_actions(self, category, product, inactive_product, rf):
+        """Bulk (de)activation only counts the rows it flips."""
+        model_admin = ProductAdmin(Product, None)
+        model_admin.message_user = lambda *args, **kwargs: None
+
+        model_admin.make_active(rf.get("/"), Product.objects.all())
+        assert stored_count(category) == 2
+
+        model_admin.make_inactive(rf.get("/"), Product.objects.all())
+        assert stored_count(category) == 0
+
+    def test_recount_command(self, category, second_category, product):
+        """recount_categories repairs counts changed behind the signals."""
+        Category.objects.update(active_product_count=7)
+
+        call_command("recount_categories", batch_size=1)
+
+        assert stored_count(category) == 1
+        assert stored_count(second_category) == 0
+
+    def test_category_list_does_not_count(
+        self, api_client, category, product, django_assert_num_queries
+    ):
+        """The category list reads the stored column: no COUNT per row."""
+        url = reverse("category-list")
+
+        with django_assert_num_queries(3):
+            # Validators aggregate, pagination COUNT, category page
+            response = api_client.get(url)
+
+        assert response.data["results"][0]["product_count"] == 1
+
+
+# =============================================================================
+# Bulk Import Tests
+# =============================================================================
+
+IMPORT_CSV = """slug,name,price,category,inventory_count,featured
+test-laptop,Test Laptop Pro,1099.00,electronics,4,
+new-phone,New Phone,499.00,books,,true
+bad-price,Bad Price,0,electronics,1,
+x,AB,10.00,missing,1,
+"""
+
+
+@pytest.mark.django_db
+class TestProductImport:
+    """Test bulk product import (command helper and admin endpoint)."""
+
+    def test_csv_creates_updates_and_reports(
+        self, category, second_category, product
+    ):
+        """Valid rows are upserted by slug; invalid rows are reported."""
+        report = import_products(io.StringIO(IMPORT_CSV), "csv", batch_size=2)
+
+        assert report["rows"] == 4
+        assert (report["created"], report["updated"], report["failed"]) == (
+            1,
+            1,
+            2,
+        )
+        assert [error["row"] for error in report["errors"]] == [3, 4]
+        assert "price" in report["errors"][0]["errors"]
+        assert set(report["errors"][1]["errors"]) == {"name", "category"}
+
+        product.refresh_from_db()
+        assert product.name == "Test Laptop Pro"
+        assert product.price == Decimal("1099.00")
+        new_phone = Product.objects.get(slug="new-phone")
+        assert new_phone.category == second_category
+        assert new_phone.inventory_count == 0
+        assert new_phone.featured is True
+
+    def test_import_updates_category_counts(
+        self, category, second_category, product
+    ):
+        """Categories gained and lost by the import are recounted."""
+        feed = (
+            '{"slug": "test-laptop", "name": "Test Laptop", '
+            '"price": "999.99", "category": "books"}\n'
+        )
+
+        import_products(io.StringIO(feed), "jsonl")
+
+        counts = dict(
+            Category.objects.values_list("slug", "active_product_count")
+        )
+        assert counts == {"electronics": 0, "books": 1}
+
+    def test_partial_reimport_keeps_missing_columns(self, category, product):
+        """Columns missing from the feed keep their stored values."""
+        feed = "slug,name,price,category\ntest-laptop,Test Laptop,899.00,electronics\n"
+
+        report = import_products(io.StringIO(feed), "csv")
+
+        assert report["updated"] == 1
+        product.refresh_from_db()
+        assert product.price == Decimal("899.00")
+        assert product.inventory_count == 10
+        assert product.is_active is True
+        assert product.featured is True
+
+    def test_duplicate_slug_in_chunk_reported(self, category):
+        """The earlier of two rows with one slug is reported as a duplicate."""
+        feed = (
+            "slug,name,price,category\n"
+            "mouse,Old Mouse,9.99,electronics\n"
+            "mouse,New Mouse,19.99,electronics\n"
+        )
+
+        report = import_products(io.StringIO(feed), "csv")
+
+        assert (report["rows"], report["created"], report["duplicates"]) == (
+            2,
+            1,
+            1,
+        )
+        assert report["errors"] == [
+            {"row": 1, "errors": {"slug": ["Replaced by row 2 (same slug)."]}}
+        ]
+        assert Product.objects.get(slug="mouse").name == "New Mouse"
+
+    def test_jsonl_reports_unparseable_lines(self, category):
+        """Broken JSON lines are reported without stopping the import."""
+        feed = (
+            "not json\n"
+            '{"slug": "mouse", "name": "Mouse", "price": "19.99", '
+            '"category": "electronics"}\n'
+        )
+
+        report = import_products(io.StringIO(feed), "jsonl")
+
+        assert report["created"] == 1
+        assert report["errors"][0]["row"] == 1
+
+    def test_import_endpoint_requires_admin(self, api_client, category):
+        """Only admin users can import products."""
+        url = reverse("product-import-products")
+        upload = io.BytesIO(IMPORT_CSV.encode())
+        upload.name = "feed.csv"
+
+        response = api_client.post(url, {"file": upload}, format="multipart")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_import_endpoint(self, api_client, category, second_category):
+        """Admins upload a feed and get the report back."""
+        admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="adminpass123"
+        )
+        api_client.force_authenticate(user=admin)
+        url = reverse("product-import-products")
+        upload = io.BytesIO(IMPORT_CSV.encode())
+        upload.name = "feed.csv"
+
+        response = api_client.post(url, {"file": upload}, format="multipart")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["created"] == 2
+        assert response.data["failed"] == 2
+        assert Product.objects.filter(slug="test-laptop").exists()
+
+
+# =============================================================================
+# Catalog Export Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestCatalogExport:
+    """Test streaming product exports."""
+
+    def test_export_catalog_since(self, product, out_of_stock_product, tmp_path):
+        """--since exports only products updated at or after that time."""
+        since = timezone.now() - timedelta(hours=1)
+        Product.objects.filter(pk=product.pk).update(
+            updated_at=since - timedelta(days=1)
+        )
+        path = tmp_path / "products.csv"
+
+        call_command("export_catalog", since=since, output=str(path))
+
+        rows = list(csv.DictReader(path.open()))
+        assert [row["slug"] for row in rows] == ["out-of-stock-item"]
+        assert rows[0]["category__slug"] == "electronics"
+
+    def test_admin_export_action_streams(self, product, inactive_product, rf):
+        """The admin action streams every selected product, active or not."""
+        model_admin = ProductAdmin(Product, None)
+
+        response = model_admin.export_csv(rf.get("/"), Product.objects.all())
+
+        assert response.streaming
+        rows = list(
+            csv.DictReader(
+                io.StringIO(b"".join(response.streaming_content).decode())
+            )
+        )
+        assert {row["slug"] for row in rows} == {
+            "test-laptop",
+            "inactive-product",
+        }
+
+
+# =============================================================================
+# Image Derivative Tests
+# =============================================================================
+
+
+def make_image(width, height, name="photo.png"):
+    """Return an uploaded PNG of the given size."""
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 255)).save(output, "PNG")
+    return SimpleUploadedFile(name, output.getvalue(), content_type="image/png")
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    """Store uploads in a temporary directory and generate inline."""
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_DERIVATIVE_WIDTHS = [200, 400, 800]
+    settings.IMAGE_DERIVATIVE_WORKERS = 0
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestImageDerivatives:
+    """Test pre-generated thumbnails and the srcset fields."""
+
+    def test_upload_generates_derivatives(
+        self, api_client, category, media_root, django_capture_on_commit_callbacks
+    ):
+        """Saving an image writes WebP and JPEG copies at every width."""
+        with django_capture_on_commit_callbacks(execute=True):
+            product = Product.objects.create(
+                name="Camera",
+                slug="camera",
+                price="199.00",
+                category=category,
+                image=make_image(1000, 500),
+            )
+
+        product.refresh_from_db()
+        variants = product.image_variants
+        assert variants["source"] == product.image.name
+        assert sorted(variants["webp"], key=int) == ["200", "400", "800"]
+        with default_storage.open(variants["jpeg"]["400"]) as derivative:
+            assert Image.open(derivative).size == (400, 200)
+
+        response = api_client.get(reverse("product-list"))
+        srcset = response.data["results"][0]["image_srcset"]
+        assert set(srcset) == {"webp", "jpeg"}
+        assert srcset["webp"].startswith("http://testserver/media/derivatives/")
+        assert srcset["webp"].endswith("800w")
+
+    def test_small_images_are_not_upscaled(
+        self, category, media_root, django_capture_on_commit_callbacks
+    ):
+        """Widths above the original are capped at its width."""
+        with django_capture_on_commit_callbacks(execute=True):
+            category.image = make_image(150, 150)
+            category.save()
+
+        category.refresh_from_db()
+        assert list(category.image_variants["webp"]) == ["150"]
+
+    def test_category_detail_has_srcset(
+        self, api_client, category, media_root, django_capture_on_commit_callbacks
+    ):
+        """The category detail exposes image_srcset like the list does."""
+        with django_capture_on_commit_callbacks(execute=True):
+            category.image = make_image(600, 300)
+            category.save()
+
+        response = api_client.get(reverse("category-detail", args=[category.slug]))
+
+        assert set(response.data["image_srcset"]) == {"webp", "jpeg"}
+
+    @pytest.mark.parametrize("cleared", ["", None])
+    def test_removing_image_deletes_derivatives(
+        self, category, media_root, cleared, django_capture_on_commit_callbacks
+    ):
+        """Clearing the image (to "" or NULL) drops the variants and files."""
+        with django_capture_on_commit_callbacks(execute=True):
+            category.image = make_image(300, 300)
+            category.save()
+        category.refresh_from_db()
+        derivative = category.image_variants["webp"]["200"]
+
+        Category.objects.filter(pk=category.pk).update(image=cleared)
+        update_derivatives(Category, category.pk)
+
+        category.refresh_from_db()
+        assert category.image_variants == {}
+        assert not default_storage.exists(derivative)
+
+    def test_no_image_has_empty_srcset(self, api_client, product):
+        """Products without an image expose an empty map."""
+        response = api_client.get(reverse("product-detail", args=[product.slug]))
+
+        assert response.data["image_srcset"] == {}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_command_generates_missing_derivatives(category, media_root):
+    """generate_image_derivatives fills in images saved without signals."""
+    name = default_storage.save("products/old.png", make_image(600, 300))
+    product = Product.objects.create(
+        name="Old Photo", slug="old-photo", price="5.00", category=category
+    )
+    other = Product.objects.create(
+        name="Older Photo", slug="older-photo", price="5.00", category=category
+    )
+    Product.objects.filter(pk__in=[product.pk, other.pk]).update(image=name)
+    version = get_catalog_version()
+
+    call_command("generate_image_derivatives", workers=2)
+
+    product.refresh_from_db()
+    assert sorted(product.image_variants["jpeg"], key=int) == ["200", "400", "600"]
+    # One invalidation for the whole run (bumped now and on commit), not
+    # one per image
+    assert get_catalog_version() == version + 2
+
+
+# =============================================================================
+# Async Catalog View Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestAsyncCatalogViews:
+    """The async read endpoints return the same payloads as the DRF ones."""
+
+    def test_product_list_matches_sync(
+        self, api_client, product, out_of_stock_product, inactive_product
+    ):
+        """Same count and results, in the same order."""
+        expected = api_client.get(reverse("product-list")).json()
+        response = api_client.get(reverse("async-product-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["count"] == expected["count"] == 2
+        assert data["results"] == expected["results"]
+        assert data["next"] is None and data["previous"] is None
+
+    def test_product_list_filters_and_ordering(
+        self, api_client, product, out_of_stock_product, second_category
+    ):
+        """Filters and ?ordering= behave like the DRF list."""
+        Product.objects.create(
+            name="Novel",
+            slug="novel",
+            price="15.00",
+            category=second_category,
+            inventory_count=3,
+        )
+        url = reverse("async-product-list")
+
+        by_price = api_client.get(f"{url}?ordering=price").json()["results"]
+        books = api_client.get(f"{url}?category=books").json()["results"]
+        in_stock = api_client.get(f"{url}?in_stock=true&ordering=-price").json()
+
+        assert [p["slug"] for p in by_price] == [
+            "novel",
+            "out-of-stock-item",
+            "test-laptop",
+        ]
+        assert [p["slug"] for p in books] == ["novel"]
+        assert [p["slug"] for p in in_stock["results"]] == ["test-laptop", "novel"]
+
+    def test_product_list_pages(self, api_client, category):
+        """Page links match the DRF envelope; unknown pages are 404."""
+        for i in range(13):
+            Product.objects.create(
+                name=f"Item {i}", slug=f"item-{i}", price="1.00", category=category
+            )
+        url = reverse("async-product-list")
+
+        first = api_client.get(url).json()
+        second = api_client.get(first["next"]).json()
+
+        assert first["count"] == 13
+        assert len(first["results"]) == 12
+        assert first["next"].endswith("?page=2")
+        assert len(second["results"]) == 1
+        assert second["next"] is None
+        assert second["previous"].endswith(url)
+        assert api_client.get(f"{url}?page=3").status_code == 404
+        assert api_client.get(f"{url}?page=x").status_code == 404
+
+    def test_invalid_filter(self, api_client, product):
+        """Invalid filter values are a 400 with per-field errors."""
+        response = api_client.get(f"{reverse('async-product-list')}?min_price=abc")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "min_price" in response.json()
+
+    def test_product_list_queries(
+        self, api_client, product, out_of_stock_product, django_assert_num_queries
+    ):
+        """A count and one joined page query; none once cached."""
+        url = reverse("async-product-list")
+
+        with django_assert_num_queries(2):
+            first = api_client.get(url)
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+
+        assert first[CACHE_STATUS_HEADER] == "MISS"
+        assert second[CACHE_STATUS_HEADER] == "HIT"
+        assert first.json() == second.json()
+
+    def test_product_detail_matches_sync(self, api_client, product):
+        """Same payload as GET /api/products/{slug}/."""
+        expected = api_client.get(reverse("product-detail", args=[product.slug]))
+        response = api_client.get(
+            reverse("async-product-detail", args=[product.slug])
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected.json()
+
+    def test_inactive_product_detail_is_404(self, api_client, inactive_product):
+        """Inactive products are hidden, as in the DRF view."""
+        response = api_client.get(
+            reverse("async-product-detail", args=[inactive_product.slug])
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {"detail": "Not found."}
+
+    def test_featured_matches_sync(self, api_client, product, out_of_stock_product):
+        """Only featured products, as in the DRF action."""
+        expected = api_client.get(reverse("product-featured")).json()
+        response = api_client.get(reverse("async-product-featured"))
+
+        assert response.json() == expected
+        assert [p["slug"] for p in expected] == ["test-laptop"]
+
+    def test_category_list_matches_sync(self, api_client, category, second_category):
+        """Same categories and counts as GET /api/categories/."""
+        expected = api_client.get(reverse("category-list")).json()
+        response = api_client.get(reverse("async-category-list"))
+
+        assert response.json()["results"] == expected["results"]
+        assert response.json()["count"] == 2
+
+    def test_catalog_writes_invalidate(self, api_client, product):
+        """Async responses share the catalog cache version."""
+        url = reverse("async-product-detail", args=[product.slug])
+        api_client.get(url)
+
+        product.price = Decimal("10.00")
+        product.save()
+        response = api_client.get(url)
+
+        assert response[CACHE_STATUS_HEADER] == "MISS"
+        assert response.json()["price"] == "10.00"
+
+    def test_read_only(self, api_client):
+        """Writes are not allowed on the async endpoints."""
+        response = api_client.post(reverse("async-product-list"), {})
+
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+# =============================================================================
+# Synthetic Catalog Generator Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestGenerateCatalog:
+    """Test the generate_catalog command (products/generator.py)."""
+
+    def generate(self, **options):
+        """Run generate_catalog at a tiny scale."""
+        sizes = {"products": 300, "users": 30, "carts": 10, "orders": 60}
+        call_command("generate_catalog", **sizes, **options, stdout=io.StringIO())
+
+    def snapshot(self):
+        """Generated products as comparable tuples."""
+        return list(
+            Product.objects.filter(slug__startswith=GENERATED_PREFIX)
+            .order_by("slug")
+            .values_list("slug", "name", "price", "inventory_count", "category__slug")
+        )
+
+    def test_creates_rows(self):
+        """Every model gets rows, with counts kept consistent."""
+        self.generate()
+
+        assert Product.objects.count() == 300
+        assert Category.objects.count() == 10
+        assert Cart.objects.count() == 10
+        assert Order.objects.count() == 60
+        assert OrderItem.objects.count() >= 60
+        assert sum(
+            Category.objects.values_list("active_product_count", flat=True)
+        ) == Product.objects.filter(is_active=True).count()
+
+    def test_realistic_distributions(self):
+        """Skewed category sizes, stock-outs and items only from active products."""
+        self.generate()
+
+        sizes = sorted(
+            Category.objects.values_list("active_product_count", flat=True)
+        )
+        assert sizes[-1] > 3 * sizes[0]
+        assert Product.objects.filter(inventory_count=0).exists()
+        assert not OrderItem.objects.filter(product__is_active=False).exists()
+
+    def test_same_seed_same_rows(self):
+        """--seed makes the data reproducible."""
+        self.generate(seed=7)
+        first = self.snapshot()
+
+        self.generate(seed=7, flush=True)
+
+        assert self.snapshot() == first
+
+    def test_refuses_to_duplicate(self):
+        """A second run without --flush fails instead of clashing on slugs."""
+        self.generate()
+
+        with pytest.raises(CommandError, match="--flush"):
+            self.generate()
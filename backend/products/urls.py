@@ -11,6 +11,8 @@ Generated URLs:
     /api/products/{slug}/       -> ProductViewSet (retrieve, update, destroy)
     /api/products/featured/     -> ProductViewSet.featured()
     /api/products/search/       -> ProductViewSet.search()
+    /api/products/autocomplete/ -> ProductViewSet.autocomplete()
+    /api/products/facets/       -> ProductViewSet.facets()
     /api/categories/            -> CategoryViewSet (list)
     /api/categories/{slug}/     -> CategoryViewSet (retrieve)
 
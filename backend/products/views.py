@@ -8,29 +8,53 @@ Permission Strategy:
     - Anyone (including unauthenticated users) can read products/categories
     - Only admin users can create, update, or delete products
 
+Caching:
+    Anonymous category list and product list/detail/featured responses are
+    served from the versioned catalog cache (see products/cache.py).
+    Product and category list/detail responses carry an ETag (details
+    also Last-Modified) and answer matching conditional requests with 304
+    (see products/conditional.py).
+
 ViewSet docs: https://www.django-rest-framework.org/api-guide/viewsets/
 """
 
-from django.db import models
-from django.db.models import Count
+import io
+
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import (
     OpenApiParameter,
+    OpenApiResponse,
     extend_schema,
     extend_schema_view,
 )
-from rest_framework import filters, status, viewsets
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
-from .filters import ProductFilter
+from config.pagination import PageNumberOrKeysetPagination
+
+from .cache import cache_catalog_response
+from .conditional import (
+    conditional_catalog_response,
+    get_list_state,
+    get_queryset_state,
+)
+from .facets import compute_facets
+from .filters import ProductFilter, ProductOrderingFilter
+from .importer import get_format, import_products
 from .models import Category, Product
+from .search import RANK_ANNOTATION, autocomplete, search_products
 from .serializers import (
+    AutocompleteSerializer,
     CategoryDetailSerializer,
     CategorySerializer,
     ProductCreateUpdateSerializer,
     ProductDetailSerializer,
+    ProductFacetsSerializer,
+    ProductImportReportSerializer,
     ProductListSerializer,
 )
 
@@ -77,30 +101,32 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
             return CategoryDetailSerializer
         return CategorySerializer
 
-    def get_queryset(self):
-        """
-        Annotate categories with product count for efficiency.
+    def get_detail_state(self, request, *args, **kwargs):
+        """Validators for one category and its nested products."""
+        return get_queryset_state(
+            self.queryset.filter(slug=kwargs[self.lookup_field]),
+            timestamp_fields=("updated_at", "products__updated_at"),
+            count_fields=("id", "products"),
+        )
 
-        Using Django's Count annotation instead of the model property
-        avoids N+1 queries: one query for all categories + counts,
-        instead of one query per category to count products.
+    @conditional_catalog_response(get_list_state)
+    @cache_catalog_response
+    def list(self, request, *args, **kwargs):
+        """List categories (cached for anonymous users)."""
+        return super().list(request, *args, **kwargs)
 
-        Note: We use 'annotated_product_count' instead of 'product_count'
-        to avoid conflicting with the @property on the model.
-        """
-        return super().get_queryset().annotate(
-            annotated_product_count=Count(
-                "products",
-                filter=models.Q(products__is_active=True),
-            )
-        )
+    @conditional_catalog_response(get_detail_state)
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a category with its products."""
+        return super().retrieve(request, *args, **kwargs)
 
 
 @extend_schema_view(
     list=extend_schema(
         summary="List products",
         description=(
-            "Returns paginated list of active products with filtering support."
+            "Returns paginated list of active products with filtering support. "
+            "Send ?cursor= to switch from page numbers to keyset pagination."
         ),
         parameters=[
             OpenApiParameter(
@@ -163,19 +189,36 @@ class ProductViewSet(viewsets.ModelViewSet):
     Custom Actions:
         GET /api/products/featured/        -> Featured products
         GET /api/products/search/?q=term   -> Search products
+        GET /api/products/autocomplete/?q=lap -> Typeahead suggestions
+        GET /api/products/facets/          -> Sidebar facet counts
+        POST /api/products/import/         -> Bulk CSV/JSONL upsert (admin only)
     """
 
     queryset = Product.objects.filter(is_active=True)
     lookup_field = "slug"
 
     # Filter backends: DjangoFilterBackend for custom filters, OrderingFilter for sorting
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    # (ProductOrderingFilter also ranks ?search= results by relevance)
+    filter_backends = [DjangoFilterBackend, ProductOrderingFilter]
     filterset_class = ProductFilter
 
     # Fields that can be used for ordering via ?ordering=price or ?ordering=-price
     ordering_fields = ["price", "name", "created_at"]
     ordering = ["-created_at"]  # Default ordering: newest first
 
+    # ?page=N by default; ?cursor= switches to keyset pagination, which
+    # avoids OFFSET scans and COUNT(*) on deep pages (see config/pagination.py)
+    pagination_class = PageNumberOrKeysetPagination
+
+    # Database list validators also cover the nested category's
+    # product_count (see products/conditional.py)
+    list_timestamp_fields = ("updated_at", "category__updated_at")
+
+    # Detail responses show inventory_count, so their cache keys carry the
+    # product's stock version and checkouts only invalidate those entries
+    # (see products/cache.py)
+    cache_by_stock_version = True
+
     def get_serializer_class(self):
         """
         Select serializer based on action.
@@ -198,7 +241,13 @@ class ProductViewSet(viewsets.ModelViewSet):
         Read operations (list, retrieve, featured, search) are public.
         Write operations (create, update, delete) require admin.
         """
-        if self.action in ["create", "update", "partial_update", "destroy"]:
+        if self.action in [
+            "create",
+            "update",
+            "partial_update",
+            "destroy",
+            "import_products",
+        ]:
             return [IsAdminUser()]
         return [IsAuthenticatedOrReadOnly()]
 
@@ -212,11 +261,31 @@ class ProductViewSet(viewsets.ModelViewSet):
         """
         return super().get_queryset().select_related("category")
 
+    def get_detail_state(self, request, *args, **kwargs):
+        """Validators for one product and its nested category."""
+        return get_queryset_state(
+            self.get_queryset().filter(slug=kwargs[self.lookup_field]),
+            timestamp_fields=("updated_at", "category__updated_at"),
+        )
+
+    @conditional_catalog_response(get_list_state)
+    @cache_catalog_response
+    def list(self, request, *args, **kwargs):
+        """List products (cached for anonymous users)."""
+        return super().list(request, *args, **kwargs)
+
+    @conditional_catalog_response(get_detail_state)
+    @cache_catalog_response
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a product (cached for anonymous users)."""
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Get featured products",
         description="Returns up to 8 featured products for homepage display.",
     )
     @action(detail=False, methods=["get"])
+    @cache_catalog_response
     def featured(self, request):
         """
         GET /api/products/featured/
@@ -247,8 +316,9 @@ class ProductViewSet(viewsets.ModelViewSet):
         """
         GET /api/products/search/?q=laptop
 
-        Simple search endpoint that searches across name and description.
-        For advanced search at scale, consider Elasticsearch.
+        Full-text search across name and description, most relevant first.
+        Supports web-search syntax: "exact phrase", or, -exclude.
+        See products/search.py for the PostgreSQL and fallback paths.
         """
         query = request.query_params.get("q", "").strip()
 
@@ -264,12 +334,146 @@ class ProductViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        products = self.get_queryset().filter(
-            models.Q(name__icontains=query)
-            | models.Q(description__icontains=query)
+        products = search_products(self.get_queryset(), query).order_by(
+            f"-{RANK_ANNOTATION}", "-created_at"
         )[:20]  # Limit results for performance
 
         serializer = ProductListSerializer(
             products, many=True, context={"request": request}
         )
         return Response(serializer.data)
+
+    @extend_schema(
+        summary="Autocomplete products and categories",
+        description=(
+            "Typeahead suggestions for the search box. Returns only "
+            "id/slug/name for matching products and categories, "
+            "ranked by trigram similarity."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                description="Partial search input (minimum 2 characters)",
+                required=True,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description="Maximum suggestions per type (default 8, max 20)",
+                type=int,
+            ),
+        ],
+        responses={200: AutocompleteSerializer},
+    )
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        """
+        GET /api/products/autocomplete/?q=lap
+
+        Called on every keypress, so it avoids everything the search
+        endpoint does that a dropdown doesn't need: no select_related,
+        no model instances, no nested serializers - just values() rows
+        served from the pg_trgm GIN indexes.
+        """
+        query = request.query_params.get("q", "").strip()
+
+        if len(query) < 2:
+            return Response(
+                {"error": "Query must be at least 2 characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = int(request.query_params.get("limit", 8))
+        except ValueError:
+            limit = 8
+        limit = max(1, min(limit, 20))
+
+        return Response(
+            {
+                "products": autocomplete(
+                    Product.objects.filter(is_active=True), query, limit
+                ),
+                "categories": autocomplete(
+                    Category.objects.filter(is_active=True), query, limit
+                ),
+            }
+        )
+
+    @extend_schema(
+        summary="Get facet counts",
+        description=(
+            "Per-category, stock, featured and price-range counts for the "
+            "current filters (same query parameters as the list endpoint). "
+            "Each facet ignores its own filter so every option shows how "
+            "many products selecting it would return."
+        ),
+        responses={200: ProductFacetsSerializer},
+    )
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        GET /api/products/facets/?category=books&min_price=10
+
+        Replaces one request per sidebar option with a single aggregate
+        query (plus one to list the active categories).
+        """
+        queryset = Product.objects.filter(is_active=True)
+        filterset = ProductFilter(
+            request.query_params, queryset=queryset, request=request
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        data = filterset.form.cleaned_data
+
+        # Search narrows every facet; it has no facet of its own
+        if data.get("search"):
+            queryset = search_products(queryset, data["search"].strip())
+
+        categories = list(
+            Category.objects.filter(is_active=True).only("id", "slug", "name")
+        )
+        return Response(compute_facets(queryset, data, categories))
+
+    @extend_schema(
+        summary="Bulk import products",
+        description=(
+            "Upload a CSV or JSON Lines feed as multipart field 'file' "
+            "(admin only). Rows are upserted by slug in chunks; invalid rows "
+            "are skipped and reported by row number. For very large feeds "
+            "use the import_products management command instead."
+        ),
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            }
+        },
+        responses={
+            200: ProductImportReportSerializer,
+            400: OpenApiResponse(description="Missing file or unknown format"),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+    )
+    def import_products(self, request):
+        """
+        POST /api/products/import/
+
+        Streams the uploaded file through products/importer.py, so only
+        one chunk of rows is in memory at a time.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Upload a CSV or JSONL file."})
+        file_format = get_format(upload.name)
+        if file_format is None:
+            raise ValidationError(
+                {"file": "Use a .csv, .jsonl or .ndjson file."}
+            )
+
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        return Response(import_products(stream, file_format))
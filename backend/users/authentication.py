@@ -0,0 +1,50 @@
+"""
+JWT Authentication for Async (non-DRF) Views.
+
+DRF authenticates inside its sync view machinery, so the async views in
+products/async_views.py and cart/async_views.py check the Bearer token
+themselves. Token validation reuses Simple JWT (same settings, same
+errors); only the user lookup is done with the async ORM.
+
+Simple JWT docs: https://django-rest-framework-simplejwt.readthedocs.io/
+"""
+
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+
+async def aauthenticate(request):
+    """
+    Return the user for the request's Bearer token, or None without one.
+
+    Raises:
+        AuthenticationFailed: The token is invalid or expired (InvalidToken
+            is a subclass), or its user is missing or inactive
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+
+    token = authentication.get_validated_token(raw_token)
+    try:
+        user_id = token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise AuthenticationFailed(
+            "Token contained no recognizable user identification"
+        )
+
+    try:
+        user = await User.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        raise AuthenticationFailed("User not found")
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive")
+    return user